@@ -185,6 +185,82 @@ FIREBASE_CONFIG = {
     'STORAGE_BUCKET': config('FIREBASE_STORAGE_BUCKET', default=''),
 }
 
+# Caché en memoria de snapshots de Realtime Database (por proceso)
+FIREBASE_CACHE = {
+    'TTL_SECONDS': config('FIREBASE_CACHE_TTL_SECONDS', default=30, cast=int),
+    'MAX_BYTES': config('FIREBASE_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+}
+
+# URLs firmadas de Storage: vigencia, margen antes de expirar en el que se
+# dejan de reutilizar y máximo de URLs en caché (LRU)
+FIREBASE_SIGNED_URLS = {
+    'EXPIRATION_SECONDS': config('FIREBASE_SIGNED_URL_EXPIRATION_SECONDS', default=3600, cast=int),
+    'REFRESH_MARGIN_SECONDS': config('FIREBASE_SIGNED_URL_REFRESH_MARGIN_SECONDS', default=300, cast=int),
+    'MAX_ENTRIES': config('FIREBASE_SIGNED_URL_CACHE_MAX_ENTRIES', default=5000, cast=int),
+}
+
+# Máximo de lecturas simultáneas en FirebaseService.get_many
+FIREBASE_FETCH_MAX_WORKERS = config('FIREBASE_FETCH_MAX_WORKERS', default=8, cast=int)
+
+# Réplica local (streams listen) de los nodos más consultados
+FIREBASE_REALTIME_MIRROR = {
+    'ENABLED': config('FIREBASE_REALTIME_MIRROR_ENABLED', default=False, cast=bool),
+    'PATHS': ['User/Trabajadores', 'WorkerDocuments', 'User/Clientes'],
+}
+
+# ==================== STATS COUNTERS ====================
+# Contadores incrementales del dashboard; se recalculan con un recorrido
+# completo pasado este tiempo para absorber escrituras hechas fuera del panel
+STATS_COUNTERS = {
+    'RECONCILE_SECONDS': config('STATS_COUNTERS_RECONCILE_SECONDS', default=120, cast=int),
+}
+
+# ==================== BULK UPLOAD ====================
+# Carga masiva: usuarios de Auth en paralelo con límite de tasa y perfiles
+# escritos por lotes
+BULK_UPLOAD = {
+    'AUTH_WORKERS': config('BULK_UPLOAD_AUTH_WORKERS', default=8, cast=int),
+    'AUTH_RATE_PER_SECOND': config('BULK_UPLOAD_AUTH_RATE_PER_SECOND', default=10, cast=float),
+    'AUTH_MAX_RETRIES': config('BULK_UPLOAD_AUTH_MAX_RETRIES', default=3, cast=int),
+    'PROFILE_BATCH_SIZE': config('BULK_UPLOAD_PROFILE_BATCH_SIZE', default=200, cast=int),
+    # 'import' = auth.import_users por lotes de 1000; 'per_user' = create_user por fila
+    'AUTH_MODE': config('BULK_UPLOAD_AUTH_MODE', default='import'),
+    # Iteraciones PBKDF2-SHA256 para las contraseñas enviadas con import_users
+    'PASSWORD_HASH_ROUNDS': config('BULK_UPLOAD_PASSWORD_HASH_ROUNDS', default=10000, cast=int),
+    # 'thread' = pool de hilos en el proceso web; 'command' = manage.py process_bulk_uploads
+    'JOB_EXECUTOR': config('BULK_UPLOAD_JOB_EXECUTOR', default='thread'),
+    # Ejecutar el pool de hilos en este proceso (modo 'thread'): activarlo solo
+    # en el entorno del servicio web, no en .env, para que scripts, pruebas y
+    # comandos no reclamen trabajos
+    'RUN_WORKER': config('BULK_UPLOAD_RUN_WORKER', default=False, cast=bool),
+    'JOB_WORKERS': config('BULK_UPLOAD_JOB_WORKERS', default=2, cast=int),
+    # Minutos sin avance tras los cuales un trabajo en proceso se puede reintentar
+    'JOB_STALE_MINUTES': config('BULK_UPLOAD_JOB_STALE_MINUTES', default=10, cast=int),
+    # Minutos que se conservan las contraseñas generadas si nadie las consulta
+    'PASSWORD_TTL_MINUTES': config('BULK_UPLOAD_PASSWORD_TTL_MINUTES', default=60, cast=int),
+    # Filas leídas e importadas por bloque (el archivo se lee por streaming)
+    'READ_CHUNK_ROWS': config('BULK_UPLOAD_READ_CHUNK_ROWS', default=1000, cast=int),
+    'MAX_FILE_SIZE_MB': config('BULK_UPLOAD_MAX_FILE_SIZE_MB', default=50, cast=int),
+}
+
+# ==================== LOCATION BUFFER ====================
+# Ubicaciones recibidas por lote: se conserva la última de cada trabajador
+# y se escriben juntas cada FLUSH_INTERVAL_SECONDS (0 = escribir en cada
+# solicitud) o al juntar MAX_PENDING trabajadores
+LOCATION_BUFFER = {
+    'FLUSH_INTERVAL_SECONDS': config('LOCATION_BUFFER_FLUSH_INTERVAL_SECONDS', default=2.0, cast=float),
+    'MAX_PENDING': config('LOCATION_BUFFER_MAX_PENDING', default=5000, cast=int),
+    # Trabajadores cuya última posición se recuerda para descartar posiciones
+    # atrasadas que llegan en ventanas posteriores
+    'MAX_TRACKED_WORKERS': config('LOCATION_BUFFER_MAX_TRACKED_WORKERS', default=50000, cast=int),
+}
+
+# ==================== SEARCH INDEX ====================
+# Índice de búsqueda en memoria de trabajadores y clientes (por proceso)
+SEARCH_INDEX = {
+    'TTL_SECONDS': config('SEARCH_INDEX_TTL_SECONDS', default=120, cast=int),
+}
+
 # ==================== LOGGING ====================
 LOGGING = {
     'version': 1,
@@ -1,6 +1,30 @@
 from django.apps import AppConfig
+from django.conf import settings
+import os
+import sys
+
+
+def _is_management_command():
+    """
+    Indica si el proceso es un comando de manage.py (migrate, shell...)
+    distinto del proceso que atiende solicitudes en runserver
+    """
+    if os.path.basename(sys.argv[0]) != 'manage.py':
+        return False
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return True
+    # El autorecargador de runserver ejecuta la app en un proceso hijo
+    return os.environ.get('RUN_MAIN') != 'true' and '--noreload' not in sys.argv
 
 
 class WorkerVerificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'worker_verification'
+
+    def ready(self):
+        # Retomar las cargas masivas que quedaron en cola o abandonadas, solo
+        # en los procesos configurados para ejecutarlas (BULK_UPLOAD_RUN_WORKER)
+        bulk_config = getattr(settings, 'BULK_UPLOAD', {})
+        if bulk_config.get('RUN_WORKER', False) and not _is_management_command():
+            from .services.bulk_upload_job_service import bulk_upload_job_service
+            bulk_upload_job_service.start()
@@ -0,0 +1,105 @@
+from django.core.management.base import BaseCommand
+from ...services.bulk_worker_service import bulk_worker_service
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class Command(BaseCommand):
+    """
+    Benchmark del parseo de la carga masiva de trabajadores
+
+    Compara el costo por fila de la normalización fila por fila
+    (parse_excel_row + build_worker_profile sobre iterrows) con la
+    normalización vectorizada de parse_dataframe, y verifica que ambas
+    produzcan los mismos perfiles. Solo usa pandas: no hace solicitudes a
+    Firebase ni reclama trabajos de carga masiva.
+
+    Uso:
+        python manage.py benchmark_bulk_parse               # 10000 filas
+        python manage.py benchmark_bulk_parse --rows 2000
+    """
+    help = 'Mide el parseo fila por fila contra el vectorizado de la carga masiva'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Filas de la hoja sintética'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Repeticiones por variante (se reporta la mejor)'
+        )
+
+    def build_sheet(self, rows):
+        """
+        Hoja sintética con la mezcla de tipos de un Excel real: teléfonos como
+        float, celdas vacías, números y textos con espacios
+        """
+        rng = np.random.default_rng(42)
+        df = pd.DataFrame({
+            'nombre': [f' Nombre{i} ' for i in range(rows)],
+            'apellido': [f'Apellido{i}' for i in range(rows)],
+            'email': [f'trabajador{i}@example.com' for i in range(rows)],
+            'telefono': (3000000000 + np.arange(rows)).astype(float),
+            'categoria': rng.choice(['Electricista', 'Plomero', 'Carpintero'], rows),
+            'descripcion': np.where(rng.random(rows) < 0.3, None, 'Descripción'),
+            'latitud': np.where(rng.random(rows) < 0.2, np.nan, rng.uniform(-4, 12, rows)),
+            'longitud': rng.uniform(-80, -66, rows),
+            'precio_por_hora': rng.integers(20000, 90000, rows),
+            'experiencia': ['5 años'] * rows,
+            'contraseña': [None] * rows,
+        })
+        return bulk_worker_service.validate_excel_structure(df)
+
+    def parse_row_by_row(self, df):
+        records = []
+        for index, row in df.iterrows():
+            worker_data = bulk_worker_service.parse_excel_row(row)
+            password = worker_data.get('password', '')
+            profile = bulk_worker_service.build_worker_profile(None, dict(worker_data))
+            profile['password'] = password
+            records.append((index + 2, profile))
+        return records
+
+    def measure(self, label, func, df, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(df)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        per_row_us = best / len(df) * 1_000_000
+        self.stdout.write(f"{label:<30} {best:8.3f} s   {per_row_us:8.2f} µs/fila")
+        return best
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = max(1, options['repeat'])
+        df = self.build_sheet(rows)
+
+        # El ID se asigna al importar (UID de Auth) y el timestamp es la hora
+        # de cada parseo: no se comparan
+        comparable = lambda records: [
+            (row_number, {
+                key: value for key, value in profile.items() if key not in ('id', 'timestamp')
+            })
+            for row_number, profile in records
+        ]
+        vectorized_records, _ = bulk_worker_service.parse_dataframe(df)
+        if comparable(self.parse_row_by_row(df)) != comparable(vectorized_records):
+            self.stdout.write(self.style.ERROR('Los perfiles vectorizados difieren de los de fila por fila'))
+            return
+
+        self.stdout.write(f"Normalización de {rows} filas (mejor de {repeat})")
+        self.stdout.write("-" * 60)
+        row_by_row = self.measure('Fila por fila (iterrows)', self.parse_row_by_row, df, repeat)
+        vectorized = self.measure('Vectorizada (parse_dataframe)', bulk_worker_service.parse_dataframe, df, repeat)
+        self.stdout.write("-" * 60)
+        self.stdout.write(self.style.SUCCESS(f"Aceleración: {row_by_row / vectorized:.1f}x"))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from ...services.bulk_upload_job_service import bulk_upload_job_service
+import time
+
+
+class Command(BaseCommand):
+    """
+    Procesa los trabajos de carga masiva en cola fuera del proceso web
+
+    Uso:
+        python manage.py process_bulk_uploads           # Atiende la cola indefinidamente
+        python manage.py process_bulk_uploads --once    # Procesa lo pendiente y termina
+    """
+    help = 'Procesa los trabajos de carga masiva de trabajadores en cola'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Procesar los trabajos en cola y terminar'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Segundos entre consultas a la cola cuando está vacía'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Esperando trabajos de carga masiva...')
+
+        while True:
+            job_id = bulk_upload_job_service.claim_next()
+
+            if job_id is None:
+                bulk_upload_job_service.expire_passwords()
+                # Trabajos abandonados por un proceso que murió
+                if bulk_upload_job_service.requeue_stale():
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Procesando trabajo {job_id}')
+            bulk_upload_job_service.run(job_id)
+            self.stdout.write(self.style.SUCCESS(f'Trabajo {job_id} terminado'))
@@ -45,4 +45,83 @@ class SystemConfig(models.Model):
         verbose_name_plural = 'Configuraciones del Sistema'
     
     def __str__(self):
-        return f"{self.key}: {self.value}"
\ No newline at end of file
+        return f"{self.key}: {self.value}"
+
+
+class StatCounter(models.Model):
+    """
+    Contadores agregados del dashboard mantenidos de forma incremental
+    """
+    key = models.CharField(max_length=255, unique=True, verbose_name='Clave')
+    value = models.BigIntegerField(default=0, verbose_name='Valor')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
+    
+    class Meta:
+        verbose_name = 'Contador de Estadísticas'
+        verbose_name_plural = 'Contadores de Estadísticas'
+    
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+
+class BulkUploadJob(models.Model):
+    """
+    Trabajo de carga masiva de trabajadores procesado en segundo plano
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    
+    STATUSES = (
+        (STATUS_QUEUED, 'En cola'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_COMPLETED, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    )
+    
+    file_name = models.CharField(max_length=255, verbose_name='Nombre del Archivo')
+    file_content = models.BinaryField(verbose_name='Contenido del Archivo')
+    file_hash = models.CharField(max_length=64, blank=True, db_index=True, verbose_name='Hash del Archivo')
+    resume = models.BooleanField(default=True, verbose_name='Omitir Filas ya Importadas')
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_QUEUED, db_index=True, verbose_name='Estado')
+    total_rows = models.IntegerField(default=0, verbose_name='Filas Totales')
+    successful = models.IntegerField(default=0, verbose_name='Exitosos')
+    failed = models.IntegerField(default=0, verbose_name='Fallidos')
+    result = models.JSONField(blank=True, null=True, verbose_name='Resultado')
+    error = models.TextField(blank=True, null=True, verbose_name='Error')
+    passwords_expire_at = models.DateTimeField(blank=True, null=True, db_index=True, verbose_name='Vencimiento de Contraseñas')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name='Creado por')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Inicio')
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Finalización')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
+    
+    class Meta:
+        verbose_name = 'Trabajo de Carga Masiva'
+        verbose_name_plural = 'Trabajos de Carga Masiva'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.file_name} - {self.status}"
+
+
+class BulkUploadRow(models.Model):
+    """
+    Fila de un archivo de carga masiva ya importada (usuario de Auth y
+    perfil creados), identificada por el hash del contenido del archivo
+    """
+    file_hash = models.CharField(max_length=64, verbose_name='Hash del Archivo')
+    row_number = models.IntegerField(verbose_name='Número de Fila')
+    user_id = models.CharField(max_length=255, verbose_name='ID del Trabajador')
+    email = models.CharField(max_length=255, blank=True, verbose_name='Email')
+    auth_existed = models.BooleanField(default=False, verbose_name='Usuario ya Existía')
+    completed_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Importación')
+    
+    class Meta:
+        verbose_name = 'Fila de Carga Masiva'
+        verbose_name_plural = 'Filas de Carga Masiva'
+        unique_together = ('file_hash', 'row_number')
+    
+    def __str__(self):
+        return f"{self.file_hash[:12]} - fila {self.row_number}"
@@ -4,8 +4,11 @@ from .worker_serializers import (
     WorkerAvailabilitySerializer,
     WorkerOnlineStatusSerializer,
     WorkerVerificationStatusSerializer,
+    WorkerVerificationStatusBatchSerializer,
     WorkerLocationSerializer,
+    WorkerLocationBatchSerializer,
     WorkerRatingSerializer,
+    WorkerRatingBatchSerializer,
     WorkerStatisticsSerializer,
 )
 
@@ -13,6 +16,8 @@ from .document_serializers import (
     DocumentSerializer,
     DocumentApprovalSerializer,
     DocumentRejectionSerializer,
+    DocumentBatchReviewSerializer,
+    DocumentFileUrlBatchSerializer,
     DocumentStatusUpdateSerializer,
     DocumentRequirementCheckSerializer,
     DocumentListSerializer,
@@ -26,6 +31,7 @@ from .client_serializers import (
 from .bulk_worker_serializers import (
     BulkWorkerUploadSerializer,
     BulkWorkerResultSerializer,
+    BulkUploadJobSerializer,
 )
 
 __all__ = [
@@ -35,14 +41,19 @@ __all__ = [
     'WorkerAvailabilitySerializer',
     'WorkerOnlineStatusSerializer',
     'WorkerLocationSerializer',
+    'WorkerLocationBatchSerializer',
     'WorkerVerificationStatusSerializer',
+    'WorkerVerificationStatusBatchSerializer',
     'WorkerRatingSerializer',
+    'WorkerRatingBatchSerializer',
     'WorkerStatisticsSerializer',
     
     # Document serializers
     'DocumentSerializer',
     'DocumentApprovalSerializer',
     'DocumentRejectionSerializer',
+    'DocumentBatchReviewSerializer',
+    'DocumentFileUrlBatchSerializer',
     'DocumentStatusUpdateSerializer',
     'DocumentRequirementCheckSerializer',
     'DocumentListSerializer',
@@ -54,4 +65,5 @@ __all__ = [
     # Bulk upload serializers
     'BulkWorkerUploadSerializer',
     'BulkWorkerResultSerializer',
+    'BulkUploadJobSerializer',
 ]
\ No newline at end of file
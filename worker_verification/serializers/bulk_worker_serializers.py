@@ -79,4 +79,26 @@ class BulkWorkerResultSerializer(serializers.Serializer):
     error_details = serializers.ListField(
         child=serializers.DictField()
     )
-    execution_time = serializers.FloatField()
\ No newline at end of file
+    resumed = serializers.IntegerField(required=False)  # Filas ya importadas en un intento anterior
+    execution_time = serializers.FloatField()
+
+class BulkUploadJobSerializer(serializers.Serializer):
+    """
+    Serializer para el estado de un trabajo de carga masiva
+    """
+    id = serializers.IntegerField()
+    file_name = serializers.CharField()
+    file_hash = serializers.CharField()
+    status = serializers.CharField()
+    total_rows = serializers.IntegerField()
+    successful = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    processed = serializers.SerializerMethodField()
+    error = serializers.CharField(allow_null=True)
+    created_at = serializers.DateTimeField()
+    started_at = serializers.DateTimeField(allow_null=True)
+    finished_at = serializers.DateTimeField(allow_null=True)
+    
+    def get_processed(self, obj):
+        """Filas ya procesadas (exitosas + fallidas)"""
+        return obj.successful + obj.failed
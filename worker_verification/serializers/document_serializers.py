@@ -59,6 +59,74 @@ class DocumentRejectionSerializer(serializers.Serializer):
         return value.strip()
 
 
+class DocumentBatchReviewItemSerializer(serializers.Serializer):
+    """
+    Serializer para un documento dentro de una revisión por lote
+    """
+    workerId = serializers.CharField(required=True)
+    category = serializers.CharField(required=True)
+    subcategory = serializers.CharField(required=False, allow_blank=True, allow_null=True, default=None)
+    documentId = serializers.CharField(required=True)
+    action = serializers.ChoiceField(choices=['approve', 'reject'], required=True)
+    reason = serializers.CharField(required=False, allow_blank=True, allow_null=True, default=None)
+    
+    def validate(self, data):
+        """Un rechazo requiere una razón como en el rechazo individual"""
+        if data['action'] == 'reject':
+            reason = (data.get('reason') or '').strip()
+            if len(reason) < 10:
+                raise serializers.ValidationError({
+                    'reason': 'Debe proporcionar una razón válida para el rechazo (mínimo 10 caracteres)'
+                })
+            data['reason'] = reason
+        
+        data['subcategory'] = data.get('subcategory') or None
+        return data
+
+
+class DocumentBatchReviewSerializer(serializers.Serializer):
+    """
+    Serializer para aprobar/rechazar varios documentos a la vez
+    """
+    reviewerId = serializers.CharField(required=True)
+    documents = DocumentBatchReviewItemSerializer(many=True, allow_empty=False)
+    
+    def validate_documents(self, value):
+        """Limita el tamaño del lote"""
+        max_documents = 500
+        if len(value) > max_documents:
+            raise serializers.ValidationError(f"Máximo {max_documents} documentos por lote")
+        return value
+
+
+class DocumentFileUrlItemSerializer(serializers.Serializer):
+    """
+    Serializer para un archivo dentro de una solicitud de URLs por lote
+    """
+    workerId = serializers.CharField(required=True)
+    category = serializers.CharField(required=True)
+    subcategory = serializers.CharField(required=False, allow_blank=True, allow_null=True, default=None)
+    filename = serializers.CharField(required=True)
+    
+    def validate(self, data):
+        data['subcategory'] = data.get('subcategory') or None
+        return data
+
+
+class DocumentFileUrlBatchSerializer(serializers.Serializer):
+    """
+    Serializer para obtener las URLs de varios archivos a la vez
+    """
+    files = DocumentFileUrlItemSerializer(many=True, allow_empty=False)
+    
+    def validate_files(self, value):
+        """Limita el tamaño del lote"""
+        max_files = 200
+        if len(value) > max_files:
+            raise serializers.ValidationError(f"Máximo {max_files} archivos por lote")
+        return value
+
+
 class DocumentStatusUpdateSerializer(serializers.Serializer):
     """
     Serializer para actualizar estado de documento
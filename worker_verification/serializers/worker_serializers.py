@@ -1,4 +1,5 @@
 from rest_framework import serializers
+import math
 
 
 class WorkerSerializer(serializers.Serializer):
@@ -77,16 +78,69 @@ class WorkerVerificationStatusSerializer(serializers.Serializer):
         required=True
     )
     submittedAt = serializers.IntegerField(read_only=True)
-    
 
 
+class WorkerVerificationStatusBatchItemSerializer(WorkerVerificationStatusSerializer):
+    """
+    Serializer para un trabajador dentro de una verificación por lote
+    """
+    workerId = serializers.CharField(required=True)
+
+
+class WorkerVerificationStatusBatchSerializer(serializers.Serializer):
+    """
+    Serializer para actualizar el estado de verificación de varios trabajadores
+    """
+    workers = WorkerVerificationStatusBatchItemSerializer(many=True, allow_empty=False)
+    
+    def validate_workers(self, value):
+        """Limita el tamaño del lote"""
+        max_workers = 500
+        if len(value) > max_workers:
+            raise serializers.ValidationError(f"Máximo {max_workers} trabajadores por lote")
+        return value
+
 
 class WorkerLocationSerializer(serializers.Serializer):
     """
     Serializer para actualizar ubicación
     """
-    latitude = serializers.FloatField(required=True)
-    longitude = serializers.FloatField(required=True)
+    latitude = serializers.FloatField(required=True, min_value=-90.0, max_value=90.0)
+    longitude = serializers.FloatField(required=True, min_value=-180.0, max_value=180.0)
+    
+    def validate_latitude(self, value):
+        """Rechaza NaN e infinito, que no se pueden escribir en Firebase"""
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Latitud inválida")
+        return value
+    
+    def validate_longitude(self, value):
+        """Rechaza NaN e infinito, que no se pueden escribir en Firebase"""
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Longitud inválida")
+        return value
+
+
+class WorkerLocationBatchItemSerializer(WorkerLocationSerializer):
+    """
+    Serializer para una ubicación dentro de un lote
+    """
+    workerId = serializers.CharField(required=True)
+    timestamp = serializers.IntegerField(required=False, min_value=0)
+
+
+class WorkerLocationBatchSerializer(serializers.Serializer):
+    """
+    Serializer para recibir la ubicación de varios trabajadores a la vez
+    """
+    locations = WorkerLocationBatchItemSerializer(many=True, allow_empty=False)
+    
+    def validate_locations(self, value):
+        """Limita el tamaño del lote"""
+        max_locations = 1000
+        if len(value) > max_locations:
+            raise serializers.ValidationError(f"Máximo {max_locations} ubicaciones por lote")
+        return value
 
 
 class WorkerRatingSerializer(serializers.Serializer):
@@ -102,6 +156,27 @@ class WorkerRatingSerializer(serializers.Serializer):
         return value
 
 
+class WorkerRatingBatchItemSerializer(WorkerRatingSerializer):
+    """
+    Serializer para una calificación dentro de un lote
+    """
+    workerId = serializers.CharField(required=True)
+
+
+class WorkerRatingBatchSerializer(serializers.Serializer):
+    """
+    Serializer para agregar varias calificaciones a la vez
+    """
+    ratings = WorkerRatingBatchItemSerializer(many=True, allow_empty=False)
+    
+    def validate_ratings(self, value):
+        """Limita el tamaño del lote"""
+        max_ratings = 1000
+        if len(value) > max_ratings:
+            raise serializers.ValidationError(f"Máximo {max_ratings} calificaciones por lote")
+        return value
+
+
 class WorkerStatisticsSerializer(serializers.Serializer):
     """
     Serializer para estadísticas de trabajadores
@@ -3,6 +3,9 @@ from .worker_service import worker_service
 from .document_service import document_service
 from .client_service import client_service
 from .bulk_worker_service import bulk_worker_service
+from .bulk_upload_job_service import bulk_upload_job_service
+from .location_buffer_service import location_buffer_service
+from .async_firebase_service import async_firebase_service
 
 __all__ = [
     'firebase_service',
@@ -10,4 +13,7 @@ __all__ = [
     'document_service',
     'client_service',
     'bulk_worker_service',
+    'bulk_upload_job_service',
+    'location_buffer_service',
+    'async_firebase_service',
 ]
\ No newline at end of file
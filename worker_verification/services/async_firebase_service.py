@@ -0,0 +1,46 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFirebaseService:
+    """
+    Fachada asíncrona sobre FirebaseService
+
+    El SDK de Firebase es bloqueante: cada llamada se ejecuta en un hilo
+    (asyncio.to_thread) para no bloquear el event loop de ASGI, y varias
+    descargas independientes pueden esperarse a la vez con gather_data().
+    """
+
+    def __init__(self, firebase):
+        self.firebase = firebase
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Ejecuta una función bloqueante (p. ej. de un servicio) en un hilo
+        """
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def get_data(self, path, use_cache=True):
+        return await self.run(self.firebase.get_data, path, use_cache)
+
+    async def get_keys(self, path, use_cache=True):
+        return await self.run(self.firebase.get_keys, path, use_cache)
+
+    async def query_data(self, path, **kwargs):
+        return await self.run(self.firebase.query_data, path, **kwargs)
+
+    async def gather_data(self, *paths):
+        """
+        Descarga varias rutas de forma concurrente
+
+        Returns:
+            list: Datos de cada ruta, en el mismo orden
+        """
+        return await asyncio.gather(*(self.get_data(path) for path in paths))
+
+
+# Instancia global del servicio
+from .firebase_service import firebase_service
+async_firebase_service = AsyncFirebaseService(firebase_service)
@@ -0,0 +1,391 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from ..models import BulkUploadJob
+import hashlib
+import io
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUploadJobService:
+    """
+    Cola de trabajos de carga masiva persistida en la base de datos local
+
+    La vista solo guarda el archivo y retorna el ID del trabajo; la carga se
+    ejecuta en un pool de hilos del propio proceso (JOB_EXECUTOR='thread') o
+    en un proceso aparte con ``manage.py process_bulk_uploads``
+    (JOB_EXECUTOR='command'). Un trabajo se reclama con un UPDATE
+    condicional, de modo que nunca lo procesan dos ejecutores. Un trabajo
+    fallido o abandonado se puede reintentar y solo importa las filas que
+    faltan.
+
+    El pool de hilos solo corre en los procesos con RUN_WORKER activo; en
+    los demás (scripts, pruebas, otros procesos web) los trabajos quedan en
+    cola. Ahí ``start()`` (llamado desde ``AppConfig.ready``) retoma la
+    cola al arrancar y reencola los trabajos abandonados.
+    """
+
+    EXECUTOR_THREAD = 'thread'
+    EXECUTOR_COMMAND = 'command'
+
+    def __init__(self):
+        bulk_config = getattr(settings, 'BULK_UPLOAD', {})
+        self.executor_mode = bulk_config.get('JOB_EXECUTOR', self.EXECUTOR_THREAD)
+        self.run_worker = bulk_config.get('RUN_WORKER', False)
+        self.job_workers = max(1, bulk_config.get('JOB_WORKERS', 2))
+        self.stale_seconds = bulk_config.get('JOB_STALE_MINUTES', 10) * 60
+        self.password_ttl_seconds = bulk_config.get('PASSWORD_TTL_MINUTES', 60) * 60
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._submitted = set()
+        self._watchdog = None
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.job_workers,
+                    thread_name_prefix='bulk-upload-job'
+                )
+            return self._executor
+
+    def _runs_in_process(self):
+        return self.executor_mode == self.EXECUTOR_THREAD and self.run_worker
+
+    def _submit(self, job_id):
+        if not self._runs_in_process():
+            return
+        executor = self._get_executor()
+        with self._executor_lock:
+            if job_id in self._submitted:
+                return
+            self._submitted.add(job_id)
+        executor.submit(self._run_in_thread, job_id)
+
+    def start(self):
+        """
+        Arranca, en modo 'thread' y con RUN_WORKER, la vigilancia de la
+        cola: retoma los trabajos en cola (p. ej. tras un reinicio) y vuelve
+        a encolar los que quedaron en proceso cuando murió el proceso que
+        los ejecutaba
+        """
+        if not self._runs_in_process():
+            return
+        with self._executor_lock:
+            if self._watchdog is not None:
+                return
+            self._watchdog = threading.Thread(
+                target=self._watch, name='bulk-upload-watchdog', daemon=True
+            )
+        self._watchdog.start()
+
+    def _watch(self):
+        interval = max(5, min(60, self.stale_seconds / 2))
+        while True:
+            close_old_connections()
+            try:
+                self.requeue_stale()
+                self.expire_passwords()
+                for job_id in BulkUploadJob.objects.filter(
+                    status=BulkUploadJob.STATUS_QUEUED
+                ).values_list('id', flat=True):
+                    self._submit(job_id)
+            except Exception as e:
+                logger.error(f"Error checking bulk upload queue: {str(e)}")
+            finally:
+                close_old_connections()
+            time.sleep(interval)
+
+    def requeue_stale(self):
+        """
+        Vuelve a poner en cola los trabajos en proceso que dejaron de
+        reportar avance; al reprocesarse se omiten las filas ya importadas
+
+        Returns:
+            list: IDs de los trabajos reencolados
+        """
+        threshold = timezone.now() - timedelta(seconds=self.stale_seconds)
+        stale = BulkUploadJob.objects.filter(
+            status=BulkUploadJob.STATUS_RUNNING, updated_at__lt=threshold
+        ).exclude(file_content=b'')
+
+        requeued = []
+        for job_id in stale.values_list('id', flat=True):
+            updated = stale.filter(id=job_id).update(
+                status=BulkUploadJob.STATUS_QUEUED,
+                started_at=None,
+                updated_at=timezone.now()
+            )
+            if updated:
+                requeued.append(job_id)
+
+        if requeued:
+            logger.warning(f"Requeued stale bulk upload jobs: {requeued}")
+        return requeued
+
+    def enqueue(self, uploaded_file, user=None, resume=True):
+        """
+        Guarda el archivo como un trabajo en cola
+
+        Args:
+            uploaded_file: Archivo subido (UploadedFile)
+            user (User): Usuario que solicita la carga
+            resume (bool): Omitir las filas de este archivo importadas antes
+
+        Returns:
+            BulkUploadJob: Trabajo creado
+        """
+        try:
+            content = uploaded_file.read()
+            job = BulkUploadJob.objects.create(
+                file_name=uploaded_file.name,
+                file_content=content,
+                file_hash=hashlib.sha256(content).hexdigest(),
+                resume=resume,
+                created_by=user if user is not None and user.is_authenticated else None
+            )
+            logger.info(f"Bulk upload job {job.id} queued: {job.file_name}")
+
+            self._submit(job.id)
+
+            return job
+        except Exception as e:
+            logger.error(f"Error queueing bulk upload job: {str(e)}")
+            raise
+
+    def get_job(self, job_id):
+        """
+        Obtiene un trabajo por ID (None si no existe)
+        """
+        return BulkUploadJob.objects.filter(id=job_id).defer('file_content', 'result').first()
+
+    @staticmethod
+    def _has_passwords(result):
+        return any(detail.get('password') for detail in (result or {}).get('success_details') or [])
+
+    @staticmethod
+    def _redact_passwords(result):
+        return {
+            **result,
+            'success_details': [
+                {**detail, 'password': None} for detail in result.get('success_details') or []
+            ]
+        }
+
+    def take_result(self, job_id, user):
+        """
+        Reporte final del trabajo; las contraseñas generadas se entregan
+        una sola vez y solo a quien creó el trabajo: tras esa lectura se
+        borran del registro. Los demás usuarios reciben el reporte sin
+        contraseñas y sin consumirlas.
+
+        Args:
+            job_id (int): ID del trabajo
+            user (User): Usuario que consulta
+
+        Returns:
+            dict: Reporte del trabajo (None si aún no termina)
+        """
+        with transaction.atomic():
+            job = BulkUploadJob.objects.select_for_update().only(
+                'result', 'created_by_id', 'passwords_expire_at'
+            ).filter(id=job_id).first()
+            result = job.result if job else None
+            if not self._has_passwords(result):
+                return result
+
+            expired = job.passwords_expire_at is not None and job.passwords_expire_at <= timezone.now()
+            if job.created_by_id is not None and job.created_by_id == user.id and not expired:
+                self._clear_passwords(job_id, result)
+                logger.info(f"Bulk upload job {job_id}: generated passwords delivered and cleared")
+                return result
+
+            if expired:
+                self._clear_passwords(job_id, result)
+            return self._redact_passwords(result)
+
+    def _clear_passwords(self, job_id, result):
+        BulkUploadJob.objects.filter(id=job_id).update(
+            result=self._redact_passwords(result),
+            passwords_expire_at=None
+        )
+
+    def expire_passwords(self):
+        """
+        Borra las contraseñas generadas que nadie consultó durante
+        PASSWORD_TTL_MINUTES
+
+        Returns:
+            list: IDs de los trabajos cuyas contraseñas se borraron
+        """
+        expired = []
+        job_ids = BulkUploadJob.objects.filter(
+            passwords_expire_at__lte=timezone.now()
+        ).values_list('id', flat=True)
+
+        for job_id in job_ids:
+            with transaction.atomic():
+                job = BulkUploadJob.objects.select_for_update().only(
+                    'result', 'passwords_expire_at'
+                ).filter(id=job_id, passwords_expire_at__lte=timezone.now()).first()
+                if job is None:
+                    continue
+                self._clear_passwords(job_id, job.result or {})
+                expired.append(job_id)
+
+        if expired:
+            logger.info(f"Expired generated passwords of bulk upload jobs: {expired}")
+        return expired
+
+    def list_jobs(self, limit=20):
+        """
+        Trabajos más recientes
+        """
+        return list(BulkUploadJob.objects.defer('file_content', 'result')[:limit])
+
+    def is_stale(self, job):
+        """
+        Indica si un trabajo en proceso dejó de reportar avance (el proceso
+        que lo ejecutaba murió)
+        """
+        if job.status != BulkUploadJob.STATUS_RUNNING:
+            return False
+        return (timezone.now() - job.updated_at).total_seconds() > self.stale_seconds
+
+    def retry(self, job_id):
+        """
+        Vuelve a poner en cola un trabajo fallido o abandonado; al
+        reprocesarse se omiten las filas que ya se importaron
+
+        Returns:
+            BulkUploadJob: Trabajo en cola
+
+        Raises:
+            ValueError: Si el trabajo no se puede reintentar
+        """
+        job = self.get_job(job_id)
+        if not job:
+            raise ValueError('Trabajo no encontrado')
+
+        if job.status != BulkUploadJob.STATUS_FAILED and not self.is_stale(job):
+            raise ValueError(f'El trabajo no se puede reintentar en estado {job.status}')
+
+        requeued = BulkUploadJob.objects.filter(id=job_id, status=job.status).exclude(
+            file_content=b''
+        ).update(
+            status=BulkUploadJob.STATUS_QUEUED,
+            error=None,
+            started_at=None,
+            finished_at=None,
+            updated_at=timezone.now()
+        )
+        if not requeued:
+            raise ValueError('El trabajo ya no tiene el archivo o cambió de estado')
+
+        logger.info(f"Bulk upload job {job_id} requeued")
+        self._submit(job_id)
+        return self.get_job(job_id)
+
+    def claim(self, job_id):
+        """
+        Marca el trabajo como en proceso si sigue en cola
+
+        Returns:
+            bool: True si este ejecutor lo reclamó
+        """
+        claimed = BulkUploadJob.objects.filter(
+            id=job_id, status=BulkUploadJob.STATUS_QUEUED
+        ).update(status=BulkUploadJob.STATUS_RUNNING, started_at=timezone.now(), updated_at=timezone.now())
+        return claimed == 1
+
+    def claim_next(self):
+        """
+        Reclama el trabajo en cola más antiguo
+
+        Returns:
+            int: ID del trabajo reclamado o None si la cola está vacía
+        """
+        queued = BulkUploadJob.objects.filter(
+            status=BulkUploadJob.STATUS_QUEUED
+        ).order_by('created_at').values_list('id', flat=True)
+
+        for job_id in queued[:10]:
+            if self.claim(job_id):
+                return job_id
+        return None
+
+    def _update_progress(self, job_id, results):
+        BulkUploadJob.objects.filter(id=job_id).update(
+            total_rows=results['total_processed'],
+            successful=results['successful'],
+            failed=results['failed'],
+            updated_at=timezone.now()
+        )
+
+    def run(self, job_id):
+        """
+        Procesa un trabajo ya reclamado y guarda su resultado
+        """
+        from .bulk_worker_service import bulk_worker_service
+
+        job = BulkUploadJob.objects.get(id=job_id)
+        logger.info(f"Processing bulk upload job {job_id}: {job.file_name}")
+
+        try:
+            results = bulk_worker_service.process_excel_file(
+                io.BytesIO(bytes(job.file_content)),
+                file_name=job.file_name,
+                progress_callback=lambda partial: self._update_progress(job_id, partial),
+                resume=job.resume
+            )
+        except Exception as e:
+            # El archivo se conserva para poder reintentar
+            logger.error(f"Bulk upload job {job_id} failed: {str(e)}", exc_info=True)
+            BulkUploadJob.objects.filter(id=job_id).update(
+                status=BulkUploadJob.STATUS_FAILED,
+                error=str(e),
+                finished_at=timezone.now(),
+                updated_at=timezone.now()
+            )
+            return
+
+        # Las contraseñas generadas se borran si nadie las consulta a tiempo
+        passwords_expire_at = None
+        if self._has_passwords(results):
+            passwords_expire_at = timezone.now() + timedelta(seconds=self.password_ttl_seconds)
+
+        # El archivo ya no se necesita: se descarta para no crecer la base
+        BulkUploadJob.objects.filter(id=job_id).update(
+            status=BulkUploadJob.STATUS_COMPLETED,
+            total_rows=results['total_processed'],
+            successful=results['successful'],
+            failed=results['failed'],
+            result=results,
+            passwords_expire_at=passwords_expire_at,
+            file_content=b'',
+            finished_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+        logger.info(f"Bulk upload job {job_id} completed")
+
+    def _run_in_thread(self, job_id):
+        close_old_connections()
+        try:
+            if self.claim(job_id):
+                self.run(job_id)
+        except Exception as e:
+            logger.error(f"Error running bulk upload job {job_id}: {str(e)}", exc_info=True)
+        finally:
+            with self._executor_lock:
+                self._submitted.discard(job_id)
+            close_old_connections()
+
+
+# Instancia global del servicio
+bulk_upload_job_service = BulkUploadJobService()
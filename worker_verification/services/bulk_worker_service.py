@@ -1,9 +1,20 @@
 import pandas as pd
+import hashlib
+import io
+import os
 import secrets
 import string
-from datetime import datetime
-from firebase_admin import auth
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from django.conf import settings
+from firebase_admin import auth, exceptions as firebase_exceptions
 from .firebase_service import firebase_service
+from .rate_limiter import RateLimiter
+from .spreadsheet_reader import iter_spreadsheet_rows
+from ..models import BulkUploadRow
+from .stats_counter_service import stats_counter_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,8 +42,68 @@ class BulkWorkerUploadService:
         'contraseña': 'password',  # Opcional
     }
     
+    REQUIRED_COLUMNS = ['nombre', 'apellido', 'email', 'telefono', 'categoria']
+    
+    # Campos del perfil por tipo (la app Android espera estos tipos)
+    FLOAT_FIELDS = ['latitude', 'longitude', 'pricePerHour']
+    STRING_FIELDS = ['name', 'lastName', 'email', 'phone', 'work', 'description', 'experience']
+    
+    # Modos de creación de usuarios en Auth
+    AUTH_MODE_IMPORT = 'import'      # auth.import_users, hasta 1000 usuarios por llamada
+    AUTH_MODE_PER_USER = 'per_user'  # auth.create_user, una llamada por fila
+    
+    # Límites de la API de Firebase Auth por llamada
+    IMPORT_USERS_BATCH_SIZE = 1000
+    GET_USERS_BATCH_SIZE = 100
+    DELETE_USERS_BATCH_SIZE = 1000
+    
+    EXISTING_USER_MESSAGE = "Usuario ya existe en Firebase Auth"
+    
+    # Incrementar (y actualizar la fecha) al cambiar el formato del template
+    # sin cambiar sus columnas ni ejemplos, p. ej. los anchos de columna
+    TEMPLATE_VERSION = 1
+    TEMPLATE_UPDATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    
+    # Errores de Firebase Auth que se reintentan (cuota, red, fallos del servidor)
+    TRANSIENT_AUTH_ERRORS = (
+        firebase_exceptions.UnavailableError,
+        firebase_exceptions.DeadlineExceededError,
+        firebase_exceptions.ResourceExhaustedError,
+        firebase_exceptions.InternalError,
+        firebase_exceptions.UnknownError,
+    )
+    
     def __init__(self):
         self.firebase = firebase_service
+        
+        bulk_config = getattr(settings, 'BULK_UPLOAD', {})
+        self.auth_workers = max(1, bulk_config.get('AUTH_WORKERS', 8))
+        self.auth_max_retries = bulk_config.get('AUTH_MAX_RETRIES', 3)
+        self.profile_batch_size = max(1, bulk_config.get('PROFILE_BATCH_SIZE', 200))
+        self.auth_rate_limiter = RateLimiter(bulk_config.get('AUTH_RATE_PER_SECOND', 10))
+        self.auth_mode = bulk_config.get('AUTH_MODE', self.AUTH_MODE_IMPORT)
+        self.password_hash_rounds = bulk_config.get('PASSWORD_HASH_ROUNDS', 10000)
+        self.read_chunk_rows = max(1, bulk_config.get('READ_CHUNK_ROWS', 1000))
+        self._template = None
+        self._template_lock = threading.Lock()
+    
+    def _call_auth(self, func, *args, **kwargs):
+        """
+        Llama a Firebase Auth respetando el límite de tasa y reintentando
+        los errores transitorios con espera exponencial
+        """
+        attempt = 0
+        while True:
+            self.auth_rate_limiter.acquire()
+            try:
+                return func(*args, **kwargs)
+            except self.TRANSIENT_AUTH_ERRORS as e:
+                attempt += 1
+                if attempt > self.auth_max_retries:
+                    raise
+                delay = 0.5 * (2 ** (attempt - 1))
+                logger.warning(f"Transient Firebase Auth error, retry {attempt} in {delay}s: {str(e)}")
+                time.sleep(delay)
     
     def generate_secure_password(self, length=12):
         """
@@ -62,17 +133,54 @@ class BulkWorkerUploadService:
         """
         Valida que el Excel tenga las columnas requeridas
         """
-        required_columns = ['nombre', 'apellido', 'email', 'telefono', 'categoria']
-        
         # Normalizar nombres de columnas
         df.columns = df.columns.str.lower().str.strip().str.replace(' ', '_')
         
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        self.validate_columns(df.columns)
+        
+        return df
+    
+    def validate_columns(self, columns):
+        """
+        Verifica que estén las columnas requeridas (ya normalizadas)
+        """
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in columns]
         
         if missing_columns:
             raise ValueError(f"Columnas faltantes en el Excel: {', '.join(missing_columns)}")
+    
+    def iter_row_chunks(self, source, file_name=''):
+        """
+        Lee el archivo por streaming y lo entrega en bloques de
+        READ_CHUNK_ROWS filas, cada uno como un DataFrame pequeño cuyo
+        índice conserva el número de fila de la hoja
         
-        return df
+        Args:
+            source: Ruta o archivo (.xlsx, .xls o .csv)
+            file_name (str): Nombre del archivo, para detectar el formato
+            
+        Yields:
+            DataFrame: Bloque de filas con las columnas normalizadas
+        """
+        columns, rows = iter_spreadsheet_rows(source, file_name)
+        self.validate_columns(columns)
+        
+        # Columnas repetidas o vacías: se conserva la primera
+        columns = list(dict.fromkeys(column for column in columns if column))
+        
+        chunk_rows = []
+        chunk_index = []
+        for row_number, values in rows:
+            chunk_rows.append(values)
+            chunk_index.append(row_number - 2)
+            
+            if len(chunk_rows) >= self.read_chunk_rows:
+                yield pd.DataFrame(chunk_rows, index=chunk_index, columns=columns, dtype=object)
+                chunk_rows = []
+                chunk_index = []
+        
+        if chunk_rows:
+            yield pd.DataFrame(chunk_rows, index=chunk_index, columns=columns, dtype=object)
     
     def parse_excel_row(self, row):
         """
@@ -124,11 +232,11 @@ class BulkWorkerUploadService:
         """
         try:
             # Generar contraseña si no se proporcionó
-            if not password or password.strip() == '':
-                password = self.generate_secure_password()
+            password = self._resolve_password(password)
             
             # Crear usuario en Firebase Auth
-            user = auth.create_user(
+            user = self._call_auth(
+                auth.create_user,
                 email=email,
                 password=password,
                 display_name=display_name,
@@ -141,9 +249,9 @@ class BulkWorkerUploadService:
         except auth.EmailAlreadyExistsError:
             # Si el usuario ya existe, obtener su UID
             try:
-                existing_user = auth.get_user_by_email(email)
+                existing_user = self._call_auth(auth.get_user_by_email, email)
                 logger.warning(f"User already exists in Auth: {email}")
-                return existing_user.uid, None, "Usuario ya existe en Firebase Auth"
+                return existing_user.uid, None, self.EXISTING_USER_MESSAGE
             except Exception as e:
                 return None, None, f"Error verificando usuario existente: {str(e)}"
                 
@@ -156,46 +264,7 @@ class BulkWorkerUploadService:
         Crea el perfil del trabajador en Realtime Database
         """
         try:
-            # Remover contraseña del perfil (no se guarda en DB)
-            if 'password' in worker_data:
-                del worker_data['password']
-            
-            # Agregar ID
-            worker_data['id'] = user_id
-            
-            # ✅ IMPORTANTE: Asegurar que todos los campos NUMÉRICOS sean del tipo correcto
-            # Convertir explícitamente a tipos nativos de Python (no numpy)
-            if 'latitude' in worker_data:
-                worker_data['latitude'] = float(worker_data['latitude'])
-            if 'longitude' in worker_data:
-                worker_data['longitude'] = float(worker_data['longitude'])
-            if 'pricePerHour' in worker_data:
-                worker_data['pricePerHour'] = float(worker_data['pricePerHour'])
-            if 'rating' in worker_data:
-                worker_data['rating'] = float(worker_data['rating'])
-            if 'totalRatings' in worker_data:
-                worker_data['totalRatings'] = int(worker_data['totalRatings'])
-            
-            # ✅ CRÍTICO: Asegurar que campos STRING sean realmente strings
-            string_fields = ['name', 'lastName', 'email', 'phone', 'work', 'description', 'experience']
-            for field in string_fields:
-                if field in worker_data:
-                    # Convertir a string y limpiar
-                    if pd.isna(worker_data[field]) or worker_data[field] is None:
-                        worker_data[field] = ''
-                    else:
-                        worker_data[field] = str(worker_data[field]).strip()
-            
-            # ✅ CRÍTICO: Asegurar que timestamp sea LONG (milisegundos)
-            if 'timestamp' not in worker_data or isinstance(worker_data['timestamp'], str):
-                worker_data['timestamp'] = self.get_current_timestamp_millis()
-            else:
-                # Si viene de Excel, asegurar que sea int
-                worker_data['timestamp'] = int(worker_data['timestamp'])
-            
-            # ✅ Asegurar que booleanos sean realmente boolean
-            worker_data['isAvailable'] = bool(worker_data.get('isAvailable', False))
-            worker_data['isOnline'] = bool(worker_data.get('isOnline', False))
+            worker_data = self.build_worker_profile(user_id, worker_data)
             
             # Crear en Firebase
             path = f"{self.WORKERS_PATH}/{user_id}"
@@ -208,9 +277,565 @@ class BulkWorkerUploadService:
             logger.error(f"Error creating worker profile: {str(e)}")
             return False, str(e)
     
-    def process_excel_file(self, excel_file):
+    def build_worker_profile(self, user_id, worker_data):
+        """
+        Normaliza los datos de una fila al perfil que se guarda en la base
+        de datos (tipos compatibles con la app Android)
+        """
+        # Remover contraseña del perfil (no se guarda en DB)
+        if 'password' in worker_data:
+            del worker_data['password']
+        
+        # Agregar ID
+        worker_data['id'] = user_id
+        
+        # ✅ IMPORTANTE: Asegurar que todos los campos NUMÉRICOS sean del tipo correcto
+        # Convertir explícitamente a tipos nativos de Python (no numpy)
+        if 'latitude' in worker_data:
+            worker_data['latitude'] = float(worker_data['latitude'])
+        if 'longitude' in worker_data:
+            worker_data['longitude'] = float(worker_data['longitude'])
+        if 'pricePerHour' in worker_data:
+            worker_data['pricePerHour'] = float(worker_data['pricePerHour'])
+        if 'rating' in worker_data:
+            worker_data['rating'] = float(worker_data['rating'])
+        if 'totalRatings' in worker_data:
+            worker_data['totalRatings'] = int(worker_data['totalRatings'])
+        
+        # ✅ CRÍTICO: Asegurar que campos STRING sean realmente strings
+        string_fields = ['name', 'lastName', 'email', 'phone', 'work', 'description', 'experience']
+        for field in string_fields:
+            if field in worker_data:
+                # Convertir a string y limpiar
+                if pd.isna(worker_data[field]) or worker_data[field] is None:
+                    worker_data[field] = ''
+                else:
+                    worker_data[field] = str(worker_data[field]).strip()
+        
+        # ✅ CRÍTICO: Asegurar que timestamp sea LONG (milisegundos)
+        if 'timestamp' not in worker_data or isinstance(worker_data['timestamp'], str):
+            worker_data['timestamp'] = self.get_current_timestamp_millis()
+        else:
+            # Si viene de Excel, asegurar que sea int
+            worker_data['timestamp'] = int(worker_data['timestamp'])
+        
+        # ✅ Asegurar que booleanos sean realmente boolean
+        worker_data['isAvailable'] = bool(worker_data.get('isAvailable', False))
+        worker_data['isOnline'] = bool(worker_data.get('isOnline', False))
+        
+        return worker_data
+    
+    def _phone_to_string(self, value):
+        """
+        Teléfono como STRING (Android espera String), sin decimales de pandas
+        """
+        if isinstance(value, (int, float)):
+            return str(int(value))
+        return str(value).strip()
+    
+    def parse_dataframe(self, df):
+        """
+        Convierte las filas del Excel en perfiles listos para Firebase
+        operando por columnas: valores por defecto, números, textos y
+        teléfonos se normalizan en una sola pasada vectorizada sobre el
+        DataFrame (mismo resultado que parse_excel_row + build_worker_profile)
+        
+        Returns:
+            tuple: (lista de (número de fila, perfil con 'password'),
+                    lista de errores por fila)
+        """
+        try:
+            columns = {
+                excel_col: model_field
+                for excel_col, model_field in self.EXCEL_COLUMN_MAPPING.items()
+                if excel_col in df.columns
+            }
+            frame = df[list(columns)].rename(columns=columns).astype(object)
+            frame.index = df.index + 2  # +2 porque Excel empieza en 1 y hay header
+            
+            # Celdas vacías: mismos valores por defecto que parse_excel_row
+            for field in ('description', 'experience', 'password'):
+                if field in frame:
+                    frame[field] = frame[field].where(frame[field].notna(), '')
+            if 'phone' in frame:
+                phone = frame['phone']
+                frame['phone'] = phone.map(self._phone_to_string, na_action='ignore').where(phone.notna(), '')
+            else:
+                frame['phone'] = ''
+            
+            # Números como float nativo; las celdas que no convierten
+            # invalidan solo su fila
+            row_errors = {}
+            for field in self.FLOAT_FIELDS:
+                if field not in frame:
+                    continue
+                values = frame[field].where(frame[field].notna(), 0.0)
+                numbers = pd.to_numeric(values, errors='coerce').astype(float)
+                for row_number in numbers.index[numbers.isna()]:
+                    try:
+                        numbers[row_number] = float(values[row_number])
+                    except (TypeError, ValueError) as e:
+                        row_errors.setdefault(row_number, str(e))
+                frame[field] = numbers
+            
+            # Textos sin espacios sobrantes (las celdas vacías se conservan
+            # como NaN y se omiten del perfil, como en parse_excel_row)
+            for field in self.STRING_FIELDS:
+                if field in frame:
+                    text = frame[field]
+                    frame[field] = text.where(text.isna(), text.astype(str).str.strip())
+            
+            frame['isAvailable'] = False  # FALSE hasta completar documentos
+            frame['isOnline'] = False
+            frame['rating'] = 0.0
+            frame['totalRatings'] = 0
+            frame['timestamp'] = self.get_current_timestamp_millis()
+            
+            errors = []
+            if row_errors:
+                for row_number, message in sorted(row_errors.items()):
+                    name = frame.at[row_number, 'name'] if 'name' in frame else ''
+                    last_name = frame.at[row_number, 'lastName'] if 'lastName' in frame else ''
+                    email = frame.at[row_number, 'email']
+                    errors.append({
+                        'row': int(row_number),
+                        'email': email if isinstance(email, str) else None,
+                        'name': ' '.join(
+                            value for value in (name, last_name) if isinstance(value, str)
+                        ).strip(),
+                        'error': f"Error creando perfil: {message}"
+                    })
+                frame = frame.drop(index=list(row_errors))
+            
+            # Solo las columnas con celdas vacías requieren filtrar por fila
+            nullable = [field for field in frame.columns if frame[field].isna().any()]
+            records = []
+            for row_number, record in zip(frame.index, frame.to_dict('records')):
+                for field in nullable:
+                    value = record[field]
+                    if value is None or (isinstance(value, float) and pd.isna(value)):
+                        del record[field]
+                records.append((int(row_number), record))
+            
+            return records, errors
+        except Exception as e:
+            # Alguna celda no se pudo convertir: procesar fila por fila para
+            # reportar el error solo en las filas afectadas
+            logger.warning(f"Column-wise parsing failed, falling back to row parsing: {str(e)}")
+        
+        records = []
+        errors = []
+        for index, row in df.iterrows():
+            row_number = index + 2  # +2 porque Excel empieza en 1 y hay header
+            try:
+                worker_data = self.parse_excel_row(row)
+            except Exception as e:
+                errors.append({
+                    'row': row_number,
+                    'email': row.get('email', 'N/A'),
+                    'name': f"{row.get('nombre', '')} {row.get('apellido', '')}",
+                    'error': str(e)
+                })
+                continue
+            
+            try:
+                profile = self.build_worker_profile(None, dict(worker_data))
+            except Exception as e:
+                errors.append({
+                    'row': row_number,
+                    'email': worker_data.get('email'),
+                    'name': f"{worker_data.get('name', '')} {worker_data.get('lastName', '')}".strip(),
+                    'error': f"Error creando perfil: {str(e)}"
+                })
+                continue
+            
+            del profile['id']
+            profile['password'] = worker_data.get('password', '')
+            records.append((row_number, profile))
+        
+        return records, errors
+    
+    def compute_file_hash(self, source):
+        """
+        SHA-256 del contenido del archivo (identifica la carga para poder
+        retomarla); el archivo queda de nuevo al inicio
+        """
+        digest = hashlib.sha256()
+        
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as handle:
+                for block in iter(lambda: handle.read(1024 * 1024), b''):
+                    digest.update(block)
+            return digest.hexdigest()
+        
+        source.seek(0)
+        for block in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(block)
+        source.seek(0)
+        return digest.hexdigest()
+    
+    def get_completed_rows(self, file_hash):
+        """
+        Filas de este archivo importadas en intentos anteriores
+        
+        Returns:
+            dict: Número de fila -> (user_id, email, auth_existed)
+        """
+        rows = BulkUploadRow.objects.filter(file_hash=file_hash).values_list(
+            'row_number', 'user_id', 'email', 'auth_existed'
+        )
+        return {row_number: (user_id, email, auth_existed) for row_number, user_id, email, auth_existed in rows}
+    
+    def _mark_rows_completed(self, file_hash, entries):
+        """
+        Registra las filas de un lote escrito para no repetirlas al reintentar
+        """
+        try:
+            BulkUploadRow.objects.bulk_create([
+                BulkUploadRow(
+                    file_hash=file_hash,
+                    row_number=entry['row'],
+                    user_id=entry['user_id'],
+                    email=entry['email'] or '',
+                    auth_existed=entry['auth_existed']
+                )
+                for entry in entries
+            ], ignore_conflicts=True)
+        except Exception as e:
+            # Sin el registro la fila solo se repetiría en un reintento
+            logger.warning(f"Error saving bulk upload row state: {str(e)}")
+    
+    def _skip_completed_rows(self, records, completed_rows, results):
+        """
+        Separa las filas ya importadas y las reporta como exitosas
+        
+        Returns:
+            list: Registros pendientes de importar
+        """
+        pending = []
+        for row_number, worker_data in records:
+            if row_number not in completed_rows:
+                pending.append((row_number, worker_data))
+                continue
+            
+            user_id, email, auth_existed = completed_rows[row_number]
+            results['successful'] += 1
+            results['resumed'] += 1
+            results['success_details'].append({
+                'row': row_number,
+                'email': email,
+                'name': f"{worker_data.get('name', '')} {worker_data.get('lastName', '')}".strip(),
+                'user_id': user_id,
+                'password': None,  # Se entregó en el intento en que se creó
+                'auth_existed': auth_existed,
+                'resumed': True
+            })
+        
+        return pending
+    
+    def _rollback_auth_users(self, user_ids):
+        """
+        Elimina usuarios de Auth creados en esta carga cuyo perfil falló
+        """
+        for start in range(0, len(user_ids), self.DELETE_USERS_BATCH_SIZE):
+            chunk = user_ids[start:start + self.DELETE_USERS_BATCH_SIZE]
+            try:
+                self._call_auth(auth.delete_users, chunk)
+                logger.info(f"Rolled back {len(chunk)} Auth users")
+            except Exception as e:
+                logger.error(f"Error rolling back Auth users: {str(e)}")
+    
+    def _write_profiles(self, entries, results, file_hash=None):
+        """
+        Escribe un lote de perfiles con un único update() multi-path y, si
+        se indica ``file_hash``, registra las filas como completadas
+        """
+        if not entries:
+            return
+        
+        updates = {entry['user_id']: entry['profile'] for entry in entries}
+        
+        try:
+            self.firebase.multi_path_update(updates, root=self.WORKERS_PATH)
+        except Exception as e:
+            logger.error(f"Error creating worker profiles: {str(e)}")
+            for entry in entries:
+                results['failed'] += 1
+                results['error_details'].append({
+                    'row': entry['row'],
+                    'email': entry['email'],
+                    'name': entry['name'],
+                    'error': f"Error creando perfil: {str(e)}"
+                })
+            
+            # Intentar eliminar de Auth los usuarios creados para este lote
+            self._rollback_auth_users(list(dict.fromkeys(
+                entry['user_id'] for entry in entries if not entry['auth_existed']
+            )))
+            return
+        
+        for entry in entries:
+            results['successful'] += 1
+            results['success_details'].append({
+                'row': entry['row'],
+                'email': entry['email'],
+                'name': entry['name'],
+                'user_id': entry['user_id'],
+                'password': entry['password'],  # Para enviar al usuario
+                'auth_existed': entry['auth_existed']
+            })
+        
+        if file_hash:
+            self._mark_rows_completed(file_hash, entries)
+        
+        logger.info(f"Worker profiles created: {len(entries)}")
+    
+    def _resolve_password(self, password):
+        """
+        Contraseña de la fila o una generada si viene vacía
+        """
+        if not password or password.strip() == '':
+            return self.generate_secure_password()
+        return password
+    
+    def _hash_password(self, password):
+        """
+        Hash PBKDF2-SHA256 con sal aleatoria, para auth.import_users
+        
+        Returns:
+            tuple: (hash, sal)
+        """
+        salt = secrets.token_bytes(16)
+        password_hash = hashlib.pbkdf2_hmac(
+            'sha256', password.encode('utf-8'), salt, self.password_hash_rounds
+        )
+        return password_hash, salt
+    
+    def lookup_existing_users(self, emails):
+        """
+        Busca qué emails ya tienen usuario en Auth con auth.get_users
+        (hasta 100 identificadores por llamada)
+        
+        Returns:
+            dict: Email en minúsculas -> UID
+        """
+        identifiers = []
+        for email in dict.fromkeys(emails):
+            try:
+                identifiers.append(auth.EmailIdentifier(email))
+            except (TypeError, ValueError):
+                # Email inválido: el error se reporta al crear el usuario
+                continue
+        
+        existing = {}
+        for start in range(0, len(identifiers), self.GET_USERS_BATCH_SIZE):
+            chunk = identifiers[start:start + self.GET_USERS_BATCH_SIZE]
+            result = self._call_auth(auth.get_users, chunk)
+            for user in result.users:
+                if user.email:
+                    existing[user.email.lower()] = user.uid
+        
+        return existing
+    
+    def create_auth_users_bulk(self, rows):
         """
-        Procesa el archivo Excel y crea los trabajadores
+        Crea los usuarios de Auth con auth.import_users (hasta 1000 por
+        llamada) en lugar de una llamada por fila
+        
+        Los emails que ya existen se resuelven con get_users por lotes; las
+        contraseñas se envían con hash PBKDF2-SHA256 y los UID se generan
+        aquí. Un email repetido en el archivo usa el usuario de su primera
+        aparición, como en la creación fila por fila.
+        
+        Args:
+            rows (list): Filas preparadas (row, email, name, password, profile)
+            
+        Returns:
+            list: Pares (fila, (user_id, password_used, error))
+        """
+        emails = [row['email'] for row in rows if isinstance(row['email'], str)]
+        existing = self.lookup_existing_users(emails)
+        
+        outcomes = {}
+        first_row_by_email = {}
+        duplicates = []
+        to_import = []
+        
+        for position, row in enumerate(rows):
+            email = row['email']
+            email_key = email.lower() if isinstance(email, str) else None
+            
+            if email_key in existing:
+                logger.warning(f"User already exists in Auth: {email}")
+                outcomes[position] = (existing[email_key], None, self.EXISTING_USER_MESSAGE)
+                continue
+            
+            if email_key is not None and email_key in first_row_by_email:
+                duplicates.append((position, first_row_by_email[email_key]))
+                continue
+            
+            try:
+                auth_password = self._resolve_password(row['password'])
+                if not isinstance(auth_password, str) or len(auth_password) < 6:
+                    # Misma regla que aplica create_user
+                    raise ValueError(
+                        "Invalid password string. Password must be a string at least 6 characters long."
+                    )
+                record = auth.ImportUserRecord(
+                    uid=secrets.token_urlsafe(21),
+                    email=email,
+                    display_name=row['name'],
+                    email_verified=False  # Requerirá verificación
+                )
+            except Exception as e:
+                outcomes[position] = (None, None, str(e))
+                continue
+            
+            if email_key is not None:
+                first_row_by_email[email_key] = position
+            to_import.append((position, record, auth_password))
+        
+        # El hash es CPU y libera el GIL: se calcula en paralelo
+        with ThreadPoolExecutor(max_workers=self.auth_workers, thread_name_prefix='bulk-hash') as pool:
+            hashes = list(pool.map(
+                lambda item: self._hash_password(item[2]), to_import
+            ))
+        for (position, record, password), (password_hash, salt) in zip(to_import, hashes):
+            record.password_hash = password_hash
+            record.password_salt = salt
+        
+        hash_alg = auth.UserImportHash.pbkdf2_sha256(rounds=self.password_hash_rounds)
+        for start in range(0, len(to_import), self.IMPORT_USERS_BATCH_SIZE):
+            chunk = to_import[start:start + self.IMPORT_USERS_BATCH_SIZE]
+            try:
+                result = self._call_auth(
+                    auth.import_users, [record for _, record, _ in chunk], hash_alg=hash_alg
+                )
+                failed = {error.index: error.reason for error in result.errors}
+            except Exception as e:
+                logger.error(f"Error importing Auth users: {str(e)}")
+                failed = {index: str(e) for index in range(len(chunk))}
+            
+            for index, (position, record, password) in enumerate(chunk):
+                if index in failed:
+                    outcomes[position] = (None, None, failed[index])
+                else:
+                    outcomes[position] = (record.uid, password, None)
+            
+            logger.info(f"Imported {len(chunk) - len(failed)} Firebase Auth users")
+        
+        for position, first_position in duplicates:
+            user_id, _, error = outcomes[first_position]
+            outcomes[position] = (None, None, error) if user_id is None else (user_id, None, self.EXISTING_USER_MESSAGE)
+        
+        return [(rows[position], outcomes[position]) for position in range(len(rows))]
+    
+    def create_auth_users_concurrently(self, rows):
+        """
+        Crea los usuarios de Auth con create_user en un pool acotado de
+        hilos (con límite de tasa y reintentos)
+        
+        Yields:
+            tuple: (fila, (user_id, password_used, error)) a medida que terminan
+        """
+        with ThreadPoolExecutor(max_workers=self.auth_workers, thread_name_prefix='bulk-auth') as pool:
+            futures = {
+                pool.submit(self.create_firebase_auth_user, row['email'], row['password'], row['name']): row
+                for row in rows
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def import_records(self, records, results, progress_callback=None, file_hash=None):
+        """
+        Crea usuarios de Auth y perfiles para filas ya normalizadas por
+        parse_dataframe
+        
+        Los usuarios de Auth se crean con import_users por lotes (o, en
+        modo 'per_user', en un pool de hilos) y sus perfiles se escriben en
+        lotes de PROFILE_BATCH_SIZE con un update() multi-path.
+        
+        Args:
+            records (list): Tuplas (número de fila, perfil con 'password')
+            results (dict): Resultado acumulado (se modifica)
+            progress_callback (callable): Recibe ``results`` tras cada lote
+                escrito (opcional)
+            file_hash (str): Hash del archivo para registrar las filas
+                completadas (opcional)
+        """
+        rows = []
+        for row_number, worker_data in records:
+            profile = dict(worker_data)
+            password = profile.pop('password', '')
+            
+            rows.append({
+                'row': row_number,
+                'email': profile.get('email'),
+                'name': f"{profile.get('name', '')} {profile.get('lastName', '')}".strip(),
+                'password': password,
+                'profile': profile
+            })
+        
+        if self.auth_mode == self.AUTH_MODE_PER_USER:
+            auth_results = self.create_auth_users_concurrently(rows)
+        else:
+            auth_results = self.create_auth_users_bulk(rows)
+        
+        batch = []
+        for row, (user_id, password_used, auth_error) in auth_results:
+            if not user_id:
+                results['failed'] += 1
+                results['error_details'].append({
+                    'row': row['row'],
+                    'email': row['email'],
+                    'name': row['name'],
+                    'error': f"Error en Auth: {auth_error}"
+                })
+                continue
+            
+            profile = dict(row['profile'], id=user_id)
+            batch.append({
+                'row': row['row'],
+                'email': row['email'],
+                'name': row['name'],
+                'user_id': user_id,
+                'password': password_used,
+                'auth_existed': auth_error is not None,
+                'profile': profile
+            })
+            
+            if len(batch) >= self.profile_batch_size:
+                self._write_profiles(batch, results, file_hash)
+                batch = []
+                if progress_callback:
+                    progress_callback(results)
+        
+        self._write_profiles(batch, results, file_hash)
+        if progress_callback:
+            progress_callback(results)
+        
+        if results['successful'] > results.get('resumed', 0):
+            # Se escribió fuera de WorkerService: recalcular contadores e índice
+            stats_counter_service.invalidate(worker_service.COUNTERS_SCOPE)
+            worker_service.search_index.invalidate()
+    
+    def process_excel_file(self, excel_file, progress_callback=None, file_name=None, resume=True):
+        """
+        Procesa el archivo (Excel o CSV) y crea los trabajadores
+        
+        El archivo se lee por streaming y se importa por bloques, de modo
+        que la memoria no crece con el tamaño de la hoja. Cada fila
+        importada queda registrada con el hash del archivo: si la carga se
+        interrumpe, volver a subir el mismo archivo solo procesa las filas
+        que faltan.
+        
+        Args:
+            excel_file: Archivo (ruta o archivo binario)
+            progress_callback (callable): Recibe el resultado parcial a
+                medida que avanza la carga (opcional)
+            file_name (str): Nombre del archivo para detectar el formato
+                (por defecto el atributo ``name`` del archivo)
+            resume (bool): Omitir las filas importadas en intentos anteriores
         
         Returns:
             dict: Resultado del procesamiento
@@ -223,84 +848,36 @@ class BulkWorkerUploadService:
             'failed': 0,
             'success_details': [],
             'error_details': [],
+            'resumed': 0,
             'execution_time': 0.0
         }
         
         try:
-            # Leer Excel
-            df = pd.read_excel(excel_file)
-            
-            # Validar estructura
-            df = self.validate_excel_structure(df)
-            
-            results['total_processed'] = len(df)
+            file_hash = self.compute_file_hash(excel_file)
+            completed_rows = self.get_completed_rows(file_hash) if resume else {}
+            if completed_rows:
+                logger.info(f"Resuming bulk upload {file_hash[:12]}: {len(completed_rows)} rows already imported")
             
-            # Procesar cada fila
-            for index, row in df.iterrows():
-                row_number = index + 2  # +2 porque Excel empieza en 1 y hay header
+            for df in self.iter_row_chunks(excel_file, file_name):
+                results['total_processed'] += len(df)
                 
-                try:
-                    # Parsear datos
-                    worker_data = self.parse_excel_row(row)
-                    
-                    email = worker_data.get('email')
-                    name = worker_data.get('name', '')
-                    lastName = worker_data.get('lastName', '')
-                    display_name = f"{name} {lastName}".strip()
-                    password = worker_data.get('password', '')
-                    
-                    # Crear usuario en Firebase Auth
-                    user_id, password_used, auth_error = self.create_firebase_auth_user(
-                        email, password, display_name
-                    )
-                    
-                    if not user_id:
-                        results['failed'] += 1
-                        results['error_details'].append({
-                            'row': row_number,
-                            'email': email,
-                            'name': display_name,
-                            'error': f"Error en Auth: {auth_error}"
-                        })
-                        continue
-                    
-                    # Crear perfil en Database
-                    success, profile_error = self.create_worker_profile(user_id, worker_data)
-                    
-                    if success:
-                        results['successful'] += 1
-                        results['success_details'].append({
-                            'row': row_number,
-                            'email': email,
-                            'name': display_name,
-                            'user_id': user_id,
-                            'password': password_used,  # Para enviar al usuario
-                            'auth_existed': auth_error is not None
-                        })
-                    else:
-                        results['failed'] += 1
-                        results['error_details'].append({
-                            'row': row_number,
-                            'email': email,
-                            'name': display_name,
-                            'error': f"Error creando perfil: {profile_error}"
-                        })
-                        
-                        # Intentar eliminar usuario de Auth si falló el perfil
-                        try:
-                            auth.delete_user(user_id)
-                            logger.info(f"Rolled back Auth user: {user_id}")
-                        except:
-                            pass
-                    
-                except Exception as e:
-                    results['failed'] += 1
-                    results['error_details'].append({
-                        'row': row_number,
-                        'email': row.get('email', 'N/A'),
-                        'name': f"{row.get('nombre', '')} {row.get('apellido', '')}",
-                        'error': str(e)
-                    })
+                # Parsear las filas del bloque
+                records, parse_errors = self.parse_dataframe(df)
+                results['failed'] += len(parse_errors)
+                results['error_details'].extend(parse_errors)
+                
+                # Las filas de intentos anteriores no se repiten
+                if completed_rows:
+                    records = self._skip_completed_rows(records, completed_rows, results)
+                if progress_callback:
+                    progress_callback(results)
+                
+                # Crear usuarios y perfiles
+                self.import_records(records, results, progress_callback, file_hash)
+            
+            # Los resultados llegan en desorden: reportarlos por fila
+            results['success_details'].sort(key=lambda detail: detail['row'])
+            results['error_details'].sort(key=lambda detail: detail['row'])
             
             # Calcular tiempo de ejecución
             end_time = datetime.now()
@@ -333,7 +910,56 @@ class BulkWorkerUploadService:
         
         df = pd.DataFrame(template_data)
         return df
+    
+    def render_excel_template(self):
+        """
+        Genera el archivo .xlsx del template con columnas ajustadas
+        
+        Returns:
+            bytes: Contenido del archivo
+        """
+        df = self.generate_excel_template()
+        
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, sheet_name='Trabajadores')
+            
+            # Ajustar ancho de columnas
+            worksheet = writer.sheets['Trabajadores']
+            for idx, col in enumerate(df.columns):
+                max_length = max(
+                    df[col].astype(str).apply(len).max(),
+                    len(col)
+                ) + 2
+                worksheet.column_dimensions[chr(65 + idx)].width = max_length
+        
+        return output.getvalue()
+    
+    def get_excel_template(self):
+        """
+        Template ya generado: se construye una sola vez por proceso
+        
+        Returns:
+            dict: content (bytes), etag (str) y last_modified (timestamp)
+        """
+        if self._template is None:
+            with self._template_lock:
+                if self._template is None:
+                    # El .xlsx generado incluye la fecha de creación, así que
+                    # el ETag (débil: el contenido equivale pero no es idéntico
+                    # byte a byte) sale de la definición del template y es el
+                    # mismo en todos los procesos y tras reiniciar
+                    definition = f"{self.TEMPLATE_VERSION}:{self.generate_excel_template().to_json()}"
+                    self._template = {
+                        'content': self.render_excel_template(),
+                        'etag': f'W/"{hashlib.sha256(definition.encode("utf-8")).hexdigest()[:32]}"',
+                        'last_modified': int(self.TEMPLATE_UPDATED_AT.timestamp())
+                    }
+                    logger.info("Excel template rendered")
+        
+        return self._template
 
 
 # Instancia global del servicio
+from .worker_service import worker_service
 bulk_worker_service = BulkWorkerUploadService()
\ No newline at end of file
@@ -1,4 +1,6 @@
 from .firebase_service import firebase_service
+from .search_index import SearchIndex
+from django.conf import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,8 +13,27 @@ class ClientService:
     
     CLIENTS_PATH = 'User/Clientes'
     
+    # Campos indexados para búsqueda y su peso en la relevancia
+    SEARCH_FIELDS = {
+        'name': 3,
+        'lastName': 3,
+        'email': 2,
+    }
+    
     def __init__(self):
         self.firebase = firebase_service
+        self.search_index = SearchIndex(
+            self.SEARCH_FIELDS,
+            ttl=getattr(settings, 'SEARCH_INDEX', {}).get('TTL_SECONDS', 120)
+        )
+    
+    def _load_search_records(self):
+        clients = self.firebase.get_data(self.CLIENTS_PATH) or {}
+        return {
+            client_id: {**client_data, 'id': client_id}
+            for client_id, client_data in clients.items()
+            if isinstance(client_data, dict)
+        }
     
     def get_all_clients(self):
         """
@@ -72,8 +93,7 @@ class ClientService:
             int: Total de clientes
         """
         try:
-            clients = self.firebase.get_data(self.CLIENTS_PATH)
-            count = len(clients) if clients else 0
+            count = len(self.firebase.get_keys(self.CLIENTS_PATH))
             
             logger.info(f"Total clients: {count}")
             return count
@@ -83,7 +103,11 @@ class ClientService:
     
     def search_clients(self, query):
         """
-        Busca clientes por nombre o email
+        Busca clientes por nombre, apellido o email
+        
+        Usa un índice invertido en memoria: sin distinguir tildes ni
+        mayúsculas, cada término se busca como prefijo y los resultados se
+        ordenan por relevancia.
         
         Args:
             query (str): Término de búsqueda
@@ -92,29 +116,16 @@ class ClientService:
             list: Lista de clientes que coinciden
         """
         try:
-            all_clients = self.get_all_clients()
+            if not query or not query.strip():
+                return self.get_all_clients()
             
-            if not all_clients or not query:
-                return all_clients
+            self.search_index.ensure_fresh(self._load_search_records)
             
-            query_lower = query.lower().strip()
             results = []
-            
-            for client in all_clients:
-                # Buscar en nombre
-                if client.get('name', '').lower().find(query_lower) != -1:
-                    results.append(client)
-                    continue
-                
-                # Buscar en apellido
-                if client.get('lastName', '').lower().find(query_lower) != -1:
-                    results.append(client)
-                    continue
-                
-                # Buscar en email
-                if client.get('email', '').lower().find(query_lower) != -1:
-                    results.append(client)
-                    continue
+            for client_id in self.search_index.search(query):
+                client = self.search_index.get(client_id)
+                if client is not None:
+                    results.append(dict(client))
             
             logger.info(f"Search for '{query}' returned {len(results)} results")
             return results
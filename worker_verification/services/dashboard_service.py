@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from collections import defaultdict
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,7 @@ class DashboardService:
         self.firebase = firebase_service
         self.WORKERS_PATH = 'User/Trabajadores'
         self.DOCUMENTS_PATH = 'WorkerDocuments'  # CORREGIDO: path correcto
+        self.CLIENTS_PATH = 'User/Clientes'
     
     def get_weekly_trends(self):
         """
@@ -24,8 +27,9 @@ class DashboardService:
             days = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
             trends = []
             
-            workers = self.firebase.get_data(self.WORKERS_PATH) or {}
-            documents = self.firebase.get_data(self.DOCUMENTS_PATH) or {}
+            fetched = self.firebase.get_many([self.WORKERS_PATH, self.DOCUMENTS_PATH])
+            workers = fetched[self.WORKERS_PATH] or {}
+            documents = fetched[self.DOCUMENTS_PATH] or {}
             
             logger.info(f"Calculando tendencias semanales - Workers: {len(workers)}, Documents: {len(documents)}")
             
@@ -73,8 +77,9 @@ class DashboardService:
             today = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
             month_ago = (today - timedelta(days=29)).replace(hour=0, minute=0, second=0, microsecond=0)
             
-            workers = self.firebase.get_data(self.WORKERS_PATH) or {}
-            documents = self.firebase.get_data(self.DOCUMENTS_PATH) or {}
+            fetched = self.firebase.get_many([self.WORKERS_PATH, self.DOCUMENTS_PATH])
+            workers = fetched[self.WORKERS_PATH] or {}
+            documents = fetched[self.DOCUMENTS_PATH] or {}
             
             # Agrupar por semanas
             weekly_data = []
@@ -284,59 +289,223 @@ class DashboardService:
         logger.warning("Usando datos de respaldo para tendencias")
         return trends
     
+    def get_dashboard_stats(self):
+        """
+        Estadísticas generales del dashboard servidas desde los contadores
+        incrementales y la lectura shallow de clientes; solo hay un recorrido
+        completo cuando los contadores no están vigentes
+        
+        La actividad por período no está aquí: necesita recorrer ambos
+        árboles y se obtiene aparte con get_detailed_activity_stats.
+        
+        Returns:
+            dict: Secciones workers, clients y documents
+        """
+        worker_stats = worker_service.get_workers_statistics()
+        total_clients = client_service.count_clients()
+        documents_overview = document_service.get_documents_overview()
+        document_stats = documents_overview['statistics']
+        
+        return {
+            'workers': {
+                'total': worker_stats['total'],
+                'verified': worker_stats['verified'],
+                'available': worker_stats['available'],
+                'online': worker_stats['online'],
+                'byCategory': worker_stats['by_category']
+            },
+            'clients': {
+                'total': total_clients
+            },
+            'documents': {
+                'total': document_stats['total'],
+                'pending': document_stats['pending'],
+                'approved': document_stats['approved'],
+                'rejected': document_stats['rejected'],
+                'processed': document_stats['processed'],
+                'pendingByType': documents_overview['pendingByType']
+            }
+        }
+    
     def get_detailed_activity_stats(self):
         """
         Obtiene estadísticas detalladas de actividad para análisis profundo
+        
+        Costoso: descarga los árboles completos de trabajadores y documentos
+        en cada llamada.
         """
         try:
-            workers = self.firebase.get_data(self.WORKERS_PATH) or {}
-            documents = self.firebase.get_data(self.DOCUMENTS_PATH) or {}
-            
-            now = datetime.now()
-            last_24h = now - timedelta(hours=24)
-            last_7d = now - timedelta(days=7)
-            last_30d = now - timedelta(days=30)
+            fetched = self.firebase.get_many([self.WORKERS_PATH, self.DOCUMENTS_PATH])
+            workers = fetched[self.WORKERS_PATH] or {}
+            documents = fetched[self.DOCUMENTS_PATH] or {}
             
-            last_24h_ts = int(last_24h.timestamp() * 1000)
-            last_7d_ts = int(last_7d.timestamp() * 1000)
-            last_30d_ts = int(last_30d.timestamp() * 1000)
-            now_ts = int(now.timestamp() * 1000)
+            return self.compute_activity_stats(workers, documents)
             
-            stats = {
-                'workers': {
-                    'active_24h': self._count_workers_active_in_range(
-                        workers, last_24h, now
-                    ),
-                    'active_7d': self._count_workers_active_in_range(
-                        workers, last_7d, now
-                    ),
-                    'active_30d': self._count_workers_active_in_range(
-                        workers, last_30d, now
-                    )
-                },
-                'documents': {
-                    'processed_24h': self._count_documents_processed_in_range(
-                        documents, last_24h, now
-                    ),
-                    'processed_7d': self._count_documents_processed_in_range(
-                        documents, last_7d, now
-                    ),
-                    'processed_30d': self._count_documents_processed_in_range(
-                        documents, last_30d, now
-                    ),
-                    'uploaded_24h': self._count_documents_uploaded_in_range(
-                        documents, last_24h, now
-                    ),
-                    'uploaded_7d': self._count_documents_uploaded_in_range(
-                        documents, last_7d, now
-                    ),
-                    'uploaded_30d': self._count_documents_uploaded_in_range(
-                        documents, last_30d, now
-                    )
-                }
+        except Exception as e:
+            logger.error(f"Error obteniendo estadísticas detalladas: {str(e)}", exc_info=True)
+            return None
+    
+    def compute_activity_stats(self, workers, documents):
+        """
+        Calcula estadísticas de actividad sobre árboles ya descargados
+        """
+        now = datetime.now()
+        last_24h = now - timedelta(hours=24)
+        last_7d = now - timedelta(days=7)
+        last_30d = now - timedelta(days=30)
+        
+        return {
+            'workers': {
+                'active_24h': self._count_workers_active_in_range(
+                    workers, last_24h, now
+                ),
+                'active_7d': self._count_workers_active_in_range(
+                    workers, last_7d, now
+                ),
+                'active_30d': self._count_workers_active_in_range(
+                    workers, last_30d, now
+                )
+            },
+            'documents': {
+                'processed_24h': self._count_documents_processed_in_range(
+                    documents, last_24h, now
+                ),
+                'processed_7d': self._count_documents_processed_in_range(
+                    documents, last_7d, now
+                ),
+                'processed_30d': self._count_documents_processed_in_range(
+                    documents, last_30d, now
+                ),
+                'uploaded_24h': self._count_documents_uploaded_in_range(
+                    documents, last_24h, now
+                ),
+                'uploaded_7d': self._count_documents_uploaded_in_range(
+                    documents, last_7d, now
+                ),
+                'uploaded_30d': self._count_documents_uploaded_in_range(
+                    documents, last_30d, now
+                )
             }
+        }
+    
+    def _timed(self, timings, group, name, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        timings[group][name] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    
+    def get_dashboard_snapshot(self):
+        """
+        Calcula todas las secciones del dashboard descargando cada árbol
+        (trabajadores, documentos, clientes) exactamente una vez; de los
+        clientes solo se necesitan las claves (lectura shallow)
+        
+        Returns:
+            dict: Secciones del dashboard y tiempos por sección (ms)
+        """
+        timings = {'fetch': {}, 'compute': {}}
+        
+        # Las tres descargas son independientes: se hacen en paralelo
+        fetched = self.firebase.run_concurrently({
+            'workers': (self._timed, (timings, 'fetch', 'workers', self.firebase.get_data, self.WORKERS_PATH)),
+            'documents': (self._timed, (timings, 'fetch', 'documents', self.firebase.get_data, self.DOCUMENTS_PATH)),
+            'clients': (self._timed, (timings, 'fetch', 'clients', self.firebase.get_keys, self.CLIENTS_PATH)),
+        })
+        workers = fetched['workers']
+        documents = fetched['documents']
+        client_ids = fetched['clients']
+        
+        return self.build_dashboard_snapshot(workers or {}, documents or {}, client_ids, timings)
+    
+    async def get_dashboard_snapshot_async(self):
+        """
+        Igual que get_dashboard_snapshot, pero descarga los tres árboles de
+        forma concurrente y sin bloquear el event loop
+        
+        Returns:
+            dict: Secciones del dashboard y tiempos por sección (ms)
+        """
+        timings = {'fetch': {}, 'compute': {}}
+        
+        async def timed_fetch(name, fetch, path):
+            started = time.perf_counter()
+            result = await fetch(path)
+            timings['fetch'][name] = round((time.perf_counter() - started) * 1000, 2)
+            return result
+        
+        workers, documents, client_ids = await asyncio.gather(
+            timed_fetch('workers', async_firebase_service.get_data, self.WORKERS_PATH),
+            timed_fetch('documents', async_firebase_service.get_data, self.DOCUMENTS_PATH),
+            timed_fetch('clients', async_firebase_service.get_keys, self.CLIENTS_PATH),
+        )
+        
+        # El cálculo es CPU y recorre árboles grandes: también fuera del loop
+        return await async_firebase_service.run(
+            self.build_dashboard_snapshot, workers or {}, documents or {}, client_ids, timings
+        )
+    
+    def build_dashboard_snapshot(self, workers, documents, client_ids, timings):
+        """
+        Calcula las secciones del dashboard sobre árboles ya descargados
+        """
+        workers_list = [
+            worker for worker in workers.values() if isinstance(worker, dict)
+        ]
+        worker_stats = self._timed(
+            timings, 'compute', 'workers', worker_service.compute_workers_statistics, workers_list
+        )
+        
+        document_index = self._timed(
+            timings, 'compute', 'documentIndex', document_service.build_document_index, documents
+        )
+        document_stats = self._timed(
+            timings, 'compute', 'documents', document_service.get_documents_statistics, document_index
+        )
+        pending_by_type = self._timed(
+            timings, 'compute', 'pendingByType', document_service.get_pending_by_type, document_index
+        )
+        
+        activity_stats = self._timed(
+            timings, 'compute', 'activity', self.compute_activity_stats, workers, documents
+        )
+        
+        logger.info(f"Snapshot del dashboard calculado: {timings}")
+        return {
+            'workers': {
+                'total': worker_stats['total'],
+                'verified': worker_stats['verified'],
+                'available': worker_stats['available'],
+                'online': worker_stats['online'],
+                'byCategory': worker_stats['by_category']
+            },
+            'clients': {
+                'total': len(client_ids)
+            },
+            'documents': {
+                'total': document_stats['total'],
+                'pending': document_stats['pending'],
+                'approved': document_stats['approved'],
+                'rejected': document_stats['rejected'],
+                'processed': document_stats['processed'],
+                'pendingByType': pending_by_type
+            },
+            'activity': activity_stats,
+            'timings': timings
+        }
+    
+    async def get_detailed_activity_stats_async(self):
+        """
+        Versión asíncrona de get_detailed_activity_stats (descargas
+        concurrentes); igual de costosa
+        """
+        try:
+            workers, documents = await async_firebase_service.gather_data(
+                self.WORKERS_PATH, self.DOCUMENTS_PATH
+            )
             
-            return stats
+            return await async_firebase_service.run(
+                self.compute_activity_stats, workers or {}, documents or {}
+            )
             
         except Exception as e:
             logger.error(f"Error obteniendo estadísticas detalladas: {str(e)}", exc_info=True)
@@ -345,4 +514,8 @@ class DashboardService:
 
 # Instancia global del servicio
 from .firebase_service import firebase_service
+from .worker_service import worker_service
+from .client_service import client_service
+from .document_service import document_service
+from .async_firebase_service import async_firebase_service
 dashboard_service = DashboardService(firebase_service)
\ No newline at end of file
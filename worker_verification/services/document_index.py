@@ -0,0 +1,95 @@
+from collections import Counter
+
+
+class DocumentIndex:
+    """
+    Índice columnar de documentos de trabajadores
+
+    Cada documento ocupa la misma posición en todas las columnas; las
+    consultas (conteos, pendientes, desgloses por tipo) recorren solo las
+    columnas que necesitan en lugar del árbol completo de WorkerDocuments.
+    """
+
+    def __init__(self):
+        self.worker_ids = []
+        self.categories = []
+        self.subcategories = []
+        self.document_ids = []
+        self.statuses = []
+        self.uploaded_at = []
+        self.reviewed_at = []
+        self._documents = []
+
+    def __len__(self):
+        return len(self.statuses)
+
+    def add(self, worker_id, category, subcategory, document_id, document):
+        """
+        Agrega un documento al índice
+
+        Args:
+            worker_id (str): ID del trabajador
+            category (str): Categoría del documento
+            subcategory (str): Subcategoría (puede ser None)
+            document_id (str): ID del documento
+            document (dict): Datos originales del documento
+        """
+        self.worker_ids.append(worker_id)
+        self.categories.append(category)
+        self.subcategories.append(subcategory)
+        self.document_ids.append(document_id)
+        self.statuses.append(document.get('status', ''))
+        self.uploaded_at.append(document.get('uploadedAt'))
+        self.reviewed_at.append(document.get('reviewedAt'))
+        self._documents.append(document)
+
+    def document_type(self, position):
+        """
+        Tipo del documento: la subcategoría si existe, si no la categoría
+        """
+        return self.subcategories[position] or self.categories[position]
+
+    def status_counts(self):
+        """
+        Returns:
+            Counter: Documentos por estado
+        """
+        return Counter(self.statuses)
+
+    def type_counts(self, status=None):
+        """
+        Args:
+            status (str): Filtrar por estado (opcional)
+
+        Returns:
+            Counter: Documentos por tipo
+        """
+        return Counter(
+            self.document_type(position)
+            for position in self.positions(status)
+        )
+
+    def positions(self, status=None):
+        """
+        Posiciones de los documentos, opcionalmente filtradas por estado
+        """
+        if status is None:
+            return range(len(self.statuses))
+        return [
+            position for position, document_status in enumerate(self.statuses)
+            if document_status == status
+        ]
+
+    def document(self, position):
+        """
+        Copia del documento con los campos de ubicación agregados
+        """
+        document = dict(self._documents[position])
+        document['workerId'] = self.worker_ids[position]
+        document['category'] = self.categories[position]
+
+        if self.subcategories[position]:
+            document['subcategory'] = self.subcategories[position]
+            document['id'] = self.document_ids[position]
+
+        return document
@@ -1,5 +1,8 @@
 from .firebase_service import firebase_service
+from .document_index import DocumentIndex
+from .stats_counter_service import stats_counter_service
 import logging
+import threading
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -31,8 +34,188 @@ class DocumentService:
     SUBCATEGORY_TITULOS = 'titulos'
     SUBCATEGORY_CARTAS = 'cartasRecomendacion'
     
+    COUNTERS_SCOPE = 'documents'
+    
+    # Acciones de revisión por lote
+    ACTION_APPROVE = 'approve'
+    ACTION_REJECT = 'reject'
+    
     def __init__(self):
         self.firebase = firebase_service
+        # Ruta del documento -> estado, del último recorrido completo más
+        # las escrituras propias posteriores (None si aún no hubo recorrido)
+        self._known_statuses = None
+        self._known_statuses_lock = threading.Lock()
+    
+    def _document_path(self, worker_id, category, subcategory, document_id):
+        """
+        Construye la ruta de un documento en la base de datos
+        """
+        if subcategory:
+            return f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
+        # Hoja de vida y antecedentes son nodos únicos
+        return f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
+    
+    def _counter_keys(self, document, document_type):
+        """
+        Contadores de estadísticas en los que participa un documento
+        """
+        if not isinstance(document, dict):
+            return set()
+        
+        status = document.get('status', '')
+        keys = {'total', f"status.{status}"}
+        if status == self.STATUS_PENDING:
+            keys.add(f"pending_by_type.{document_type}")
+        return keys
+    
+    def _peek_document(self, path):
+        """
+        Estado previo de un documento sin consultar la red, para calcular
+        el delta de los contadores
+        
+        Se busca en la réplica o la caché y, si no está, en los estados del
+        último recorrido completo de WorkerDocuments (el que sembró los
+        contadores), actualizados con las escrituras hechas desde el panel.
+        Un documento que no estaba en ese recorrido se toma como nuevo.
+        
+        Returns:
+            tuple: (encontrado, datos)
+        """
+        found, before = self.firebase.peek_data(path)
+        if found:
+            return found, before
+        
+        with self._known_statuses_lock:
+            if self._known_statuses is None:
+                return False, None
+            status = self._known_statuses.get(path)
+        
+        return True, ({'status': status} if status is not None else None)
+    
+    def _remember_statuses(self, index):
+        """
+        Guarda el estado de cada documento de un índice recién construido
+        """
+        statuses = {
+            self._document_path(
+                index.worker_ids[position], index.categories[position],
+                index.subcategories[position], index.document_ids[position]
+            ): index.statuses[position]
+            for position in index.positions()
+        }
+        with self._known_statuses_lock:
+            self._known_statuses = statuses
+    
+    def _remember_status(self, path, document):
+        """
+        Refleja una escritura propia en los estados conocidos
+        """
+        with self._known_statuses_lock:
+            if self._known_statuses is None:
+                return
+            if isinstance(document, dict):
+                self._known_statuses[path] = document.get('status', '')
+            else:
+                self._known_statuses.pop(path, None)
+    
+    def _track_counter_change(self, found, before, after, document_type):
+        """
+        Aplica a los contadores el cambio de un documento
+        
+        Si el estado previo no estaba en memoria se fuerza un recálculo.
+        """
+        if not found:
+            stats_counter_service.invalidate(self.COUNTERS_SCOPE)
+            return
+        
+        stats_counter_service.apply_delta(
+            self.COUNTERS_SCOPE,
+            self._counter_keys(before, document_type),
+            self._counter_keys(after, document_type)
+        )
+    
+    def _write_document_update(self, worker_id, category, subcategory, document_id, update_data):
+        """
+        Aplica un update() sobre un documento y mantiene los contadores
+        """
+        path = self._document_path(worker_id, category, subcategory, document_id)
+        found, before = self._peek_document(path)
+        
+        self.firebase.update_data(path, update_data)
+        
+        after = {**before, **update_data} if isinstance(before, dict) else dict(update_data)
+        self._remember_status(path, after)
+        self._track_counter_change(found, before, after, subcategory or category)
+    
+    def _write_document_updates(self, entries):
+        """
+        Aplica el update() de varios documentos con una sola escritura
+        multi-path en la raíz de WorkerDocuments (atómica: se aplican todos
+        o ninguno) y mantiene los contadores en una sola transacción
+        
+        Args:
+            entries (list): Tuplas (worker_id, category, subcategory,
+                document_id, update_data, previo) donde previo es
+                (encontrado, datos) o None para buscarlo en memoria
+        """
+        updates = {}
+        changes = []
+        written = []
+        all_found = True
+        
+        for worker_id, category, subcategory, document_id, update_data, previous in entries:
+            path = self._document_path(worker_id, category, subcategory, document_id)
+            relative_path = path[len(self.DOCUMENTS_PATH) + 1:]
+            
+            # Un campo por ruta para conservar el resto del documento
+            for field, value in update_data.items():
+                updates[f"{relative_path}/{field}"] = value
+            
+            found, before = previous if previous is not None else self._peek_document(path)
+            if not found:
+                all_found = False
+                continue
+            
+            after = {**before, **update_data} if isinstance(before, dict) else dict(update_data)
+            written.append((path, after))
+            document_type = subcategory or category
+            changes.append((
+                self._counter_keys(before, document_type),
+                self._counter_keys(after, document_type)
+            ))
+        
+        self.firebase.multi_path_update(updates, root=self.DOCUMENTS_PATH)
+        
+        for path, after in written:
+            self._remember_status(path, after)
+        
+        if all_found:
+            stats_counter_service.apply_deltas(self.COUNTERS_SCOPE, changes)
+        else:
+            stats_counter_service.invalidate(self.COUNTERS_SCOPE)
+    
+    def _review_data(self, action, reviewer_id, reason=None, reviewed_at=None):
+        """
+        Campos que escribe una aprobación o un rechazo
+        """
+        if reviewed_at is None:
+            reviewed_at = int(datetime.now().timestamp() * 1000)
+        
+        if action == self.ACTION_APPROVE:
+            return {
+                'status': self.STATUS_APPROVED,
+                'reviewedAt': reviewed_at,
+                'reviewedBy': reviewer_id,
+                'rejectionReason': None
+            }
+        
+        return {
+            'status': self.STATUS_REJECTED,
+            'reviewedAt': reviewed_at,
+            'reviewedBy': reviewer_id,
+            'rejectionReason': reason
+        }
     
     def get_all_worker_documents(self, worker_id):
         """
@@ -182,13 +365,18 @@ class DocumentService:
             # Construir ruta según el tipo de documento
             if category == self.CATEGORY_CERTIFICACIONES and subcategory:
                 path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
+                document_type = subcategory
             else:
                 # Para hoja de vida y antecedentes (nodos únicos)
                 path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
                 # Usar el documento completo como valor
                 document_data['id'] = document_id
+                document_type = category
             
+            found, before = self._peek_document(path)
             self.firebase.set_data(path, document_data)
+            self._remember_status(path, document_data)
+            self._track_counter_change(found, before, document_data, document_type)
             
             logger.info(f"Document created for worker {worker_id}")
             return document_data
@@ -216,13 +404,7 @@ class DocumentService:
                 'reviewedAt': int(datetime.now().timestamp() * 1000)
             }
             
-            # Construir ruta
-            if subcategory:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
-            else:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
-            
-            self.firebase.update_data(path, update_data)
+            self._write_document_update(worker_id, category, subcategory, document_id, update_data)
             
             logger.info(f"Document status updated to {status} for worker {worker_id}")
             return True
@@ -252,13 +434,7 @@ class DocumentService:
                 'rejectionReason': None
             }
             
-            # Construir ruta
-            if subcategory:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
-            else:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
-            
-            self.firebase.update_data(path, update_data)
+            self._write_document_update(worker_id, category, subcategory, document_id, update_data)
             
             logger.info(f"Document approved for worker {worker_id} by {reviewer_id}")
             return True
@@ -289,13 +465,7 @@ class DocumentService:
                 'rejectionReason': reason
             }
             
-            # Construir ruta
-            if subcategory:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
-            else:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
-            
-            self.firebase.update_data(path, update_data)
+            self._write_document_update(worker_id, category, subcategory, document_id, update_data)
             
             logger.info(f"Document rejected for worker {worker_id} by {reviewer_id}")
             return True
@@ -303,66 +473,183 @@ class DocumentService:
             logger.error(f"Error rejecting document: {str(e)}")
             raise
     
-    def get_pending_documents(self):
+    def batch_review_documents(self, reviews, reviewer_id):
+        """
+        Aprueba o rechaza varios documentos con una sola escritura atómica
+        
+        Args:
+            reviews (list): Dicts con workerId, category, subcategory,
+                documentId, action ('approve'/'reject') y reason
+            reviewer_id (str): ID del revisor
+            
+        Returns:
+            dict: Cantidad de documentos aprobados y rechazados
+        """
+        try:
+            reviewed_at = int(datetime.now().timestamp() * 1000)
+            
+            # Si un documento aparece varias veces, gana la última revisión
+            entries = {}
+            for review in reviews:
+                path = self._document_path(
+                    review['workerId'], review['category'],
+                    review.get('subcategory'), review['documentId']
+                )
+                entries[path] = review
+            
+            summary = {'approved': 0, 'rejected': 0}
+            batch = []
+            for review in entries.values():
+                action = review['action']
+                batch.append((
+                    review['workerId'],
+                    review['category'],
+                    review.get('subcategory'),
+                    review['documentId'],
+                    self._review_data(action, reviewer_id, review.get('reason'), reviewed_at),
+                    None
+                ))
+                summary['approved' if action == self.ACTION_APPROVE else 'rejected'] += 1
+            
+            self._write_document_updates(batch)
+            
+            logger.info(f"Batch review by {reviewer_id}: {summary}")
+            return summary
+        except Exception as e:
+            logger.error(f"Error in batch review: {str(e)}")
+            raise
+    
+    def approve_worker_documents(self, worker_id, reviewer_id):
+        """
+        Aprueba todo el paquete de documentos de un trabajador (los que aún
+        no están aprobados) con una sola escritura atómica
+        
+        Args:
+            worker_id (str): ID del trabajador
+            reviewer_id (str): ID del revisor
+            
+        Returns:
+            int: Cantidad de documentos aprobados
+        """
+        try:
+            worker_docs = self.get_all_worker_documents(worker_id)
+            reviewed_at = int(datetime.now().timestamp() * 1000)
+            
+            batch = [
+                (
+                    worker_id, category, subcategory, document_id,
+                    self._review_data(self.ACTION_APPROVE, reviewer_id, reviewed_at=reviewed_at),
+                    (True, document)
+                )
+                for category, subcategory, document_id, document in self.iter_worker_documents(worker_docs)
+                if document.get('status') != self.STATUS_APPROVED
+            ]
+            
+            self._write_document_updates(batch)
+            
+            logger.info(f"Approved {len(batch)} documents for worker {worker_id} by {reviewer_id}")
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Error approving worker documents: {str(e)}")
+            raise
+    
+    def iter_worker_documents(self, worker_docs):
+        """
+        Recorre los documentos de un trabajador (hoja de vida, antecedentes,
+        títulos y cartas de recomendación)
+        
+        Args:
+            worker_docs (dict): Nodo WorkerDocuments/{workerId}
+            
+        Yields:
+            tuple: (category, subcategory, document_id, document)
+        """
+        if not isinstance(worker_docs, dict):
+            return
+        
+        for category in (self.CATEGORY_HOJA_VIDA, self.CATEGORY_ANTECEDENTES):
+            document = worker_docs.get(category)
+            if isinstance(document, dict):
+                yield category, None, document.get('id'), document
+        
+        certificaciones = worker_docs.get(self.CATEGORY_CERTIFICACIONES)
+        if not isinstance(certificaciones, dict):
+            return
+        
+        for subcategory in (self.SUBCATEGORY_TITULOS, self.SUBCATEGORY_CARTAS):
+            documents = certificaciones.get(subcategory)
+            if not isinstance(documents, dict):
+                continue
+            
+            for document_id, document in documents.items():
+                if isinstance(document, dict):
+                    yield self.CATEGORY_CERTIFICACIONES, subcategory, document_id, document
+    
+    def build_document_index(self, all_docs):
+        """
+        Construye el índice columnar de documentos en una sola pasada
+        
+        Args:
+            all_docs (dict): Árbol completo de WorkerDocuments
+            
+        Returns:
+            DocumentIndex: Índice de documentos
+        """
+        index = DocumentIndex()
+        
+        for worker_id, worker_docs in (all_docs or {}).items():
+            for category, subcategory, document_id, document in self.iter_worker_documents(worker_docs):
+                index.add(worker_id, category, subcategory, document_id, document)
+        
+        return index
+    
+    def get_document_index(self):
+        """
+        Descarga WorkerDocuments una vez y construye su índice
+        
+        Returns:
+            DocumentIndex: Índice de documentos
+        """
+        try:
+            all_docs = self.firebase.get_data(self.DOCUMENTS_PATH)
+            index = self.build_document_index(all_docs)
+            
+            # Cada recorrido completo resiembra los contadores incrementales
+            stats_counter_service.seed(self.COUNTERS_SCOPE, self._counters_from_index(index))
+            self._remember_statuses(index)
+            
+            logger.debug(f"Document index built with {len(index)} documents")
+            return index
+        except Exception as e:
+            logger.error(f"Error building document index: {str(e)}")
+            raise
+    
+    def _counters_from_index(self, index):
+        counters = {'total': len(index)}
+        for status, count in index.status_counts().items():
+            counters[f"status.{status}"] = count
+        for document_type, count in index.type_counts(self.STATUS_PENDING).items():
+            counters[f"pending_by_type.{document_type}"] = count
+        return counters
+    
+    def get_pending_documents(self, index=None):
         """
         Obtiene todos los documentos pendientes de revisión
         
+        Args:
+            index (DocumentIndex): Índice ya construido (opcional)
+            
         Returns:
             list: Lista de documentos pendientes
         """
         try:
-            all_docs = self.firebase.get_data(self.DOCUMENTS_PATH)
+            if index is None:
+                index = self.get_document_index()
             
-            if not all_docs:
-                return []
-            
-            pending_docs = []
-            
-            # Iterar por cada trabajador
-            for worker_id, worker_docs in all_docs.items():
-                # Revisar hoja de vida
-                if self.CATEGORY_HOJA_VIDA in worker_docs:
-                    hoja_vida = worker_docs[self.CATEGORY_HOJA_VIDA]
-                    if isinstance(hoja_vida, dict) and hoja_vida.get('status') == self.STATUS_PENDING:
-                        hoja_vida['workerId'] = worker_id
-                        hoja_vida['category'] = self.CATEGORY_HOJA_VIDA
-                        pending_docs.append(hoja_vida)
-                
-                # Revisar antecedentes
-                if self.CATEGORY_ANTECEDENTES in worker_docs:
-                    antecedentes = worker_docs[self.CATEGORY_ANTECEDENTES]
-                    if isinstance(antecedentes, dict) and antecedentes.get('status') == self.STATUS_PENDING:
-                        antecedentes['workerId'] = worker_id
-                        antecedentes['category'] = self.CATEGORY_ANTECEDENTES
-                        pending_docs.append(antecedentes)
-                
-                # Revisar certificaciones
-                if self.CATEGORY_CERTIFICACIONES in worker_docs:
-                    certificaciones = worker_docs[self.CATEGORY_CERTIFICACIONES]
-                    
-                    # Revisar títulos
-                    if self.SUBCATEGORY_TITULOS in certificaciones:
-                        titulos = certificaciones[self.SUBCATEGORY_TITULOS]
-                        if isinstance(titulos, dict):
-                            for titulo_id, titulo in titulos.items():
-                                if isinstance(titulo, dict) and titulo.get('status') == self.STATUS_PENDING:
-                                    titulo['workerId'] = worker_id
-                                    titulo['category'] = self.CATEGORY_CERTIFICACIONES
-                                    titulo['subcategory'] = self.SUBCATEGORY_TITULOS
-                                    titulo['id'] = titulo_id
-                                    pending_docs.append(titulo)
-                    
-                    # Revisar cartas
-                    if self.SUBCATEGORY_CARTAS in certificaciones:
-                        cartas = certificaciones[self.SUBCATEGORY_CARTAS]
-                        if isinstance(cartas, dict):
-                            for carta_id, carta in cartas.items():
-                                if isinstance(carta, dict) and carta.get('status') == self.STATUS_PENDING:
-                                    carta['workerId'] = worker_id
-                                    carta['category'] = self.CATEGORY_CERTIFICACIONES
-                                    carta['subcategory'] = self.SUBCATEGORY_CARTAS
-                                    carta['id'] = carta_id
-                                    pending_docs.append(carta)
+            pending_docs = [
+                index.document(position)
+                for position in index.positions(self.STATUS_PENDING)
+            ]
             
             logger.info(f"Found {len(pending_docs)} pending documents")
             return pending_docs
@@ -370,62 +657,22 @@ class DocumentService:
             logger.error(f"Error getting pending documents: {str(e)}")
             raise
     
-    def count_processed_documents(self):
+    def count_processed_documents(self, index=None):
         """
         Cuenta los documentos procesados (aprobados + rechazados)
         
+        Args:
+            index (DocumentIndex): Índice ya construido (opcional)
+            
         Returns:
             int: Total de documentos procesados
         """
         try:
-            all_docs = self.firebase.get_data(self.DOCUMENTS_PATH)
+            if index is None:
+                index = self.get_document_index()
             
-            if not all_docs:
-                return 0
-            
-            processed_count = 0
-            
-            # Iterar por cada trabajador
-            for worker_id, worker_docs in all_docs.items():
-                # Revisar hoja de vida
-                if self.CATEGORY_HOJA_VIDA in worker_docs:
-                    hoja_vida = worker_docs[self.CATEGORY_HOJA_VIDA]
-                    if isinstance(hoja_vida, dict):
-                        status = hoja_vida.get('status', '')
-                        if status in [self.STATUS_APPROVED, self.STATUS_REJECTED]:
-                            processed_count += 1
-                
-                # Revisar antecedentes
-                if self.CATEGORY_ANTECEDENTES in worker_docs:
-                    antecedentes = worker_docs[self.CATEGORY_ANTECEDENTES]
-                    if isinstance(antecedentes, dict):
-                        status = antecedentes.get('status', '')
-                        if status in [self.STATUS_APPROVED, self.STATUS_REJECTED]:
-                            processed_count += 1
-                
-                # Revisar certificaciones
-                if self.CATEGORY_CERTIFICACIONES in worker_docs:
-                    certificaciones = worker_docs[self.CATEGORY_CERTIFICACIONES]
-                    
-                    # Revisar títulos
-                    if self.SUBCATEGORY_TITULOS in certificaciones:
-                        titulos = certificaciones[self.SUBCATEGORY_TITULOS]
-                        if isinstance(titulos, dict):
-                            for titulo_id, titulo in titulos.items():
-                                if isinstance(titulo, dict):
-                                    status = titulo.get('status', '')
-                                    if status in [self.STATUS_APPROVED, self.STATUS_REJECTED]:
-                                        processed_count += 1
-                    
-                    # Revisar cartas
-                    if self.SUBCATEGORY_CARTAS in certificaciones:
-                        cartas = certificaciones[self.SUBCATEGORY_CARTAS]
-                        if isinstance(cartas, dict):
-                            for carta_id, carta in cartas.items():
-                                if isinstance(carta, dict):
-                                    status = carta.get('status', '')
-                                    if status in [self.STATUS_APPROVED, self.STATUS_REJECTED]:
-                                        processed_count += 1
+            status_counts = index.status_counts()
+            processed_count = status_counts[self.STATUS_APPROVED] + status_counts[self.STATUS_REJECTED]
             
             logger.info(f"Total processed documents: {processed_count}")
             return processed_count
@@ -433,102 +680,38 @@ class DocumentService:
             logger.error(f"Error counting processed documents: {str(e)}")
             raise
     
-    def get_documents_statistics(self):
+    def get_documents_statistics(self, index=None):
         """
         Obtiene estadísticas de documentos
         
+        Args:
+            index (DocumentIndex): Índice ya construido (opcional)
+            
         Returns:
             dict: Estadísticas de documentos
         """
         try:
-            all_docs = self.firebase.get_data(self.DOCUMENTS_PATH)
-            
-            if not all_docs:
-                return {
-                    'total': 0,
-                    'pending': 0,
-                    'approved': 0,
-                    'rejected': 0,
-                    'processed': 0
+            if index is None:
+                counters = stats_counter_service.get_counters(self.COUNTERS_SCOPE)
+                if counters is None:
+                    index = self.get_document_index()
+            
+            if index is None:
+                stats = {
+                    'total': counters.get('total', 0),
+                    'pending': counters.get(f"status.{self.STATUS_PENDING}", 0),
+                    'approved': counters.get(f"status.{self.STATUS_APPROVED}", 0),
+                    'rejected': counters.get(f"status.{self.STATUS_REJECTED}", 0),
                 }
-            
-            stats = {
-                'total': 0,
-                'pending': 0,
-                'approved': 0,
-                'rejected': 0,
-                'processed': 0
-            }
-            
-            # Iterar por cada trabajador
-            for worker_id, worker_docs in all_docs.items():
-                # Revisar hoja de vida
-                if self.CATEGORY_HOJA_VIDA in worker_docs:
-                    hoja_vida = worker_docs[self.CATEGORY_HOJA_VIDA]
-                    if isinstance(hoja_vida, dict):
-                        stats['total'] += 1
-                        status = hoja_vida.get('status', '')
-                        if status == self.STATUS_PENDING:
-                            stats['pending'] += 1
-                        elif status == self.STATUS_APPROVED:
-                            stats['approved'] += 1
-                            stats['processed'] += 1
-                        elif status == self.STATUS_REJECTED:
-                            stats['rejected'] += 1
-                            stats['processed'] += 1
-                
-                # Revisar antecedentes
-                if self.CATEGORY_ANTECEDENTES in worker_docs:
-                    antecedentes = worker_docs[self.CATEGORY_ANTECEDENTES]
-                    if isinstance(antecedentes, dict):
-                        stats['total'] += 1
-                        status = antecedentes.get('status', '')
-                        if status == self.STATUS_PENDING:
-                            stats['pending'] += 1
-                        elif status == self.STATUS_APPROVED:
-                            stats['approved'] += 1
-                            stats['processed'] += 1
-                        elif status == self.STATUS_REJECTED:
-                            stats['rejected'] += 1
-                            stats['processed'] += 1
-                
-                # Revisar certificaciones
-                if self.CATEGORY_CERTIFICACIONES in worker_docs:
-                    certificaciones = worker_docs[self.CATEGORY_CERTIFICACIONES]
-                    
-                    # Revisar títulos
-                    if self.SUBCATEGORY_TITULOS in certificaciones:
-                        titulos = certificaciones[self.SUBCATEGORY_TITULOS]
-                        if isinstance(titulos, dict):
-                            for titulo_id, titulo in titulos.items():
-                                if isinstance(titulo, dict):
-                                    stats['total'] += 1
-                                    status = titulo.get('status', '')
-                                    if status == self.STATUS_PENDING:
-                                        stats['pending'] += 1
-                                    elif status == self.STATUS_APPROVED:
-                                        stats['approved'] += 1
-                                        stats['processed'] += 1
-                                    elif status == self.STATUS_REJECTED:
-                                        stats['rejected'] += 1
-                                        stats['processed'] += 1
-                    
-                    # Revisar cartas
-                    if self.SUBCATEGORY_CARTAS in certificaciones:
-                        cartas = certificaciones[self.SUBCATEGORY_CARTAS]
-                        if isinstance(cartas, dict):
-                            for carta_id, carta in cartas.items():
-                                if isinstance(carta, dict):
-                                    stats['total'] += 1
-                                    status = carta.get('status', '')
-                                    if status == self.STATUS_PENDING:
-                                        stats['pending'] += 1
-                                    elif status == self.STATUS_APPROVED:
-                                        stats['approved'] += 1
-                                        stats['processed'] += 1
-                                    elif status == self.STATUS_REJECTED:
-                                        stats['rejected'] += 1
-                                        stats['processed'] += 1
+            else:
+                status_counts = index.status_counts()
+                stats = {
+                    'total': len(index),
+                    'pending': status_counts[self.STATUS_PENDING],
+                    'approved': status_counts[self.STATUS_APPROVED],
+                    'rejected': status_counts[self.STATUS_REJECTED],
+                }
+            stats['processed'] = stats['approved'] + stats['rejected']
             
             logger.info(f"Document statistics calculated: {stats}")
             return stats
@@ -536,6 +719,58 @@ class DocumentService:
             logger.error(f"Error getting document statistics: {str(e)}")
             raise
     
+    def get_pending_by_type(self, index=None):
+        """
+        Cuenta los documentos pendientes por tipo
+        
+        Args:
+            index (DocumentIndex): Índice ya construido (opcional)
+            
+        Returns:
+            dict: Pendientes por tipo (hojaDeVida, antecedentesJudiciales,
+                  titulos, cartasRecomendacion)
+        """
+        if index is None:
+            counters = stats_counter_service.get_counters(self.COUNTERS_SCOPE)
+            if counters is None:
+                index = self.get_document_index()
+        
+        if index is None:
+            type_counts = {
+                name[len('pending_by_type.'):]: count
+                for name, count in counters.items()
+                if name.startswith('pending_by_type.')
+            }
+        else:
+            type_counts = index.type_counts(self.STATUS_PENDING)
+        
+        return {
+            document_type: type_counts.get(document_type, 0)
+            for document_type in (
+                self.CATEGORY_HOJA_VIDA,
+                self.CATEGORY_ANTECEDENTES,
+                self.SUBCATEGORY_TITULOS,
+                self.SUBCATEGORY_CARTAS,
+            )
+        }
+    
+    def get_documents_overview(self):
+        """
+        Estadísticas y pendientes por tipo a partir de los contadores o,
+        si no están vigentes, de una sola descarga
+        
+        Returns:
+            dict: {'statistics': dict, 'pendingByType': dict}
+        """
+        index = None
+        if stats_counter_service.get_counters(self.COUNTERS_SCOPE) is None:
+            index = self.get_document_index()
+        
+        return {
+            'statistics': self.get_documents_statistics(index),
+            'pendingByType': self.get_pending_by_type(index),
+        }
+    
     def has_all_required_documents(self, worker_id):
         """
         Verifica si un trabajador tiene todos los documentos obligatorios
@@ -548,8 +783,27 @@ class DocumentService:
     """
         try:
             documents = self.get_all_worker_documents(worker_id)
+            
+            result = self.get_requirement_status(documents)
         
-            result = {
+            logger.info(f"Document verification for worker {worker_id}: {result}")
+            return result
+        except Exception as e:
+            logger.error(f"Error checking required documents: {str(e)}")
+            raise
+    
+    def get_requirement_status(self, documents):
+        """
+        Calcula el estado de documentos requeridos a partir del nodo
+        WorkerDocuments/{workerId} ya descargado
+        
+        Args:
+            documents (dict): Documentos del trabajador
+            
+        Returns:
+            dict: Estado de documentos requeridos
+        """
+        result = {
             'hasHojaVida': False,
             'hasAntecedentes': False,
             'hasTitulo': False,
@@ -558,49 +812,45 @@ class DocumentService:
             'isComplete': False
         }
         
-            if not documents:
-                return result
-        
-            # Verificar hoja de vida
-            if self.CATEGORY_HOJA_VIDA in documents:
-                result['hasHojaVida'] = True
-        
-            # Verificar antecedentes
-            if self.CATEGORY_ANTECEDENTES in documents:
-                result['hasAntecedentes'] = True
-        
-            # Verificar certificaciones (títulos y cartas)
-            if self.CATEGORY_CERTIFICACIONES in documents:
-                certificaciones = documents[self.CATEGORY_CERTIFICACIONES]
-            
-                # Títulos
-                if self.SUBCATEGORY_TITULOS in certificaciones:
-                    titulos = certificaciones[self.SUBCATEGORY_TITULOS]
-                    if isinstance(titulos, dict) and len(titulos) > 0:
-                        result['hasTitulo'] = True
-            
-                #  Cartas de recomendación
-                if self.SUBCATEGORY_CARTAS in certificaciones:
-                    cartas = certificaciones[self.SUBCATEGORY_CARTAS]
-                    if isinstance(cartas, dict):
-                        result['cartasCount'] = len(cartas)
-        
-            # Verificar mínimo de cartas (3)
-            result['hasMinimumCartas'] = result['cartasCount'] >= 3
-        
-            # Verificar si está completo 
-            result['isComplete'] = (
-                result['hasHojaVida'] and 
-                result['hasAntecedentes'] and 
-                result['hasTitulo'] and
-                result['hasMinimumCartas']
-            )
-        
-            logger.info(f"Document verification for worker {worker_id}: {result}")
+        if not documents:
             return result
-        except Exception as e:
-            logger.error(f"Error checking required documents: {str(e)}")
-            raise
+        
+        # Verificar hoja de vida
+        if self.CATEGORY_HOJA_VIDA in documents:
+            result['hasHojaVida'] = True
+        
+        # Verificar antecedentes
+        if self.CATEGORY_ANTECEDENTES in documents:
+            result['hasAntecedentes'] = True
+        
+        # Verificar certificaciones (títulos y cartas)
+        if self.CATEGORY_CERTIFICACIONES in documents:
+            certificaciones = documents[self.CATEGORY_CERTIFICACIONES]
+            
+            # Títulos
+            if self.SUBCATEGORY_TITULOS in certificaciones:
+                titulos = certificaciones[self.SUBCATEGORY_TITULOS]
+                if isinstance(titulos, dict) and len(titulos) > 0:
+                    result['hasTitulo'] = True
+            
+            #  Cartas de recomendación
+            if self.SUBCATEGORY_CARTAS in certificaciones:
+                cartas = certificaciones[self.SUBCATEGORY_CARTAS]
+                if isinstance(cartas, dict):
+                    result['cartasCount'] = len(cartas)
+        
+        # Verificar mínimo de cartas (3)
+        result['hasMinimumCartas'] = result['cartasCount'] >= 3
+        
+        # Verificar si está completo 
+        result['isComplete'] = (
+            result['hasHojaVida'] and 
+            result['hasAntecedentes'] and 
+            result['hasTitulo'] and
+            result['hasMinimumCartas']
+        )
+        
+        return result
     
     def delete_document(self, worker_id, category, subcategory, document_id):
         """
@@ -616,13 +866,11 @@ class DocumentService:
             bool: True si fue exitoso
         """
         try:
-            # Construir ruta
-            if subcategory:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}/{subcategory}/{document_id}"
-            else:
-                path = f"{self.DOCUMENTS_PATH}/{worker_id}/{category}"
-            
+            path = self._document_path(worker_id, category, subcategory, document_id)
+            found, before = self._peek_document(path)
             self.firebase.delete_data(path)
+            self._remember_status(path, None)
+            self._track_counter_change(found, before, None, subcategory or category)
             
             logger.info(f"Document deleted for worker {worker_id}")
             return True
@@ -630,6 +878,11 @@ class DocumentService:
             logger.error(f"Error deleting document: {str(e)}")
             raise
     
+    def _storage_path(self, worker_id, category, subcategory, filename):
+        if subcategory:
+            return f"{self.STORAGE_PATH}/{worker_id}/{category}/{subcategory}/{filename}"
+        return f"{self.STORAGE_PATH}/{worker_id}/{category}/{filename}"
+    
     def get_file_url(self, worker_id, category, subcategory, filename):
         """
         Obtiene la URL de un archivo en Storage
@@ -644,10 +897,7 @@ class DocumentService:
             str: URL del archivo
         """
         try:
-            if subcategory:
-                storage_path = f"{self.STORAGE_PATH}/{worker_id}/{category}/{subcategory}/{filename}"
-            else:
-                storage_path = f"{self.STORAGE_PATH}/{worker_id}/{category}/{filename}"
+            storage_path = self._storage_path(worker_id, category, subcategory, filename)
             
             url = self.firebase.get_file_url(storage_path)
             
@@ -656,6 +906,66 @@ class DocumentService:
         except Exception as e:
             logger.error(f"Error getting file URL: {str(e)}")
             raise
+    
+    def get_file_urls(self, files):
+        """
+        Obtiene las URLs de varios archivos en una sola llamada
+        
+        Args:
+            files (list): Dicts con workerId, category, subcategory y filename
+            
+        Returns:
+            list: Por archivo, sus datos más 'url' o 'error'
+        """
+        try:
+            paths = [
+                self._storage_path(item['workerId'], item['category'], item.get('subcategory'), item['filename'])
+                for item in files
+            ]
+            urls = self.firebase.get_file_urls(paths)
+            
+            results = []
+            for item, path in zip(files, paths):
+                result = dict(item)
+                if isinstance(urls[path], Exception):
+                    result['error'] = str(urls[path])
+                else:
+                    result['url'] = urls[path]
+                results.append(result)
+            
+            logger.info(f"File URLs obtained for {len(paths)} files")
+            return results
+        except Exception as e:
+            logger.error(f"Error getting file URLs: {str(e)}")
+            raise
+    
+    def attach_file_urls(self, worker_id, documents):
+        """
+        Agrega a cada documento con archivo su URL firmada ('signedUrl')
+        
+        Args:
+            worker_id (str): ID del trabajador
+            documents (dict): Nodo WorkerDocuments/{workerId} (se modifica)
+            
+        Returns:
+            dict: Los mismos documentos
+        """
+        targets = []
+        for category, subcategory, _, document in self.iter_worker_documents(documents):
+            if document.get('fileName'):
+                path = self._storage_path(worker_id, category, subcategory, document['fileName'])
+                targets.append((document, path))
+        
+        if not targets:
+            return documents
+        
+        urls = self.firebase.get_file_urls([path for _, path in targets])
+        for document, path in targets:
+            url = urls[path]
+            # Un archivo que no se pudo firmar no impide devolver el resto
+            document['signedUrl'] = None if isinstance(url, Exception) else url
+        
+        return documents
 
 
 # Instancia global del servicio
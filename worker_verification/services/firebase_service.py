@@ -1,11 +1,23 @@
 import firebase_admin
 from firebase_admin import credentials, db, storage
 from django.conf import settings
+from .realtime_mirror import RealtimeMirror
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import json
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
+class _TransactionCancelled(Exception):
+    """
+    Cancela una transacción cuya función de actualización retornó None
+    """
+
+
 class FirebaseService:
     """
     Servicio base para interactuar con Firebase
@@ -13,6 +25,8 @@ class FirebaseService:
     """
     _instance = None
     _initialized = False
+    
+    ORDER_BY_KEY = '$key'
 
     def __new__(cls):
         if cls._instance is None:
@@ -22,6 +36,10 @@ class FirebaseService:
     def __init__(self):
         if not FirebaseService._initialized:
             self.initialize_firebase()
+            self._init_snapshot_cache()
+            self._init_signed_url_cache()
+            self._init_realtime_mirrors()
+            self._init_fetch_pool()
             FirebaseService._initialized = True
 
     def initialize_firebase(self):
@@ -50,6 +68,321 @@ class FirebaseService:
             logger.error(f"Error initializing Firebase: {str(e)}")
             raise
 
+    def _init_snapshot_cache(self):
+        """
+        Inicializa la caché en memoria de snapshots (clave: ruta)
+        
+        Los snapshots se guardan serializados en JSON: el tamaño del texto
+        sirve para aplicar el límite de memoria y cada lectura devuelve una
+        copia nueva que el llamador puede modificar sin afectar la caché.
+        """
+        cache_config = getattr(settings, 'FIREBASE_CACHE', {})
+        self.cache_ttl = cache_config.get('TTL_SECONDS', 30)
+        self.cache_max_bytes = cache_config.get('MAX_BYTES', 64 * 1024 * 1024)
+        self._snapshot_cache = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_generation = 0
+        self._cache_lock = threading.RLock()
+
+    def _init_signed_url_cache(self):
+        """
+        Inicializa la caché LRU de URLs firmadas de Storage (clave: ruta)
+        
+        Una URL firmada sigue siendo válida hasta su expiración, así que se
+        reutiliza hasta REFRESH_MARGIN_SECONDS antes de que expire.
+        """
+        url_config = getattr(settings, 'FIREBASE_SIGNED_URLS', {})
+        self.signed_url_expiration = url_config.get('EXPIRATION_SECONDS', 3600)
+        self.signed_url_margin = url_config.get('REFRESH_MARGIN_SECONDS', 300)
+        self.signed_url_max_entries = url_config.get('MAX_ENTRIES', 5000)
+        self._signed_urls = OrderedDict()
+        self._signed_url_lock = threading.Lock()
+
+    @staticmethod
+    def _normalize_path(path):
+        return (path or '').strip('/')
+
+    @staticmethod
+    def _paths_overlap(path_a, path_b):
+        """
+        Indica si una ruta es igual, ancestro o descendiente de la otra
+        """
+        if not path_a or not path_b or path_a == path_b:
+            return True
+        return path_a.startswith(f"{path_b}/") or path_b.startswith(f"{path_a}/")
+
+    def _cache_get(self, path, variant='full'):
+        """
+        Retorna (True, datos) si hay un snapshot vigente para la ruta
+        
+        Args:
+            path (str): Ruta normalizada
+            variant (str): Tipo de lectura ('full' o 'shallow')
+        """
+        if self.cache_ttl <= 0:
+            return False, None
+        
+        cache_key = (path, variant)
+        with self._cache_lock:
+            entry = self._snapshot_cache.get(cache_key)
+            if entry is None:
+                return False, None
+            
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                self._cache_discard(cache_key)
+                return False, None
+            
+            self._snapshot_cache.move_to_end(cache_key)
+        
+        return True, json.loads(payload)
+
+    def _cache_set(self, path, data, generation, variant='full'):
+        """
+        Guarda un snapshot respetando el TTL y el límite de memoria
+        """
+        if self.cache_ttl <= 0:
+            return
+        
+        payload = json.dumps(data, separators=(',', ':'))
+        if len(payload) > self.cache_max_bytes:
+            logger.debug(f"Snapshot of {path} too large to cache ({len(payload)} bytes)")
+            return
+        
+        with self._cache_lock:
+            # Una escritura ocurrida durante la lectura deja el snapshot obsoleto
+            if generation != self._cache_generation:
+                return
+            
+            cache_key = (path, variant)
+            self._cache_discard(cache_key)
+            self._snapshot_cache[cache_key] = (time.monotonic() + self.cache_ttl, payload)
+            self._cache_bytes += len(payload)
+            
+            while self._cache_bytes > self.cache_max_bytes and self._snapshot_cache:
+                evicted_key = next(iter(self._snapshot_cache))
+                self._cache_discard(evicted_key)
+                logger.debug(f"Snapshot of {evicted_key[0]} evicted from cache")
+
+    def _cache_discard(self, cache_key):
+        entry = self._snapshot_cache.pop(cache_key, None)
+        if entry is not None:
+            self._cache_bytes -= len(entry[1])
+
+    def invalidate_cache(self, path):
+        """
+        Invalida los snapshots afectados por una escritura en la ruta
+        (la propia ruta, sus ancestros y sus descendientes)
+        
+        Args:
+            path (str): Ruta modificada
+        """
+        path = self._normalize_path(path)
+        
+        with self._cache_lock:
+            self._cache_generation += 1
+            stale_keys = [
+                cache_key for cache_key in self._snapshot_cache
+                if self._paths_overlap(cache_key[0], path)
+            ]
+            for cache_key in stale_keys:
+                self._cache_discard(cache_key)
+        
+        if stale_keys:
+            logger.debug(f"Invalidated {len(stale_keys)} cached snapshots for {path}")
+
+    @staticmethod
+    def _ancestors(path):
+        """
+        Rutas ancestro de una ruta normalizada, desde la raíz ('')
+        """
+        parts = path.split('/') if path else []
+        return ['/'.join(parts[:depth]) for depth in range(len(parts))]
+
+    @staticmethod
+    def _set_in(data, parts, value):
+        """
+        Aplica un set() sobre un snapshot en memoria (None elimina) y
+        retorna el snapshot resultante
+        """
+        if not parts:
+            return value
+        if not isinstance(data, dict):
+            if value is None:
+                return data
+            data = {}
+        
+        child = FirebaseService._set_in(data.get(parts[0]), parts[1:], value)
+        if child is None or child == {}:
+            data.pop(parts[0], None)
+        else:
+            data[parts[0]] = child
+        return data or None
+
+    def _patch_snapshot(self, cache_key, writes):
+        """
+        Aplica escrituras a un snapshot en caché de una ruta ancestro
+        """
+        cached_path, variant = cache_key
+        expires_at, payload = self._snapshot_cache[cache_key]
+        data = json.loads(payload)
+        offset = len(cached_path) + 1 if cached_path else 0
+        
+        if variant == 'shallow':
+            keys = dict.fromkeys(data)
+            for path, value in writes:
+                parts = path[offset:].split('/')
+                if value is not None:
+                    keys[parts[0]] = None
+                elif len(parts) == 1:
+                    keys.pop(parts[0], None)
+                else:
+                    # Un borrado más profundo puede dejar vacío al hijo: no
+                    # se sabe sin su contenido, así que se descarta
+                    self._cache_discard(cache_key)
+                    return
+            data = list(keys)
+        else:
+            for path, value in writes:
+                data = self._set_in(data, path[offset:].split('/'), value)
+        
+        self._cache_discard(cache_key)
+        payload = json.dumps(data, separators=(',', ':'))
+        if len(payload) <= self.cache_max_bytes:
+            self._snapshot_cache[cache_key] = (expires_at, payload)
+            self._cache_bytes += len(payload)
+
+    def _apply_writes_to_cache(self, writes):
+        """
+        Refleja escrituras propias en la caché con una sola pasada: los
+        snapshots de las rutas escritas y sus descendientes se descartan, y
+        los de rutas ancestro (p. ej. la colección completa) se parchean en
+        lugar de descartarse, para no volver a descargarlos tras cada
+        escritura en un registro
+        
+        Args:
+            writes (list): Pares (ruta, valor) con semántica de set(); None elimina
+        """
+        writes = [(self._normalize_path(path), value) for path, value in writes]
+        written = {path for path, _ in writes}
+        
+        # Escrituras agrupadas por cada una de sus rutas ancestro
+        by_ancestor = {}
+        for path, value in writes:
+            for ancestor in self._ancestors(path):
+                by_ancestor.setdefault(ancestor, []).append((path, value))
+        
+        with self._cache_lock:
+            self._cache_generation += 1
+            
+            for cache_key in list(self._snapshot_cache):
+                cached_path = cache_key[0]
+                if cached_path in written or any(
+                    ancestor in written for ancestor in self._ancestors(cached_path)
+                ):
+                    self._cache_discard(cache_key)
+                elif cached_path in by_ancestor:
+                    self._patch_snapshot(cache_key, by_ancestor[cached_path])
+
+    def clear_cache(self):
+        """
+        Vacía por completo la caché de snapshots
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._snapshot_cache.clear()
+            self._cache_bytes = 0
+
+    def _init_realtime_mirrors(self):
+        """
+        Prepara las réplicas locales (listen) de los nodos configurados
+        
+        Las réplicas se inician de forma perezosa en la primera lectura y,
+        mientras no reciban el snapshot inicial, las lecturas usan la red.
+        """
+        mirror_config = getattr(settings, 'FIREBASE_REALTIME_MIRROR', {})
+        self.mirror_enabled = mirror_config.get('ENABLED', False)
+        self._mirrors = {
+            self._normalize_path(path): RealtimeMirror(path)
+            for path in mirror_config.get('PATHS', [])
+        }
+
+    def _get_mirror(self, path):
+        """
+        Retorna (réplica, ruta relativa) si la ruta está cubierta por una
+        réplica sincronizada; en otro caso (None, None)
+        """
+        if not self.mirror_enabled:
+            return None, None
+        
+        for root_path, mirror in self._mirrors.items():
+            if path == root_path or path.startswith(f"{root_path}/"):
+                if mirror.is_synced():
+                    return mirror, path[len(root_path):]
+                
+                mirror.start()
+                return None, None
+        
+        return None, None
+
+    def _apply_to_mirror(self, path, data, patch=False):
+        """
+        Aplica una escritura local a la réplica sin esperar el eco del stream
+        """
+        mirror, relative_path = self._get_mirror(self._normalize_path(path))
+        if mirror is None:
+            return
+        
+        # El llamador puede seguir modificando sus datos tras la escritura
+        data = RealtimeMirror._clone(data)
+        if patch:
+            mirror.apply_patch(relative_path, data)
+        else:
+            mirror.apply_put(relative_path, data)
+
+    def start_realtime_mirrors(self):
+        """
+        Inicia todas las réplicas configuradas
+        """
+        if not self.mirror_enabled:
+            return
+        
+        for mirror in self._mirrors.values():
+            mirror.start()
+
+    def stop_realtime_mirrors(self):
+        """
+        Detiene todas las réplicas
+        """
+        for mirror in self._mirrors.values():
+            mirror.stop()
+
+    def _init_fetch_pool(self):
+        """
+        Prepara el pool acotado de hilos para lecturas en paralelo
+        (se crea en la primera llamada a run_concurrently)
+        """
+        self.fetch_max_workers = max(1, getattr(settings, 'FIREBASE_FETCH_MAX_WORKERS', 8))
+        self._fetch_pool = None
+        self._fetch_pool_lock = threading.Lock()
+        self._fetch_local = threading.local()
+
+    def _get_fetch_pool(self):
+        with self._fetch_pool_lock:
+            if self._fetch_pool is None:
+                self._fetch_pool = ThreadPoolExecutor(
+                    max_workers=self.fetch_max_workers,
+                    thread_name_prefix='rtdb-fetch'
+                )
+            return self._fetch_pool
+
+    def _run_in_pool(self, func, args):
+        self._fetch_local.in_pool = True
+        try:
+            return func(*args)
+        finally:
+            self._fetch_local.in_pool = False
+
     def get_database_reference(self, path=''):
         """
         Obtiene una referencia a la base de datos
@@ -79,25 +412,142 @@ class FirebaseService:
             logger.error(f"Error getting storage bucket: {str(e)}")
             raise
 
-    def get_data(self, path):
+    def get_data(self, path, use_cache=True):
         """
         Obtiene datos de una ruta específica
         
         Args:
             path (str): Ruta en la base de datos
+            use_cache (bool): Usar la caché de snapshots si está vigente
             
         Returns:
             dict: Datos obtenidos
         """
         try:
+            cache_key = self._normalize_path(path)
+            
+            mirror, relative_path = self._get_mirror(cache_key)
+            if mirror is not None:
+                logger.debug(f"Data retrieved from realtime mirror for {path}")
+                return mirror.get(relative_path)
+            
+            if use_cache:
+                hit, data = self._cache_get(cache_key)
+                if hit:
+                    logger.debug(f"Data retrieved from cache for {path}")
+                    return data
+            
+            generation = self._cache_generation
             ref = self.get_database_reference(path)
             data = ref.get()
             logger.debug(f"Data retrieved from {path}")
+            
+            if use_cache:
+                self._cache_set(cache_key, data, generation)
             return data
         except Exception as e:
             logger.error(f"Error getting data from {path}: {str(e)}")
             raise
 
+    def get_keys(self, path, use_cache=True):
+        """
+        Obtiene solo las claves hijas de una ruta (lectura shallow), sin
+        descargar el contenido de cada registro
+        
+        Args:
+            path (str): Ruta en la base de datos
+            use_cache (bool): Usar la caché de snapshots si está vigente
+            
+        Returns:
+            list: Claves hijas de la ruta
+        """
+        try:
+            cache_key = self._normalize_path(path)
+            
+            mirror, relative_path = self._get_mirror(cache_key)
+            if mirror is not None:
+                return mirror.keys(relative_path)
+            
+            if use_cache:
+                hit, keys = self._cache_get(cache_key, variant='shallow')
+                if hit:
+                    logger.debug(f"Keys retrieved from cache for {path}")
+                    return keys
+            
+            generation = self._cache_generation
+            ref = self.get_database_reference(path)
+            data = ref.get(shallow=True)
+            keys = list(data.keys()) if isinstance(data, dict) else []
+            logger.debug(f"Keys retrieved from {path}")
+            
+            if use_cache:
+                self._cache_set(cache_key, keys, generation, variant='shallow')
+            return keys
+        except Exception as e:
+            logger.error(f"Error getting keys from {path}: {str(e)}")
+            raise
+
+    def peek_data(self, path):
+        """
+        Obtiene datos solo si ya están en memoria (réplica o caché), sin
+        consultar la red
+        
+        Args:
+            path (str): Ruta en la base de datos
+            
+        Returns:
+            tuple: (encontrado, datos)
+        """
+        cache_key = self._normalize_path(path)
+        
+        mirror, relative_path = self._get_mirror(cache_key)
+        if mirror is not None:
+            return True, mirror.get(relative_path)
+        
+        return self._cache_get(cache_key)
+
+    def run_concurrently(self, calls):
+        """
+        Ejecuta llamadas independientes en el pool de hilos; la latencia
+        total es la de la llamada más lenta y no la suma de todas
+        
+        Args:
+            calls (dict): Clave -> (función, tupla de argumentos)
+            
+        Returns:
+            dict: Clave -> resultado de la función
+        """
+        # Desde un hilo del pool se ejecuta en serie para no agotarlo
+        if len(calls) <= 1 or getattr(self._fetch_local, 'in_pool', False):
+            return {key: func(*args) for key, (func, args) in calls.items()}
+        
+        pool = self._get_fetch_pool()
+        futures = {
+            key: pool.submit(self._run_in_pool, func, args)
+            for key, (func, args) in calls.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def get_many(self, paths, use_cache=True):
+        """
+        Obtiene varias rutas independientes en paralelo
+        
+        Args:
+            paths (list): Rutas en la base de datos
+            use_cache (bool): Usar la caché de snapshots si está vigente
+            
+        Returns:
+            dict: Ruta -> datos obtenidos
+        """
+        try:
+            return self.run_concurrently({
+                path: (self.get_data, (path, use_cache))
+                for path in dict.fromkeys(paths)
+            })
+        except Exception as e:
+            logger.error(f"Error getting data from {list(paths)}: {str(e)}")
+            raise
+
     def set_data(self, path, data):
         """
         Establece datos en una ruta específica
@@ -112,6 +562,8 @@ class FirebaseService:
         try:
             ref = self.get_database_reference(path)
             ref.set(data)
+            self._apply_writes_to_cache([(path, data)])
+            self._apply_to_mirror(path, data)
             logger.info(f"Data set at {path}")
             return True
         except Exception as e:
@@ -132,12 +584,90 @@ class FirebaseService:
         try:
             ref = self.get_database_reference(path)
             ref.update(data)
+            self._apply_writes_to_cache([(f"{path}/{key}", value) for key, value in data.items()])
+            self._apply_to_mirror(path, data, patch=True)
             logger.info(f"Data updated at {path}")
             return True
         except Exception as e:
             logger.error(f"Error updating data at {path}: {str(e)}")
             raise
 
+    def run_transaction(self, path, update_fn):
+        """
+        Modifica un nodo con una transacción: lectura con ETag y escritura
+        condicional. Si otro cliente escribe entre ambas, la escritura se
+        rechaza y ``update_fn`` se vuelve a aplicar sobre el valor nuevo,
+        así que no se pierden actualizaciones concurrentes.
+        
+        Cada intento descarga y reescribe el nodo completo: usarla solo
+        sobre nodos pequeños.
+        
+        Args:
+            path (str): Ruta en la base de datos
+            update_fn (callable): Recibe el valor actual (None si no existe)
+                y retorna el nuevo, o None para cancelar sin escribir
+            
+        Returns:
+            Valor escrito (None si se canceló)
+        """
+        def apply_update(current):
+            updated = update_fn(current)
+            if updated is None:
+                raise _TransactionCancelled()
+            return updated
+        
+        try:
+            ref = self.get_database_reference(path)
+            try:
+                updated = ref.transaction(apply_update)
+            except _TransactionCancelled:
+                logger.debug(f"Transaction cancelled at {path}")
+                return None
+            
+            self._apply_writes_to_cache([(path, updated)])
+            self._apply_to_mirror(path, updated)
+            logger.info(f"Transaction committed at {path}")
+            return updated
+        except Exception as e:
+            logger.error(f"Error in transaction at {path}: {str(e)}")
+            raise
+
+    def multi_path_update(self, updates, root=''):
+        """
+        Escribe varias rutas con un único update() atómico (multi-location)
+        
+        Las rutas no pueden solaparse entre sí (una no puede ser ancestro
+        de otra); un valor None elimina esa ruta.
+        
+        Args:
+            updates (dict): Ruta relativa a ``root`` -> valor
+            root (str): Nodo común desde el que se hace el update()
+            
+        Returns:
+            bool: True si fue exitoso
+        """
+        if not updates:
+            return True
+        
+        try:
+            root = self._normalize_path(root)
+            ref = self.get_database_reference(root)
+            ref.update(updates)
+            
+            writes = [
+                (f"{root}/{relative_path}" if root else relative_path, value)
+                for relative_path, value in updates.items()
+            ]
+            self._apply_writes_to_cache(writes)
+            for path, value in writes:
+                self._apply_to_mirror(path, value)
+            
+            logger.info(f"Multi-path update of {len(updates)} paths at {root or '/'}")
+            return True
+        except Exception as e:
+            logger.error(f"Error in multi-path update at {root or '/'}: {str(e)}")
+            raise
+
     def delete_data(self, path):
         """
         Elimina datos de una ruta específica
@@ -151,22 +681,55 @@ class FirebaseService:
         try:
             ref = self.get_database_reference(path)
             ref.delete()
+            self._apply_writes_to_cache([(path, None)])
+            self._apply_to_mirror(path, None)
             logger.info(f"Data deleted from {path}")
             return True
         except Exception as e:
             logger.error(f"Error deleting data from {path}: {str(e)}")
             raise
 
-    def query_data(self, path, order_by=None, equal_to=None, limit_to_first=None, limit_to_last=None):
+    def delete_if_exists(self, path):
+        """
+        Elimina un nodo solo si existe
+        
+        La existencia se comprueba con una lectura shallow (solo las claves
+        hijas, sin descargar el contenido) y luego se elimina el nodo.
+        
+        Args:
+            path (str): Ruta en la base de datos
+            
+        Returns:
+            bool: True si se eliminó, False si no existía
+        """
+        try:
+            ref = self.get_database_reference(path)
+            if ref.get(shallow=True) is None:
+                logger.debug(f"Conditional delete skipped, no data at {path}")
+                return False
+            
+            ref.delete()
+            self._apply_writes_to_cache([(path, None)])
+            self._apply_to_mirror(path, None)
+            logger.info(f"Data deleted from {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error conditionally deleting data from {path}: {str(e)}")
+            raise
+
+    def query_data(self, path, order_by=None, equal_to=None, limit_to_first=None, limit_to_last=None,
+                   start_at=None, end_at=None):
         """
         Realiza consultas en la base de datos
         
         Args:
             path (str): Ruta en la base de datos
-            order_by (str): Campo por el cual ordenar
+            order_by (str): Campo por el cual ordenar ('$key' ordena por clave)
             equal_to: Valor a buscar
             limit_to_first (int): Limitar resultados desde el inicio
             limit_to_last (int): Limitar resultados desde el final
+            start_at: Valor inicial (inclusivo) del orden
+            end_at: Valor final (inclusivo) del orden
             
         Returns:
             dict: Resultados de la consulta
@@ -174,11 +737,19 @@ class FirebaseService:
         try:
             ref = self.get_database_reference(path)
             
-            if order_by:
+            if order_by == self.ORDER_BY_KEY:
+                ref = ref.order_by_key()
+            elif order_by:
                 ref = ref.order_by_child(order_by)
                 
             if equal_to is not None:
                 ref = ref.equal_to(equal_to)
+            
+            if start_at is not None:
+                ref = ref.start_at(start_at)
+            
+            if end_at is not None:
+                ref = ref.end_at(end_at)
                 
             if limit_to_first:
                 ref = ref.limit_to_first(limit_to_first)
@@ -230,6 +801,7 @@ class FirebaseService:
             bucket = self.get_storage_bucket()
             blob = bucket.blob(remote_path)
             blob.delete()
+            self.discard_file_url(remote_path)
             
             logger.info(f"File deleted from {remote_path}")
             return True
@@ -237,32 +809,79 @@ class FirebaseService:
             logger.error(f"Error deleting file: {str(e)}")
             raise
 
-    def get_file_url(self, remote_path):
+    def get_file_url(self, remote_path, use_cache=True):
         """
         Obtiene la URL de un archivo en Storage
         
         Args:
             remote_path (str): Ruta remota en Storage
+            use_cache (bool): Reutilizar una URL firmada que siga vigente
             
         Returns:
             str: URL del archivo
         """
         try:
+            if use_cache:
+                with self._signed_url_lock:
+                    entry = self._signed_urls.get(remote_path)
+                    if entry is not None:
+                        if time.monotonic() < entry[0]:
+                            self._signed_urls.move_to_end(remote_path)
+                            return entry[1]
+                        del self._signed_urls[remote_path]
+            
             bucket = self.get_storage_bucket()
             blob = bucket.blob(remote_path)
             
-            # Generar URL firmada válida por 1 hora
+            # Generar URL firmada (válida por 1 hora por defecto)
+            signed_at = time.monotonic()
             url = blob.generate_signed_url(
                 version="v4",
-                expiration=3600,  # 1 hora
+                expiration=self.signed_url_expiration,
                 method="GET"
             )
             
+            # Se deja de reutilizar un margen antes de la expiración real
+            with self._signed_url_lock:
+                self._signed_urls[remote_path] = (
+                    signed_at + self.signed_url_expiration - self.signed_url_margin,
+                    url
+                )
+                self._signed_urls.move_to_end(remote_path)
+                while len(self._signed_urls) > self.signed_url_max_entries:
+                    self._signed_urls.popitem(last=False)
+            
             return url
         except Exception as e:
             logger.error(f"Error getting file URL: {str(e)}")
             raise
 
+    def get_file_urls(self, remote_paths):
+        """
+        Obtiene las URLs de varios archivos; solo se firman las que no
+        están en caché
+        
+        Args:
+            remote_paths (list): Rutas remotas en Storage
+            
+        Returns:
+            dict: Ruta -> URL (o la excepción si no se pudo firmar)
+        """
+        urls = {}
+        for remote_path in dict.fromkeys(remote_paths):
+            try:
+                urls[remote_path] = self.get_file_url(remote_path)
+            except Exception as e:
+                urls[remote_path] = e
+        return urls
+
+    def discard_file_url(self, remote_path):
+        """
+        Descarta la URL firmada en caché de un archivo
+        """
+        with self._signed_url_lock:
+            self._signed_urls.pop(remote_path, None)
+
     def list_files_in_folder(self, folder_path):
         """
         Lista archivos en una carpeta de Storage
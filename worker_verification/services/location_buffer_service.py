@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from django.conf import settings
+from datetime import datetime
+from firebase_admin import exceptions as firebase_exceptions
+import atexit
+import logging
+import math
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class LocationBufferService:
+    """
+    Acumula las ubicaciones que envían las apps y las escribe por ventanas
+
+    Dentro de una ventana de FLUSH_INTERVAL_SECONDS solo se conserva la
+    última posición de cada trabajador; al cerrarse la ventana todas se
+    escriben con un único multi-path update. El buffer es por proceso: con
+    varios procesos web cada uno escribe su propio lote.
+
+    Para descartar posiciones atrasadas también entre ventanas se recuerda,
+    para los últimos MAX_TRACKED_WORKERS trabajadores, la hora de la última
+    posición aceptada. Solo se comparan horas del mismo reloj: la del
+    dispositivo (``timestamp`` enviado) o, si no viene, la de recepción.
+    """
+
+    CLOCK_DEVICE = 'device'
+    CLOCK_SERVER = 'server'
+    
+    # Errores de escritura tras los que el lote se reintenta (red, cuota,
+    # fallos del servidor); con cualquier otro el lote se descarta
+    TRANSIENT_WRITE_ERRORS = (
+        firebase_exceptions.UnavailableError,
+        firebase_exceptions.DeadlineExceededError,
+        firebase_exceptions.ResourceExhaustedError,
+        firebase_exceptions.InternalError,
+    )
+
+    def __init__(self):
+        buffer_config = getattr(settings, 'LOCATION_BUFFER', {})
+        self.flush_interval = buffer_config.get('FLUSH_INTERVAL_SECONDS', 2.0)
+        self.max_pending = max(1, buffer_config.get('MAX_PENDING', 5000))
+        self.max_tracked = max(1, buffer_config.get('MAX_TRACKED_WORKERS', 50000))
+        self._pending = {}
+        self._latest = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _accept(self, worker_id, clock, sent_at):
+        """
+        Indica si la posición es más reciente que la última aceptada del
+        trabajador y, si lo es, la registra (se llama con self._lock tomado)
+        """
+        latest = self._latest.get(worker_id)
+        if latest is not None and latest[0] == clock and sent_at < latest[1]:
+            return False
+
+        self._latest[worker_id] = (clock, sent_at)
+        self._latest.move_to_end(worker_id)
+        while len(self._latest) > self.max_tracked:
+            self._latest.popitem(last=False)
+        return True
+
+    @staticmethod
+    def _valid_coordinates(latitude, longitude):
+        # NaN o infinito hacen fallar la serialización JSON de todo el lote
+        return (
+            isinstance(latitude, (int, float)) and isinstance(longitude, (int, float))
+            and math.isfinite(latitude) and math.isfinite(longitude)
+            and -90 <= latitude <= 90 and -180 <= longitude <= 180
+        )
+
+    def _schedule_flush(self):
+        # Se llama con self._lock tomado
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def submit(self, locations):
+        """
+        Encola posiciones; se descartan las más antiguas que la última
+        aceptada del mismo trabajador, aunque ya se haya escrito
+
+        Args:
+            locations (list): Dicts con workerId, latitude, longitude y
+                opcionalmente timestamp (ms, hora del dispositivo) para
+                ordenar posiciones que llegan desordenadas
+
+        Returns:
+            dict: Posiciones que quedaron en el buffer (accepted), las
+                descartadas por atrasadas o inválidas (discarded) y
+                trabajadores pendientes de escribir
+        """
+        received_at = int(datetime.now().timestamp() * 1000)
+        accepted = 0
+
+        with self._lock:
+            for location in locations:
+                worker_id = location['workerId']
+                if not self._valid_coordinates(location['latitude'], location['longitude']):
+                    continue
+                if location.get('timestamp'):
+                    clock, sent_at = self.CLOCK_DEVICE, location['timestamp']
+                else:
+                    clock, sent_at = self.CLOCK_SERVER, received_at
+                if self._accept(worker_id, clock, sent_at):
+                    self._pending[worker_id] = (
+                        location['latitude'], location['longitude'], received_at
+                    )
+                    accepted += 1
+
+            pending = len(self._pending)
+            flush_now = self.flush_interval <= 0 or pending >= self.max_pending
+            if not flush_now:
+                self._schedule_flush()
+
+        if flush_now:
+            self.flush()
+
+        return {
+            'accepted': accepted,
+            'discarded': len(locations) - accepted,
+            'pending': pending
+        }
+
+    def flush(self):
+        """
+        Escribe las posiciones pendientes con un único multi-path update
+
+        Si la escritura falla por un error transitorio, las posiciones
+        vuelven al buffer (salvo que ya haya llegado una más reciente del
+        mismo trabajador) y se reintentan en la próxima ventana; con
+        cualquier otro error el lote se descarta.
+
+        Returns:
+            dict: Resultado de la escritura (None si no había pendientes)
+        """
+        from .worker_service import worker_service
+
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._pending = self._pending, {}
+
+            if not batch:
+                return None
+
+            try:
+                return worker_service.update_worker_locations(batch)
+            except self.TRANSIENT_WRITE_ERRORS as e:
+                logger.error(f"Error flushing {len(batch)} buffered locations: {str(e)}")
+                with self._lock:
+                    # Una posición aceptada durante la escritura es más reciente
+                    for worker_id, entry in batch.items():
+                        self._pending.setdefault(worker_id, entry)
+                    self._schedule_flush()
+                return None
+            except Exception as e:
+                # Reintentar un error no transitorio bloquearía todas las
+                # escrituras siguientes del proceso
+                logger.error(f"Dropping {len(batch)} buffered locations after non-retryable error: {str(e)}")
+                return None
+
+
+# Instancia global del servicio
+location_buffer_service = LocationBufferService()
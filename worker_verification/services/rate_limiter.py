@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Limitador de tasa (token bucket) compartido entre hilos
+
+    Permite ráfagas de hasta ``burst`` llamadas y, en promedio, no más de
+    ``rate`` llamadas por segundo.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): Llamadas por segundo (<= 0 desactiva el límite)
+            burst (int): Tamaño máximo de ráfaga (por defecto ``rate``)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, float(burst if burst is not None else rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Bloquea hasta que haya un token disponible y lo consume
+        """
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
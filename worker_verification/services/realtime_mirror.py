@@ -0,0 +1,171 @@
+from firebase_admin import db
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeMirror:
+    """
+    Réplica local de un nodo de Realtime Database mantenida con un stream
+    ``listen()`` en segundo plano.
+
+    El primer evento ``put`` en la raíz entrega el snapshot completo; a partir
+    de ahí los eventos ``put``/``patch`` se aplican de forma incremental.
+    """
+
+    def __init__(self, root_path):
+        self.root_path = root_path.strip('/')
+        self._data = None
+        self._synced = False
+        self._lock = threading.RLock()
+        self._registration = None
+        self._starting = False
+
+    @staticmethod
+    def _split(path):
+        return [segment for segment in (path or '').strip('/').split('/') if segment]
+
+    @staticmethod
+    def _clone(node):
+        # Un ida y vuelta por JSON es más rápido que deepcopy en árboles grandes
+        return json.loads(json.dumps(node))
+
+    def start(self):
+        """
+        Inicia el stream en un hilo daemon
+
+        El SDK crea el hilo del stream heredando el flag daemon del hilo que
+        llama a ``listen()``; así el proceso puede terminar sin cerrarlo.
+        """
+        with self._lock:
+            if self._starting or self.is_running():
+                return
+            self._starting = True
+            self._synced = False
+
+        threading.Thread(
+            target=self._listen,
+            name=f"rtdb-mirror:{self.root_path}",
+            daemon=True
+        ).start()
+
+    def _listen(self):
+        try:
+            self._registration = db.reference(self.root_path).listen(self._handle_event)
+            logger.info(f"Realtime mirror started for {self.root_path}")
+        except Exception as e:
+            logger.error(f"Error starting realtime mirror for {self.root_path}: {str(e)}")
+        finally:
+            with self._lock:
+                self._starting = False
+
+    def stop(self):
+        """
+        Cierra el stream y descarta la réplica
+        """
+        with self._lock:
+            registration = self._registration
+            self._registration = None
+            self._synced = False
+            self._data = None
+
+        if registration is not None:
+            try:
+                registration.close()
+            except Exception as e:
+                logger.warning(f"Error closing realtime mirror for {self.root_path}: {str(e)}")
+
+    def is_running(self):
+        """
+        Indica si el hilo del stream sigue vivo (el SDK no expone otro indicador)
+        """
+        thread = getattr(self._registration, '_thread', None)
+        return thread is not None and thread.is_alive()
+
+    def is_synced(self):
+        return self._synced and self.is_running()
+
+    def _handle_event(self, event):
+        try:
+            if event.event_type == 'put':
+                self.apply_put(event.path, event.data)
+                if not self._split(event.path):
+                    self._synced = True
+            elif event.event_type == 'patch':
+                self.apply_patch(event.path, event.data)
+            elif event.event_type in ('cancel', 'auth_revoked'):
+                logger.warning(f"Realtime mirror for {self.root_path} received {event.event_type}")
+                self._synced = False
+        except Exception as e:
+            # Un evento que no se pudo aplicar deja la réplica inconsistente
+            logger.error(f"Error applying event to realtime mirror {self.root_path}: {str(e)}")
+            self._synced = False
+
+    def apply_put(self, path, data):
+        """
+        Reemplaza el nodo en ``path`` (relativo a la raíz) por ``data``
+        """
+        segments = self._split(path)
+
+        with self._lock:
+            if not segments:
+                self._data = data
+                return
+
+            if not isinstance(self._data, dict):
+                if data is None:
+                    return
+                self._data = {}
+
+            node = self._data
+            for segment in segments[:-1]:
+                child = node.get(segment)
+                if not isinstance(child, dict):
+                    if data is None:
+                        return
+                    child = {}
+                    node[segment] = child
+                node = child
+
+            if data is None:
+                node.pop(segments[-1], None)
+            else:
+                node[segments[-1]] = data
+
+    def apply_patch(self, path, data):
+        """
+        Actualiza los hijos indicados en ``data`` bajo ``path``
+        """
+        if not isinstance(data, dict):
+            return
+
+        base = '/'.join(self._split(path))
+        with self._lock:
+            for key, value in data.items():
+                self.apply_put(f"{base}/{key}" if base else key, value)
+
+    def keys(self, path=''):
+        """
+        Retorna las claves hijas del nodo en ``path`` sin copiar su contenido
+        """
+        with self._lock:
+            node = self._data
+            for segment in self._split(path):
+                if not isinstance(node, dict) or segment not in node:
+                    return []
+                node = node[segment]
+            return list(node.keys()) if isinstance(node, dict) else []
+
+    def get(self, path=''):
+        """
+        Retorna una copia del nodo en ``path`` (relativo a la raíz)
+        """
+        with self._lock:
+            node = self._data
+            for segment in self._split(path):
+                if not isinstance(node, dict) or segment not in node:
+                    return None
+                node = node[segment]
+            return self._clone(node)
@@ -0,0 +1,274 @@
+from bisect import bisect_left
+from collections import defaultdict
+import re
+import threading
+import time
+import unicodedata
+
+
+def normalize_text(value):
+    """
+    Normaliza texto para búsqueda: minúsculas y sin tildes ni diéresis
+    ("Pérez" -> "perez", "Güiza" -> "guiza")
+    """
+    if value is None:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value).lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z]+')
+
+
+def tokenize(value):
+    """
+    Divide un texto normalizado en términos
+    """
+    return [token for token in _TOKEN_SPLIT.split(normalize_text(value)) if token]
+
+
+class SearchIndex:
+    """
+    Índice invertido en memoria con búsqueda por prefijo
+
+    Cada término apunta a los registros que lo contienen y el vocabulario se
+    mantiene ordenado, de modo que los términos con un prefijo dado se
+    localizan con una búsqueda binaria. Los resultados se ordenan por
+    relevancia (coincidencia exacta > prefijo, ponderada por campo).
+
+    Opcionalmente indexa facetas (categoría, disponibilidad, ...): cada valor
+    apunta al conjunto de registros que lo tienen, y los filtros combinados
+    se resuelven intersectando esos conjuntos.
+    """
+
+    EXACT_MATCH_SCORE = 2.0
+    PREFIX_MATCH_SCORE = 1.0
+
+    def __init__(self, fields, ttl=None, facets=None):
+        """
+        Args:
+            fields (dict): Campo indexado -> peso en la relevancia
+            ttl (int): Segundos tras los cuales el índice se considera obsoleto
+            facets (dict): Nombre de faceta -> función que extrae su valor
+                de un registro (opcional)
+        """
+        self.fields = fields
+        self.ttl = ttl
+        self.facets = facets or {}
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._postings = defaultdict(dict)
+        self._vocabulary = []
+        self._record_terms = {}
+        self._facet_postings = {name: defaultdict(set) for name in self.facets}
+        self._record_facets = {}
+        self._records = {}
+        self._built_at = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def is_fresh(self):
+        """
+        Indica si el índice está construido y dentro de su TTL
+        """
+        if self._built_at is None:
+            return False
+        if self.ttl is None:
+            return True
+        return time.monotonic() - self._built_at < self.ttl
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def build(self, records):
+        """
+        Reconstruye el índice completo
+
+        Args:
+            records (dict): ID -> registro
+        """
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._record_terms = {}
+            self._facet_postings = {name: defaultdict(set) for name in self.facets}
+            self._record_facets = {}
+            self._records = {}
+
+            for record_id, record in records.items():
+                self._add(record_id, record)
+
+            self._vocabulary = sorted(self._postings)
+            self._built_at = time.monotonic()
+
+    def ensure_fresh(self, loader):
+        """
+        Reconstruye el índice con los registros de ``loader()`` si no está
+        vigente; un solo hilo hace la descarga aunque lleguen varias búsquedas
+        """
+        if self.is_fresh():
+            return
+
+        with self._build_lock:
+            if not self.is_fresh():
+                self.build(loader())
+
+    def upsert(self, record_id, record):
+        """
+        Agrega o reemplaza un registro
+        """
+        with self._lock:
+            self._remove(record_id)
+            for term in self._add(record_id, record):
+                position = bisect_left(self._vocabulary, term)
+                if position == len(self._vocabulary) or self._vocabulary[position] != term:
+                    self._vocabulary.insert(position, term)
+
+    def remove(self, record_id):
+        """
+        Elimina un registro del índice
+        """
+        with self._lock:
+            self._remove(record_id)
+
+    def get(self, record_id):
+        """
+        Registro indexado con ese ID (o None)
+        """
+        return self._records.get(record_id)
+
+    def is_built(self):
+        return self._built_at is not None
+
+    def _term_weights(self, record):
+        weights = {}
+        for field, weight in self.fields.items():
+            for term in tokenize(record.get(field)):
+                weights[term] = max(weights.get(term, 0), weight)
+        return weights
+
+    def _add(self, record_id, record):
+        weights = self._term_weights(record)
+        for term, weight in weights.items():
+            self._postings[term][record_id] = weight
+
+        facet_values = {}
+        for name, extract in self.facets.items():
+            value = extract(record)
+            self._facet_postings[name][value].add(record_id)
+            facet_values[name] = value
+
+        self._record_terms[record_id] = list(weights)
+        self._record_facets[record_id] = facet_values
+        self._records[record_id] = record
+        return weights
+
+    def _remove(self, record_id):
+        for term in self._record_terms.pop(record_id, []):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(record_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect_left(self._vocabulary, term)
+                if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                    del self._vocabulary[position]
+
+        for name, value in self._record_facets.pop(record_id, {}).items():
+            members = self._facet_postings[name].get(value)
+            if members is not None:
+                members.discard(record_id)
+                if not members:
+                    del self._facet_postings[name][value]
+
+        self._records.pop(record_id, None)
+
+    def _match_term(self, query_term):
+        """
+        Registros cuyo algún término empieza por query_term, con su puntaje
+        """
+        scores = {}
+        position = bisect_left(self._vocabulary, query_term)
+
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(query_term):
+            term = self._vocabulary[position]
+            match_score = self.EXACT_MATCH_SCORE if term == query_term else self.PREFIX_MATCH_SCORE
+            for record_id, weight in self._postings[term].items():
+                score = match_score * weight
+                if score > scores.get(record_id, 0):
+                    scores[record_id] = score
+            position += 1
+
+        return scores
+
+    def filter(self, **criteria):
+        """
+        IDs de los registros que cumplen todas las facetas indicadas
+
+        Args:
+            **criteria: Faceta -> valor requerido
+
+        Returns:
+            set: IDs que coinciden
+        """
+        with self._lock:
+            if not criteria:
+                return set(self._records)
+
+            member_sets = []
+            for name, value in criteria.items():
+                members = self._facet_postings[name].get(value)
+                if not members:
+                    return set()
+                member_sets.append(members)
+
+            # Intersectar empezando por el conjunto más pequeño
+            member_sets.sort(key=len)
+            result = set(member_sets[0])
+            for members in member_sets[1:]:
+                result &= members
+                if not result:
+                    break
+            return result
+
+    def search(self, query, limit=None, candidates=None):
+        """
+        Busca registros que contengan todos los términos de la consulta
+        (cada uno como prefijo de algún término del registro)
+
+        Args:
+            query (str): Texto a buscar
+            limit (int): Máximo de resultados (opcional)
+            candidates (set): Restringir la búsqueda a estos IDs (opcional)
+
+        Returns:
+            list: IDs ordenados por relevancia
+        """
+        query_terms = tokenize(query)
+        if not query_terms:
+            return []
+
+        with self._lock:
+            totals = None
+            for query_term in query_terms:
+                scores = self._match_term(query_term)
+                if totals is None:
+                    if candidates is not None:
+                        scores = {
+                            record_id: score for record_id, score in scores.items()
+                            if record_id in candidates
+                        }
+                    totals = scores
+                else:
+                    totals = {
+                        record_id: totals[record_id] + score
+                        for record_id, score in scores.items()
+                        if record_id in totals
+                    }
+                if not totals:
+                    return []
+
+        ranked = sorted(totals, key=lambda record_id: (-totals[record_id], record_id))
+        return ranked[:limit] if limit else ranked
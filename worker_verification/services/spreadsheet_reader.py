@@ -0,0 +1,90 @@
+import codecs
+import csv
+import os
+from openpyxl import load_workbook
+
+
+def normalize_column(name):
+    """
+    Normaliza un encabezado de columna ("Precio por hora" -> "precio_por_hora")
+    """
+    if name is None:
+        return ''
+    return str(name).lower().strip().replace(' ', '_')
+
+
+def _is_blank(value):
+    return value is None or value == ''
+
+
+def _iter_xlsx(source):
+    # read_only carga las filas bajo demanda en lugar del libro completo
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_xls(source):
+    # El formato .xls antiguo no se puede leer por streaming
+    import pandas as pd
+
+    df = pd.read_excel(source, header=None, dtype=object)
+    df = df.astype(object).where(df.notna(), None)
+    yield from df.itertuples(index=False, name=None)
+
+
+def _iter_csv(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8-sig') as handle:
+            yield from csv.reader(handle)
+        return
+
+    text = codecs.getreader('utf-8-sig')(source)
+    yield from csv.reader(text)
+
+
+def iter_spreadsheet_rows(source, file_name=''):
+    """
+    Lee una hoja de cálculo fila por fila sin cargarla completa en memoria
+
+    Args:
+        source: Ruta o archivo binario (.xlsx, .xls o .csv)
+        file_name (str): Nombre del archivo, para detectar el formato
+
+    Returns:
+        tuple: (columnas normalizadas, iterador de (número de fila, dict))
+
+    Las filas completamente vacías se omiten; el número de fila es el de la
+    hoja (la primera fila de datos es la 2). En CSV las celdas vacías se
+    leen como None, igual que en Excel. Si un encabezado se repite se usa
+    la primera columna con ese nombre.
+    """
+    extension = os.path.splitext(file_name or getattr(source, 'name', '') or '')[1].lower()
+    if extension == '.csv':
+        rows = _iter_csv(source)
+    elif extension == '.xls':
+        rows = _iter_xls(source)
+    else:
+        rows = _iter_xlsx(source)
+
+    header = next(rows, None) or ()
+    columns = [normalize_column(name) for name in header]
+
+    # Si una columna se repite se usa la primera; las vacías se ignoran
+    positions = {}
+    for position, column in enumerate(columns):
+        if column:
+            positions.setdefault(column, position)
+
+    def records():
+        for row_number, values in enumerate(rows, start=2):
+            if all(_is_blank(value) for value in values):
+                continue
+            yield row_number, {
+                column: None if position >= len(values) or _is_blank(values[position]) else values[position]
+                for column, position in positions.items()
+            }
+
+    return columns, records()
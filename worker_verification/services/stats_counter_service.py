@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from ..models import StatCounter
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCounterService:
+    """
+    Servicio para los contadores agregados del dashboard
+
+    Cada ámbito ('workers', 'documents') se siembra con un recorrido completo
+    y luego se mantiene aplicando deltas desde las rutas de escritura. Los
+    contadores se reconcilian con un nuevo recorrido cada RECONCILE_SECONDS,
+    porque las apps móviles también escriben directamente en Firebase.
+    """
+
+    SEEDED_AT_KEY = '__seeded_at__'
+
+    def __init__(self):
+        counters_config = getattr(settings, 'STATS_COUNTERS', {})
+        self.reconcile_seconds = counters_config.get('RECONCILE_SECONDS', 120)
+
+    def _key(self, scope, name):
+        return f"{scope}.{name}"
+
+    def get_counters(self, scope):
+        """
+        Obtiene los contadores vigentes de un ámbito
+
+        Args:
+            scope (str): Ámbito de los contadores
+
+        Returns:
+            dict: Contadores (sin prefijo) o None si hay que recalcularlos
+        """
+        try:
+            rows = StatCounter.objects.filter(key__startswith=f"{scope}.").values_list('key', 'value')
+            counters = {key[len(scope) + 1:]: value for key, value in rows}
+
+            seeded_at = counters.pop(self.SEEDED_AT_KEY, None)
+            if seeded_at is None or time.time() - seeded_at > self.reconcile_seconds:
+                return None
+
+            return counters
+        except Exception as e:
+            logger.warning(f"Error reading {scope} counters: {str(e)}")
+            return None
+
+    def seed(self, scope, counters):
+        """
+        Reemplaza los contadores de un ámbito con valores recién calculados
+
+        Args:
+            scope (str): Ámbito de los contadores
+            counters (dict): Valores por nombre de contador
+        """
+        try:
+            rows = [
+                StatCounter(key=self._key(scope, name), value=value)
+                for name, value in counters.items()
+            ]
+            rows.append(StatCounter(key=self._key(scope, self.SEEDED_AT_KEY), value=int(time.time())))
+
+            with transaction.atomic():
+                StatCounter.objects.filter(key__startswith=f"{scope}.").delete()
+                StatCounter.objects.bulk_create(rows)
+
+            logger.debug(f"Seeded {len(counters)} {scope} counters")
+        except Exception as e:
+            logger.warning(f"Error seeding {scope} counters: {str(e)}")
+
+    def apply_delta(self, scope, before_keys, after_keys):
+        """
+        Aplica el cambio de un registro a los contadores
+
+        Args:
+            scope (str): Ámbito de los contadores
+            before_keys (set): Contadores en los que participaba el registro
+            after_keys (set): Contadores en los que participa ahora
+        """
+        self.apply_deltas(scope, [(before_keys, after_keys)])
+
+    def apply_deltas(self, scope, changes):
+        """
+        Aplica el cambio de varios registros en una sola transacción
+
+        Args:
+            scope (str): Ámbito de los contadores
+            changes (list): Pares (contadores antes, contadores después)
+        """
+        deltas = {}
+        for before_keys, after_keys in changes:
+            for name in after_keys - before_keys:
+                deltas[name] = deltas.get(name, 0) + 1
+            for name in before_keys - after_keys:
+                deltas[name] = deltas.get(name, 0) - 1
+
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        try:
+            with transaction.atomic():
+                for name, delta in deltas.items():
+                    key = self._key(scope, name)
+                    updated = StatCounter.objects.filter(key=key).update(value=F('value') + delta)
+                    if not updated:
+                        StatCounter.objects.create(key=key, value=delta)
+        except Exception as e:
+            logger.warning(f"Error applying delta to {scope} counters: {str(e)}")
+            self.invalidate(scope)
+
+    def invalidate(self, scope):
+        """
+        Fuerza un recálculo completo en la próxima lectura
+
+        Args:
+            scope (str): Ámbito de los contadores
+        """
+        try:
+            StatCounter.objects.filter(key=self._key(scope, self.SEEDED_AT_KEY)).delete()
+        except Exception as e:
+            logger.warning(f"Error invalidating {scope} counters: {str(e)}")
+
+
+# Instancia global del servicio
+stats_counter_service = StatsCounterService()
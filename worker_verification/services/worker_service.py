@@ -1,10 +1,20 @@
 from .firebase_service import firebase_service
+from .stats_counter_service import stats_counter_service
+from .search_index import SearchIndex
+from django.conf import settings
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+def _verification_status(worker):
+    verification_status = worker.get('verificationStatus', {})
+    if isinstance(verification_status, dict):
+        return verification_status.get('status')
+    return None
+
+
 class WorkerService:
     """
     Servicio para manejar operaciones relacionadas con trabajadores
@@ -13,8 +23,134 @@ class WorkerService:
     WORKERS_PATH = 'User/Trabajadores'
     ACTIVE_WORKERS_PATH = 'active_workers'
     
+    COUNTERS_SCOPE = 'workers'
+    OFFSET_CURSOR_PREFIX = '#'
+    
+    # Copias de ratingStats al nivel superior antes de desistir
+    RATING_COPY_ATTEMPTS = 5
+    
+    # Campos indexados para búsqueda y su peso en la relevancia
+    SEARCH_FIELDS = {
+        'name': 3,
+        'lastName': 3,
+        'email': 2,
+        'work': 1,
+    }
+    
+    # Facetas filtrables en memoria (ver filter_workers)
+    FILTER_FACETS = {
+        'category': lambda worker: worker.get('work'),
+        'available': lambda worker: bool(worker.get('isAvailable', False)),
+        'online': lambda worker: bool(worker.get('isOnline', False)),
+        'verification_status': _verification_status,
+    }
+    
     def __init__(self):
         self.firebase = firebase_service
+        self.search_index = SearchIndex(
+            self.SEARCH_FIELDS,
+            ttl=getattr(settings, 'SEARCH_INDEX', {}).get('TTL_SECONDS', 120),
+            facets=self.FILTER_FACETS
+        )
+    
+    def _load_search_records(self):
+        workers = self.firebase.get_data(self.WORKERS_PATH) or {}
+        return {
+            worker_id: {**worker_data, 'id': worker_id}
+            for worker_id, worker_data in workers.items()
+            if isinstance(worker_data, dict)
+        }
+    
+    def _sync_search_index(self, worker_id, update_data=None, replace=None, deleted=False):
+        """
+        Refleja una escritura en el índice de búsqueda, si está construido
+        """
+        if not self.search_index.is_built():
+            return
+        
+        if deleted:
+            self.search_index.remove(worker_id)
+            return
+        
+        if replace is not None:
+            record = dict(replace)
+        else:
+            current = self.search_index.get(worker_id)
+            if current is None:
+                # Registro desconocido: la próxima reconstrucción lo incluirá
+                self.search_index.invalidate()
+                return
+            record = {**current, **update_data}
+        
+        record['id'] = worker_id
+        self.search_index.upsert(worker_id, record)
+    
+    def _counter_keys(self, worker):
+        """
+        Contadores de estadísticas en los que participa un trabajador
+        """
+        if not isinstance(worker, dict):
+            return set()
+        
+        keys = {'total', f"by_category.{worker.get('work', 'Sin categoría')}"}
+        
+        if worker.get('isAvailable', False):
+            keys.add('available')
+        if worker.get('isOnline', False):
+            keys.add('online')
+        
+        verification_status = worker.get('verificationStatus', {})
+        if isinstance(verification_status, dict) and verification_status.get('status') == 'approved':
+            keys.add('verified')
+        
+        return keys
+    
+    def _track_counter_change(self, found, before, after):
+        """
+        Aplica a los contadores el cambio de un trabajador
+        
+        Si el estado previo no estaba en memoria no se puede calcular el
+        delta sin otra lectura; en ese caso se fuerza un recálculo.
+        """
+        if not found:
+            stats_counter_service.invalidate(self.COUNTERS_SCOPE)
+            return
+        
+        stats_counter_service.apply_delta(
+            self.COUNTERS_SCOPE,
+            self._counter_keys(before),
+            self._counter_keys(after)
+        )
+    
+    def _peek_worker(self, worker_id):
+        """
+        Estado previo de un trabajador sin consultar la red, para calcular
+        el delta de los contadores
+        
+        Se busca en la réplica o la caché y, si no está, en el índice de
+        búsqueda, que refleja las escrituras hechas desde el panel. Un
+        trabajador que no está en un índice construido se toma como nuevo.
+        
+        Returns:
+            tuple: (encontrado, datos)
+        """
+        found, before = self.firebase.peek_data(f"{self.WORKERS_PATH}/{worker_id}")
+        if found or not self.search_index.is_built():
+            return found, before
+        
+        record = self.search_index.get(worker_id)
+        if record is None:
+            return True, None
+        return True, {key: value for key, value in record.items() if key != 'id'}
+    
+    @staticmethod
+    def _merge(current, update_data):
+        """
+        Resultado de aplicar un update() de Firebase sobre el registro actual
+        """
+        if not isinstance(current, dict):
+            return dict(update_data)
+        return {**current, **update_data}
     
     def get_all_workers(self):
         """
@@ -41,6 +177,50 @@ class WorkerService:
             logger.error(f"Error getting all workers: {str(e)}")
             raise
     
+    def get_workers_page(self, cursor=None, page_size=20):
+        """
+        Obtiene una página de trabajadores ordenados por ID
+        
+        Solo descarga los registros de la página (order_by_key + start_at +
+        limit_to_first) en lugar del árbol completo.
+        
+        Args:
+            cursor (str): ID del último trabajador de la página anterior
+            page_size (int): Tamaño de la página
+            
+        Returns:
+            tuple: (lista de trabajadores, cursor de la siguiente página o None)
+        """
+        try:
+            # start_at es inclusivo: se pide un registro extra para descartar
+            # el cursor y otro para saber si hay una página siguiente
+            limit = page_size + (2 if cursor else 1)
+            
+            workers = self.firebase.query_data(
+                self.WORKERS_PATH,
+                order_by=self.firebase.ORDER_BY_KEY,
+                start_at=cursor,
+                limit_to_first=limit
+            ) or {}
+            
+            workers_list = []
+            for worker_id, worker_data in workers.items():
+                if worker_id == cursor or not isinstance(worker_data, dict):
+                    continue
+                worker_data['id'] = worker_id
+                workers_list.append(worker_data)
+            
+            next_cursor = None
+            if len(workers_list) > page_size:
+                workers_list = workers_list[:page_size]
+                next_cursor = workers_list[-1]['id']
+            
+            logger.info(f"Retrieved page of {len(workers_list)} workers")
+            return workers_list, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting workers page: {str(e)}")
+            raise
+    
     def get_worker_by_id(self, worker_id):
         """
         Obtiene un trabajador por su ID
@@ -177,7 +357,10 @@ class WorkerService:
             worker_data['totalRatings'] = worker_data.get('totalRatings', 0)
             
             path = f"{self.WORKERS_PATH}/{worker_id}"
+            found, before = self._peek_worker(worker_id)
             self.firebase.set_data(path, worker_data)
+            self._track_counter_change(found, before, worker_data)
+            self._sync_search_index(worker_id, replace=worker_data)
             
             logger.info(f"Worker {worker_id} created successfully")
             return worker_data
@@ -187,21 +370,39 @@ class WorkerService:
     
     def update_worker(self, worker_id, update_data):
         """
-        Actualiza datos de un trabajador
+        Actualiza datos de un trabajador si existe
+        
+        La existencia se comprueba con una lectura shallow (solo las claves
+        del registro) y luego se escriben únicamente los campos recibidos.
+        
+        Son dos solicitudes sin garantía de atomicidad: la API REST no admite
+        un update() condicional y una transacción o un set_if_unchanged
+        descargarían y reescribirían el registro completo. Si el trabajador
+        se elimina entre la comprobación y la escritura, el update() deja un
+        registro huérfano con solo los campos enviados y el timestamp. Es
+        poco probable (la ventana es de una ida y vuelta) y el registro se
+        puede eliminar de nuevo con delete_worker.
         
         Args:
             worker_id (str): ID del trabajador
             update_data (dict): Datos a actualizar
             
         Returns:
-            bool: True si fue exitoso
+            bool: True si fue exitoso, False si el trabajador no existe
         """
         try:
+            path = f"{self.WORKERS_PATH}/{worker_id}"
+            if not self.firebase.get_keys(path, use_cache=False):
+                logger.warning(f"Worker {worker_id} not found")
+                return False
+            
             # Actualizar timestamp
             update_data['timestamp'] = int(datetime.now().timestamp() * 1000)
             
-            path = f"{self.WORKERS_PATH}/{worker_id}"
+            found, before = self._peek_worker(worker_id)
             self.firebase.update_data(path, update_data)
+            self._track_counter_change(found, before, self._merge(before, update_data))
+            self._sync_search_index(worker_id, update_data=update_data)
             
             logger.info(f"Worker {worker_id} updated successfully")
             return True
@@ -227,7 +428,10 @@ class WorkerService:
             }
             
             path = f"{self.WORKERS_PATH}/{worker_id}"
+            found, before = self._peek_worker(worker_id)
             self.firebase.update_data(path, update_data)
+            self._track_counter_change(found, before, self._merge(before, update_data))
+            self._sync_search_index(worker_id, update_data=update_data)
             
             logger.info(f"Worker {worker_id} availability updated to {is_available}")
             return True
@@ -253,7 +457,10 @@ class WorkerService:
             }
             
             path = f"{self.WORKERS_PATH}/{worker_id}"
+            found, before = self._peek_worker(worker_id)
             self.firebase.update_data(path, update_data)
+            self._track_counter_change(found, before, self._merge(before, update_data))
+            self._sync_search_index(worker_id, update_data=update_data)
             
             logger.info(f"Worker {worker_id} online status updated to {is_online}")
             return True
@@ -289,64 +496,356 @@ class WorkerService:
             logger.error(f"Error updating worker location: {str(e)}")
             raise
     
-    def update_worker_rating(self, worker_id, new_rating):
+    def update_worker_locations(self, locations):
         """
-        Actualiza rating de un trabajador
+        Actualiza la ubicación de varios trabajadores con un único
+        multi-path update (solo latitude, longitude y timestamp)
+        
+        Args:
+            locations (dict): ID del trabajador -> (latitud, longitud, timestamp)
+            
+        Returns:
+            dict: Cantidad de trabajadores actualizados y los no encontrados
+        """
+        try:
+            # Lectura shallow (en caché) para no crear registros huérfanos
+            existing = set(self.firebase.get_keys(self.WORKERS_PATH))
+            
+            # La lista en caché puede no incluir trabajadores recién creados:
+            # los que faltan se comprueban sin caché antes de descartarlos
+            missing = [worker_id for worker_id in locations if worker_id not in existing]
+            if missing:
+                rechecked = self.firebase.run_concurrently({
+                    worker_id: (self.firebase.get_keys, (f"{self.WORKERS_PATH}/{worker_id}", False))
+                    for worker_id in missing
+                })
+                existing.update(worker_id for worker_id, keys in rechecked.items() if keys)
+            
+            updates = {}
+            not_found = []
+            for worker_id, (latitude, longitude, timestamp) in locations.items():
+                if worker_id not in existing:
+                    not_found.append(worker_id)
+                    continue
+                updates[f"{worker_id}/latitude"] = latitude
+                updates[f"{worker_id}/longitude"] = longitude
+                updates[f"{worker_id}/timestamp"] = timestamp
+            
+            self.firebase.multi_path_update(updates, root=self.WORKERS_PATH)
+            
+            for worker_id, (latitude, longitude, timestamp) in locations.items():
+                if worker_id in existing:
+                    self._sync_search_index(worker_id, update_data={
+                        'latitude': latitude,
+                        'longitude': longitude,
+                        'timestamp': timestamp
+                    })
+            
+            updated = len(locations) - len(not_found)
+            logger.info(f"Locations updated for {updated} workers ({len(not_found)} not found)")
+            return {'updated': updated, 'notFound': not_found}
+        except Exception as e:
+            logger.error(f"Error updating worker locations: {str(e)}")
+            raise
+    
+    def _verification_status_updates(self, worker_id, status_data, timestamp):
+        """
+        Rutas de un multi-path update que escriben solo los campos del
+        estado de verificación y el timestamp de un trabajador
+        """
+        updates = {
+            f"{worker_id}/verificationStatus/{field}": value
+            for field, value in status_data.items()
+        }
+        updates[f"{worker_id}/timestamp"] = timestamp
+        return updates
+    
+    def update_verification_status(self, worker_id, status_data):
+        """
+        Actualiza el estado de verificación de un trabajador escribiendo
+        solo ``verificationStatus/*`` y ``timestamp``; el resto del registro
+        (imagen, token, ubicación...) no se reescribe
         
         Args:
             worker_id (str): ID del trabajador
-            new_rating (float): Nueva calificación (1-5)
+            status_data (dict): Campos del estado a actualizar
             
         Returns:
-            bool: True si fue exitoso
+            dict: Estado de verificación resultante (None si no existe)
         """
         try:
-            # Obtener datos actuales del trabajador
-            worker = self.get_worker_by_id(worker_id)
+            path = f"{self.WORKERS_PATH}/{worker_id}"
             
-            if not worker:
-                raise ValueError(f"Worker {worker_id} not found")
+            current_status = self.firebase.get_data(f"{path}/verificationStatus")
+            if not isinstance(current_status, dict):
+                # Sin estado previo: confirmar que el trabajador existe con
+                # una lectura shallow para no crear un registro huérfano
+                if not self.firebase.get_keys(path):
+                    logger.warning(f"Worker {worker_id} not found")
+                    return None
+                current_status = {}
             
-            current_rating = worker.get('rating', 0)
-            total_ratings = worker.get('totalRatings', 0)
+            timestamp = int(datetime.now().timestamp() * 1000)
+            self.firebase.multi_path_update(
+                self._verification_status_updates(worker_id, status_data, timestamp),
+                root=self.WORKERS_PATH
+            )
             
-            # Calcular nuevo rating
-            if total_ratings == 0:
-                final_rating = new_rating
-                new_total = 1
-            else:
-                total_score = current_rating * total_ratings
-                new_total = total_ratings + 1
-                final_rating = (total_score + new_rating) / new_total
+            updated_status = {**current_status, **status_data}
+            self._track_counter_change(
+                True,
+                {'verificationStatus': current_status},
+                {'verificationStatus': updated_status}
+            )
+            self._sync_search_index(
+                worker_id,
+                update_data={'verificationStatus': updated_status, 'timestamp': timestamp}
+            )
+            
+            logger.info(f"Worker {worker_id} verification status updated to {status_data.get('status')}")
+            return updated_status
+        except Exception as e:
+            logger.error(f"Error updating verification status of worker {worker_id}: {str(e)}")
+            raise
+    
+    def update_verification_status_batch(self, updates):
+        """
+        Actualiza el estado de verificación de varios trabajadores con un
+        único multi-path update; la existencia se comprueba con una sola
+        lectura shallow de la colección
+        
+        Args:
+            updates (list): Dicts con workerId y los campos del estado
+            
+        Returns:
+            dict: Trabajadores actualizados y no encontrados
+        """
+        try:
+            existing = set(self.firebase.get_keys(self.WORKERS_PATH))
+            
+            # Si un trabajador aparece varias veces, gana el último estado
+            statuses = {}
+            not_found = []
+            for item in updates:
+                status_data = {key: value for key, value in item.items() if key != 'workerId'}
+                if item['workerId'] in existing:
+                    statuses[item['workerId']] = status_data
+                elif item['workerId'] not in not_found:
+                    not_found.append(item['workerId'])
+            
+            timestamp = int(datetime.now().timestamp() * 1000)
+            paths = {}
+            changes = []
+            for worker_id, status_data in statuses.items():
+                paths.update(self._verification_status_updates(worker_id, status_data, timestamp))
+                found, worker = self._peek_worker(worker_id)
+                before = (worker or {}).get('verificationStatus')
+                changes.append((worker_id, found, before if isinstance(before, dict) else {}, status_data))
+            
+            self.firebase.multi_path_update(paths, root=self.WORKERS_PATH)
             
+            for worker_id, found, before, status_data in changes:
+                updated_status = {**before, **status_data}
+                self._track_counter_change(
+                    found,
+                    {'verificationStatus': before},
+                    {'verificationStatus': updated_status}
+                )
+                self._sync_search_index(
+                    worker_id,
+                    update_data={'verificationStatus': updated_status, 'timestamp': timestamp}
+                )
+            
+            logger.info(f"Verification status updated for {len(statuses)} workers ({len(not_found)} not found)")
+            return {'updated': list(statuses), 'notFound': not_found}
+        except Exception as e:
+            logger.error(f"Error in batch verification status update: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _apply_ratings(stats, ratings):
+        """
+        Promedio que resulta de agregar calificaciones a ``ratingStats``
+        """
+        current_rating = stats.get('rating') or 0
+        total_ratings = stats.get('totalRatings') or 0
+        
+        new_total = total_ratings + len(ratings)
+        total_score = current_rating * total_ratings + sum(ratings)
+        
+        return {
+            'rating': round(total_score / new_total, 2),
+            'totalRatings': new_total
+        }
+    
+    def _initial_rating_stats(self, worker_id):
+        """
+        Punto de partida de ``ratingStats`` para un trabajador que aún no lo
+        tiene: los campos rating/totalRatings del registro (None si el
+        trabajador no existe)
+        """
+        path = f"{self.WORKERS_PATH}/{worker_id}"
+        rating_path = f"{path}/rating"
+        total_path = f"{path}/totalRatings"
+        
+        nodes = self.firebase.get_many([rating_path, total_path], use_cache=False)
+        if nodes[rating_path] is None and nodes[total_path] is None:
+            if not self.firebase.get_keys(path, use_cache=False):
+                return None
+        
+        return {'rating': nodes[rating_path] or 0, 'totalRatings': nodes[total_path] or 0}
+    
+    def _copy_rating_stats(self, worker_id, stats):
+        """
+        Copia ``ratingStats`` a rating/totalRatings del nivel superior
+        
+        Con calificaciones simultáneas las copias pueden llegar en desorden
+        y una más vieja pisar a una más nueva. Tras cada copia se vuelve a
+        leer ``ratingStats`` (dos campos) y, si avanzó, se copia el valor
+        nuevo: quien hace la última copia la verifica después de escribirla,
+        así que la copia termina igual a ``ratingStats``.
+        """
+        path = f"{self.WORKERS_PATH}/{worker_id}"
+        
+        for _ in range(self.RATING_COPY_ATTEMPTS):
             update_data = {
-                'rating': round(final_rating, 2),
-                'totalRatings': new_total,
+                'rating': stats['rating'],
+                'totalRatings': stats['totalRatings'],
                 'timestamp': int(datetime.now().timestamp() * 1000)
             }
+            self.firebase.update_data(path, update_data)
+            self._sync_search_index(worker_id, update_data=update_data)
+            
+            current = self.firebase.get_data(f"{path}/ratingStats", use_cache=False)
+            if not isinstance(current, dict) or current.get('totalRatings', 0) <= stats['totalRatings']:
+                return
+            stats = current
+        
+        logger.warning(f"Rating copy for worker {worker_id} still behind ratingStats")
+    
+    def add_worker_ratings(self, worker_id, ratings):
+        """
+        Agrega una o más calificaciones a un trabajador
+        
+        El promedio se calcula en una transacción sobre el nodo pequeño
+        ``ratingStats`` (rating y totalRatings): si otra calificación se
+        escribe al mismo tiempo, se recalcula sobre el valor nuevo en lugar
+        de pisarla. Luego rating/totalRatings se copian al nivel superior
+        del registro, que es donde los leen las apps (ver
+        _copy_rating_stats).
+        
+        Args:
+            worker_id (str): ID del trabajador
+            ratings (list): Calificaciones (1-5)
             
+        Returns:
+            dict: rating y totalRatings resultantes (None si no existe)
+        """
+        try:
             path = f"{self.WORKERS_PATH}/{worker_id}"
-            self.firebase.update_data(path, update_data)
+            initial = {}
             
-            logger.info(f"Worker {worker_id} rating updated to {final_rating}")
-            return True
+            def apply_ratings(stats):
+                if not isinstance(stats, dict):
+                    # Solo la primera vez: se lee una vez aunque haya reintentos
+                    if 'stats' not in initial:
+                        initial['stats'] = self._initial_rating_stats(worker_id)
+                    stats = initial['stats']
+                    if stats is None:
+                        return None
+                return self._apply_ratings(stats, ratings)
+            
+            stats = self.firebase.run_transaction(f"{path}/ratingStats", apply_ratings)
+            if stats is None:
+                logger.warning(f"Worker {worker_id} not found")
+                return None
+            
+            self._copy_rating_stats(worker_id, stats)
+            
+            logger.info(f"Worker {worker_id} rating updated to {stats['rating']} ({len(ratings)} new)")
+            return stats
         except Exception as e:
             logger.error(f"Error updating worker rating: {str(e)}")
             raise
     
-    def delete_worker(self, worker_id):
+    def update_worker_rating(self, worker_id, new_rating):
         """
-        Elimina un trabajador
+        Actualiza rating de un trabajador
         
         Args:
             worker_id (str): ID del trabajador
+            new_rating (float): Nueva calificación (1-5)
             
         Returns:
             bool: True si fue exitoso
         """
+        if self.add_worker_ratings(worker_id, [new_rating]) is None:
+            raise ValueError(f"Worker {worker_id} not found")
+        return True
+    
+    def add_ratings_batch(self, ratings):
+        """
+        Agrega muchas calificaciones a la vez: se agrupan por trabajador y
+        cada trabajador se actualiza con una sola transacción; las
+        transacciones de distintos trabajadores corren en paralelo
+        
+        Args:
+            ratings (list): Dicts con workerId y rating
+            
+        Returns:
+            dict: Resultado por trabajador, trabajadores inexistentes y fallidos
+        """
+        by_worker = {}
+        for item in ratings:
+            by_worker.setdefault(item['workerId'], []).append(item['rating'])
+        
+        def apply(worker_id, values):
+            try:
+                return self.add_worker_ratings(worker_id, values)
+            except Exception as e:
+                return e
+        
+        outcomes = self.firebase.run_concurrently({
+            worker_id: (apply, (worker_id, values))
+            for worker_id, values in by_worker.items()
+        })
+        
+        summary = {'applied': 0, 'workers': {}, 'notFound': [], 'failed': {}}
+        for worker_id, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                summary['failed'][worker_id] = str(outcome)
+            elif outcome is None:
+                summary['notFound'].append(worker_id)
+            else:
+                summary['workers'][worker_id] = outcome
+                summary['applied'] += len(by_worker[worker_id])
+        
+        logger.info(
+            f"Rating batch: {summary['applied']} of {len(ratings)} ratings applied "
+            f"to {len(summary['workers'])} workers"
+        )
+        return summary
+    
+    def delete_worker(self, worker_id):
+        """
+        Elimina un trabajador si existe
+        
+        Args:
+            worker_id (str): ID del trabajador
+            
+        Returns:
+            bool: True si fue exitoso, False si el trabajador no existe
+        """
         try:
             path = f"{self.WORKERS_PATH}/{worker_id}"
-            self.firebase.delete_data(path)
+            found, before = self._peek_worker(worker_id)
+            if not self.firebase.delete_if_exists(path):
+                logger.warning(f"Worker {worker_id} not found")
+                return False
+            
+            # Existía aunque el índice no lo conocía: el estado previo es desconocido
+            self._track_counter_change(found and before is not None, before, None)
+            self._sync_search_index(worker_id, deleted=True)
             
             logger.info(f"Worker {worker_id} deleted successfully")
             return True
@@ -354,6 +853,47 @@ class WorkerService:
             logger.error(f"Error deleting worker {worker_id}: {str(e)}")
             raise
     
+    def get_worker_full(self, worker_id, include_file_urls=True):
+        """
+        Obtiene el perfil, los documentos y el estado de documentos
+        requeridos de un trabajador: los nodos del trabajador y de sus
+        documentos se descargan una sola vez y en paralelo
+        
+        Args:
+            worker_id (str): ID del trabajador
+            include_file_urls (bool): Agregar las URLs firmadas de los archivos
+            
+        Returns:
+            dict: worker, documents y requirements (None si no existe)
+        """
+        try:
+            worker_path = f"{self.WORKERS_PATH}/{worker_id}"
+            documents_path = f"{document_service.DOCUMENTS_PATH}/{worker_id}"
+            
+            nodes = self.firebase.get_many([worker_path, documents_path])
+            
+            worker = nodes[worker_path]
+            if not worker:
+                logger.warning(f"Worker {worker_id} not found")
+                return None
+            
+            worker['id'] = worker_id
+            documents = nodes[documents_path] or {}
+            
+            requirements = document_service.get_requirement_status(documents)
+            if include_file_urls:
+                document_service.attach_file_urls(worker_id, documents)
+            
+            logger.info(f"Retrieved full profile for worker {worker_id}")
+            return {
+                'worker': worker,
+                'documents': documents,
+                'requirements': requirements
+            }
+        except Exception as e:
+            logger.error(f"Error getting full profile for worker {worker_id}: {str(e)}")
+            raise
+    
     def worker_exists(self, worker_id):
         """
         Verifica si un trabajador existe
@@ -379,8 +919,7 @@ class WorkerService:
             int: Total de trabajadores
         """
         try:
-            workers = self.firebase.get_data(self.WORKERS_PATH)
-            count = len(workers) if workers else 0
+            count = len(self.firebase.get_keys(self.WORKERS_PATH))
             
             logger.info(f"Total workers: {count}")
             return count
@@ -423,43 +962,18 @@ class WorkerService:
             dict: Estadísticas
         """
         try:
-            all_workers = self.get_all_workers()
+            counters = stats_counter_service.get_counters(self.COUNTERS_SCOPE)
+            if counters is not None:
+                logger.debug("Worker statistics served from counters")
+                return self._statistics_from_counters(counters)
             
-            if not all_workers:
-                return {
-                    'total': 0,
-                    'available': 0,
-                    'online': 0,
-                    'verified': 0,
-                    'by_category': {}
-                }
-            
-            stats = {
-                'total': len(all_workers),
-                'available': 0,
-                'online': 0,
-                'verified': 0,
-                'by_category': {}
-            }
+            all_workers = self.get_all_workers()
+            stats = self.compute_workers_statistics(all_workers)
+            stats_counter_service.seed(self.COUNTERS_SCOPE, self._counters_from_statistics(stats))
             
-            for worker in all_workers:
-                # Contar disponibles
-                if worker.get('isAvailable', False):
-                    stats['available'] += 1
-                
-                # Contar en línea
-                if worker.get('isOnline', False):
-                    stats['online'] += 1
-                
-                # Contar verificados
-                verification_status = worker.get('verificationStatus', {})
-                if isinstance(verification_status, dict):
-                    if verification_status.get('status') == 'approved':
-                        stats['verified'] += 1
-                
-                # Contar por categoría
-                category = worker.get('work', 'Sin categoría')
-                stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+            # El mismo recorrido deja construido el índice: de ahí salen los
+            # estados previos para los deltas de las próximas escrituras
+            self.search_index.build({worker['id']: worker for worker in all_workers})
             
             logger.info(f"Worker statistics calculated")
             return stats
@@ -467,9 +981,73 @@ class WorkerService:
             logger.error(f"Error getting worker statistics: {str(e)}")
             raise
     
+    def _counters_from_statistics(self, stats):
+        counters = {
+            name: stats[name] for name in ('total', 'available', 'online', 'verified')
+        }
+        for category, count in stats['by_category'].items():
+            counters[f"by_category.{category}"] = count
+        return counters
+    
+    def _statistics_from_counters(self, counters):
+        return {
+            'total': counters.get('total', 0),
+            'available': counters.get('available', 0),
+            'online': counters.get('online', 0),
+            'verified': counters.get('verified', 0),
+            'by_category': {
+                name[len('by_category.'):]: count
+                for name, count in counters.items()
+                if name.startswith('by_category.') and count > 0
+            }
+        }
+    
+    def compute_workers_statistics(self, all_workers):
+        """
+        Calcula estadísticas a partir de trabajadores ya descargados
+        
+        Args:
+            all_workers (list): Lista de trabajadores
+            
+        Returns:
+            dict: Estadísticas
+        """
+        stats = {
+            'total': len(all_workers) if all_workers else 0,
+            'available': 0,
+            'online': 0,
+            'verified': 0,
+            'by_category': {}
+        }
+        
+        for worker in all_workers or []:
+            # Contar disponibles
+            if worker.get('isAvailable', False):
+                stats['available'] += 1
+            
+            # Contar en línea
+            if worker.get('isOnline', False):
+                stats['online'] += 1
+            
+            # Contar verificados
+            verification_status = worker.get('verificationStatus', {})
+            if isinstance(verification_status, dict):
+                if verification_status.get('status') == 'approved':
+                    stats['verified'] += 1
+            
+            # Contar por categoría
+            category = worker.get('work', 'Sin categoría')
+            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+        
+        return stats
+    
     def search_workers(self, query):
         """
-        Busca trabajadores por nombre, apellido o categoría
+        Busca trabajadores por nombre, apellido, email o categoría
+        
+        Usa un índice invertido en memoria: sin distinguir tildes ni
+        mayúsculas, cada término de la consulta se busca como prefijo y los
+        resultados se ordenan por relevancia.
         
         Args:
             query (str): Término de búsqueda
@@ -478,41 +1056,106 @@ class WorkerService:
             list: Lista de trabajadores que coinciden
         """
         try:
-            all_workers = self.get_all_workers()
+            if not query or not query.strip():
+                return self.get_all_workers()
             
-            if not all_workers or not query:
-                return all_workers
+            self.search_index.ensure_fresh(self._load_search_records)
             
-            query_lower = query.lower().strip()
             results = []
-            
-            for worker in all_workers:
-                # Buscar en nombre
-                if worker.get('name', '').lower().find(query_lower) != -1:
-                    results.append(worker)
-                    continue
-                
-                # Buscar en apellido
-                if worker.get('lastName', '').lower().find(query_lower) != -1:
-                    results.append(worker)
-                    continue
-                
-                # Buscar en email
-                if worker.get('email', '').lower().find(query_lower) != -1:
-                    results.append(worker)
-                    continue
-                
-                # Buscar en categoría
-                if worker.get('work', '').lower().find(query_lower) != -1:
-                    results.append(worker)
-                    continue
+            for worker_id in self.search_index.search(query):
+                worker = self.search_index.get(worker_id)
+                if worker is not None:
+                    results.append(dict(worker))
             
             logger.info(f"Search for '{query}' returned {len(results)} results")
             return results
         except Exception as e:
             logger.error(f"Error searching workers: {str(e)}")
             raise
+    
+    def filter_workers(self, search=None, category=None, available=None, online=None,
+                       verification_status=None, cursor=None, page_size=None):
+        """
+        Filtra trabajadores combinando cualquier conjunto de filtros
+        
+        Los filtros se evalúan sobre el índice en memoria (intersección de
+        conjuntos por faceta), sin consultas adicionales a Firebase. Con
+        búsqueda los resultados se ordenan por relevancia y el cursor es la
+        posición en ese orden ("#40"); sin ella, se ordenan por ID y el
+        cursor es el último ID de la página.
+        
+        El índice refleja al instante las escrituras hechas desde el panel,
+        pero los cambios que las apps escriben directo en Firebase (p. ej.
+        isOnline/isAvailable) solo se ven al reconstruirlo, hasta
+        SEARCH_INDEX['TTL_SECONDS'] después.
+        
+        Args:
+            search (str): Término de búsqueda (opcional)
+            category (str): Categoría de trabajo (opcional)
+            available (bool): Disponibilidad (opcional)
+            online (bool): Estado en línea (opcional)
+            verification_status (str): Estado de verificación (opcional)
+            cursor (str): Cursor ``next_cursor`` de la página anterior
+            page_size (int): Tamaño de la página (opcional, sin límite)
+            
+        Returns:
+            tuple: (lista de trabajadores, cursor de la siguiente página o None)
+            
+        Raises:
+            ValueError: Si el cursor no corresponde al tipo de orden
+        """
+        try:
+            criteria = {
+                'category': category,
+                'available': available,
+                'online': online,
+                'verification_status': verification_status,
+            }
+            criteria = {name: value for name, value in criteria.items() if value is not None}
+            
+            self.search_index.ensure_fresh(self._load_search_records)
+            
+            matches = self.search_index.filter(**criteria)
+            by_relevance = bool(search and search.strip())
+            if by_relevance:
+                worker_ids = self.search_index.search(search, candidates=matches)
+            else:
+                worker_ids = sorted(matches)
+            
+            offset = 0
+            if cursor and by_relevance:
+                # El orden por relevancia no sigue el orden de los IDs: el
+                # cursor es la posición ("#<n>"; '#' no es válido en una clave)
+                if not cursor.startswith(self.OFFSET_CURSOR_PREFIX) or not cursor[1:].isdigit():
+                    raise ValueError('Cursor inválido para una búsqueda')
+                offset = int(cursor[1:])
+                worker_ids = worker_ids[offset:]
+            elif cursor:
+                # Aunque el cursor ya no cumpla los filtros, el orden por ID
+                # permite continuar desde el siguiente
+                worker_ids = [worker_id for worker_id in worker_ids if worker_id > cursor]
+            
+            next_cursor = None
+            if page_size and len(worker_ids) > page_size:
+                worker_ids = worker_ids[:page_size]
+                if by_relevance:
+                    next_cursor = f"{self.OFFSET_CURSOR_PREFIX}{offset + page_size}"
+                else:
+                    next_cursor = worker_ids[-1]
+            
+            workers_list = []
+            for worker_id in worker_ids:
+                worker = self.search_index.get(worker_id)
+                if worker is not None:
+                    workers_list.append(dict(worker))
+            
+            logger.info(f"Filtered {len(workers_list)} workers with {sorted(criteria)}")
+            return workers_list, next_cursor
+        except Exception as e:
+            logger.error(f"Error filtering workers: {str(e)}")
+            raise
 
 
 # Instancia global del servicio
+from .document_service import document_service
 worker_service = WorkerService()
\ No newline at end of file
@@ -1,3 +1,343 @@
 from django.test import TestCase
+from unittest import mock
+from firebase_admin import exceptions as firebase_exceptions
+from .serializers.worker_serializers import WorkerLocationBatchItemSerializer
+from .services.firebase_service import firebase_service
+from .services.stats_counter_service import stats_counter_service
+from .services.worker_service import worker_service
+from .services.document_service import document_service
+from .services.location_buffer_service import LocationBufferService
+from .services.bulk_worker_service import bulk_worker_service
+from .management.commands.benchmark_bulk_parse import Command as BenchmarkCommand
 
-# Create your tests here.
+
+class StatsCounterServiceTests(TestCase):
+    """
+    Contadores incrementales del dashboard
+    """
+
+    def test_deltas_apply_over_seed(self):
+        stats_counter_service.seed('test', {'total': 2, 'available': 1})
+        stats_counter_service.apply_deltas('test', [
+            ({'total'}, {'total', 'available'}),
+            (set(), {'total'}),
+        ])
+
+        counters = stats_counter_service.get_counters('test')
+        self.assertEqual(counters['total'], 3)
+        self.assertEqual(counters['available'], 2)
+
+    def test_invalidate_forces_recount(self):
+        stats_counter_service.seed('test', {'total': 1})
+        stats_counter_service.invalidate('test')
+
+        self.assertIsNone(stats_counter_service.get_counters('test'))
+
+
+class WorkerCounterDeltaTests(TestCase):
+    """
+    Deltas de contadores de trabajadores con el estado previo del índice
+    """
+
+    WORKERS = {
+        'a': {'name': 'Ana', 'work': 'Plomero', 'isAvailable': False},
+        'b': {'name': 'Beto', 'work': 'Electricista', 'isOnline': True},
+    }
+
+    def setUp(self):
+        firebase_service.clear_cache()
+        worker_service.search_index.invalidate()
+
+        patcher = mock.patch.object(firebase_service, 'update_data', return_value=True)
+        self.update_data = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with mock.patch.object(firebase_service, 'get_data', return_value=dict(self.WORKERS)):
+            worker_service.get_workers_statistics()
+
+    def test_update_applies_delta_without_invalidating(self):
+        # Nada en caché: el estado previo sale del índice de búsqueda
+        firebase_service.clear_cache()
+
+        worker_service.update_worker_availability('a', True)
+
+        counters = stats_counter_service.get_counters(worker_service.COUNTERS_SCOPE)
+        self.assertIsNotNone(counters)
+        self.assertEqual(counters['available'], 1)
+        self.assertEqual(counters['total'], 2)
+
+    def test_unknown_prior_state_invalidates(self):
+        worker_service.search_index.invalidate()
+        firebase_service.clear_cache()
+
+        worker_service.update_worker_availability('a', True)
+
+        self.assertIsNone(stats_counter_service.get_counters(worker_service.COUNTERS_SCOPE))
+
+
+class DocumentCounterDeltaTests(TestCase):
+    """
+    Deltas de contadores de documentos con los estados del último recorrido
+    """
+
+    DOCUMENTS = {
+        'w1': {
+            'hojaDeVida': {'id': 'h', 'status': 'pending'},
+            'certificaciones': {'titulos': {'t1': {'status': 'pending'}}},
+        }
+    }
+
+    def setUp(self):
+        firebase_service.clear_cache()
+
+        for method in ('update_data', 'multi_path_update', 'delete_data', 'set_data'):
+            patcher = mock.patch.object(firebase_service, method, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        with mock.patch.object(firebase_service, 'get_data', return_value=self.DOCUMENTS):
+            document_service.get_documents_statistics()
+        firebase_service.clear_cache()
+
+    def counters(self):
+        return stats_counter_service.get_counters(document_service.COUNTERS_SCOPE)
+
+    def test_review_applies_delta_without_invalidating(self):
+        document_service.approve_document('w1', 'hojaDeVida', None, 'h', 'admin')
+        document_service.batch_review_documents([{
+            'workerId': 'w1', 'category': 'certificaciones', 'subcategory': 'titulos',
+            'documentId': 't1', 'action': 'reject', 'reason': 'Ilegible'
+        }], 'admin')
+
+        counters = self.counters()
+        self.assertIsNotNone(counters)
+        self.assertEqual(counters['status.pending'], 0)
+        self.assertEqual(counters['status.approved'], 1)
+        self.assertEqual(counters['status.rejected'], 1)
+        self.assertEqual(counters['pending_by_type.titulos'], 0)
+
+    def test_create_and_delete_follow_known_statuses(self):
+        document_service.create_document('w1', {
+            'category': 'certificaciones', 'subcategory': 'cartasRecomendacion', 'id': 'c1'
+        })
+        document_service.delete_document('w1', 'certificaciones', 'titulos', 't1')
+
+        counters = self.counters()
+        self.assertEqual(counters['total'], 2)
+        self.assertEqual(counters['pending_by_type.cartasRecomendacion'], 1)
+        self.assertEqual(counters['pending_by_type.titulos'], 0)
+
+
+class LocationBufferServiceTests(TestCase):
+    """
+    Agrupación y orden de las ubicaciones por lote
+    """
+
+    def setUp(self):
+        self.written = []
+        self.error = None
+
+        def update_worker_locations(batch):
+            if self.error is not None:
+                raise self.error
+            self.written.append(dict(batch))
+            return {'updated': len(batch), 'notFound': []}
+
+        patcher = mock.patch.object(worker_service, 'update_worker_locations', update_worker_locations)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.buffer = LocationBufferService()
+        self.buffer.flush_interval = 3600
+        self.addCleanup(self.discard_pending)
+
+    def discard_pending(self):
+        # El flush de atexit no debe escribir lo que quedó de una prueba
+        if self.buffer._timer is not None:
+            self.buffer._timer.cancel()
+        self.buffer._pending = {}
+
+    def location(self, worker_id, latitude, timestamp=None):
+        location = {'workerId': worker_id, 'latitude': latitude, 'longitude': -74.0}
+        if timestamp is not None:
+            location['timestamp'] = timestamp
+        return location
+
+    def test_keeps_latest_position_per_worker(self):
+        summary = self.buffer.submit([
+            self.location('a', 1.0, timestamp=20),
+            self.location('a', 2.0, timestamp=10),
+            self.location('b', 3.0),
+        ])
+        self.buffer.flush()
+
+        self.assertEqual(summary['accepted'], 2)
+        self.assertEqual(summary['discarded'], 1)
+        self.assertEqual(len(self.written), 1)
+        self.assertEqual(self.written[0]['a'][0], 1.0)
+        self.assertEqual(self.written[0]['b'][0], 3.0)
+
+    def test_rejects_older_position_after_flush(self):
+        self.buffer.submit([self.location('a', 1.0, timestamp=20)])
+        self.buffer.flush()
+
+        summary = self.buffer.submit([self.location('a', 2.0, timestamp=10)])
+
+        self.assertEqual(summary['accepted'], 0)
+        self.assertIsNone(self.buffer.flush())
+        self.assertEqual(len(self.written), 1)
+
+    def test_different_clocks_follow_arrival_order(self):
+        self.buffer.submit([self.location('a', 1.0, timestamp=20)])
+        self.buffer.submit([self.location('a', 2.0)])
+        self.buffer.flush()
+
+        self.assertEqual(self.written[0]['a'][0], 2.0)
+
+    def test_invalid_coordinates_are_discarded(self):
+        summary = self.buffer.submit([
+            self.location('a', float('nan')),
+            self.location('b', 91.0),
+        ])
+
+        self.assertEqual(summary['accepted'], 0)
+        self.assertEqual(summary['pending'], 0)
+
+    def test_transient_error_requeues_batch(self):
+        self.buffer.submit([self.location('a', 1.0)])
+        self.error = firebase_exceptions.UnavailableError('Sin conexión')
+        self.buffer.flush()
+
+        self.assertIn('a', self.buffer._pending)
+
+        self.error = None
+        self.buffer.flush()
+        self.assertEqual(self.written[0]['a'][0], 1.0)
+
+    def test_non_retryable_error_drops_batch(self):
+        self.buffer.submit([self.location('a', 1.0)])
+        self.error = firebase_exceptions.UnknownError('Out of range float values are not JSON compliant')
+        self.buffer.flush()
+
+        self.assertEqual(self.buffer._pending, {})
+
+        self.error = None
+        self.buffer.submit([self.location('b', 2.0)])
+        self.buffer.flush()
+        self.assertEqual(list(self.written[0]), ['b'])
+
+    def test_tracked_workers_are_bounded(self):
+        self.buffer.max_tracked = 3
+        self.buffer.submit([self.location(f"w{i}", 1.0, timestamp=1) for i in range(10)])
+
+        self.assertEqual(len(self.buffer._latest), 3)
+
+
+class WorkerLocationSerializerTests(TestCase):
+    """
+    Validación de coordenadas recibidas por lote
+    """
+
+    def is_valid(self, latitude, longitude):
+        return WorkerLocationBatchItemSerializer(data={
+            'workerId': 'a', 'latitude': latitude, 'longitude': longitude
+        }).is_valid()
+
+    def test_rejects_non_finite_and_out_of_range(self):
+        self.assertFalse(self.is_valid('NaN', 0))
+        self.assertFalse(self.is_valid(0, 'Infinity'))
+        self.assertFalse(self.is_valid(90.5, 0))
+        self.assertFalse(self.is_valid(0, -180.5))
+        self.assertTrue(self.is_valid(5.34851, -73.902605))
+
+
+class WorkerCursorPaginationTests(TestCase):
+    """
+    Paginación por cursor de los filtros sobre el índice
+    """
+
+    WORKERS = {
+        f"w{i:02d}": {'name': f"Ana {i}", 'work': 'Plomero' if i % 2 else 'Electricista'}
+        for i in range(7)
+    }
+
+    def setUp(self):
+        worker_service.search_index.invalidate()
+        patcher = mock.patch.object(firebase_service, 'get_data', return_value=dict(self.WORKERS))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def collect(self, **filters):
+        seen, cursor = [], None
+        while True:
+            workers, cursor = worker_service.filter_workers(cursor=cursor, page_size=3, **filters)
+            seen.extend(worker['id'] for worker in workers)
+            if cursor is None:
+                return seen
+
+    def test_search_pages_are_disjoint(self):
+        seen = self.collect(search='ana')
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_id_cursor_without_search(self):
+        self.assertEqual(self.collect(category='Plomero'), ['w01', 'w03', 'w05'])
+
+    def test_id_cursor_is_invalid_for_search(self):
+        with self.assertRaises(ValueError):
+            worker_service.filter_workers(search='ana', cursor='w03', page_size=3)
+
+
+class SnapshotCachePatchTests(TestCase):
+    """
+    Las escrituras parchean los snapshots de rutas ancestro en caché
+    """
+
+    def setUp(self):
+        firebase_service.clear_cache()
+        self.addCleanup(firebase_service.clear_cache)
+        if firebase_service.cache_ttl <= 0:
+            self.skipTest('Caché de snapshots deshabilitada')
+
+        generation = firebase_service._cache_generation
+        firebase_service._cache_set('Coleccion', {'a': {'name': 'A'}}, generation)
+        firebase_service._cache_set('Coleccion', ['a'], generation, variant='shallow')
+        firebase_service._cache_set('Coleccion/a', {'name': 'A'}, generation)
+
+    def test_child_write_patches_ancestors(self):
+        firebase_service._apply_writes_to_cache([('Coleccion/b/name', 'B')])
+
+        self.assertEqual(
+            firebase_service._cache_get('Coleccion'),
+            (True, {'a': {'name': 'A'}, 'b': {'name': 'B'}})
+        )
+        self.assertEqual(firebase_service._cache_get('Coleccion', variant='shallow'), (True, ['a', 'b']))
+
+    def test_write_discards_written_path_and_patches_parent_on_delete(self):
+        firebase_service._apply_writes_to_cache([('Coleccion/a', None)])
+
+        self.assertEqual(firebase_service._cache_get('Coleccion/a'), (False, None))
+        self.assertEqual(firebase_service._cache_get('Coleccion'), (True, None))
+        self.assertEqual(firebase_service._cache_get('Coleccion', variant='shallow'), (True, []))
+
+
+class ParseDataframeTests(TestCase):
+    """
+    La normalización vectorizada coincide con la de fila por fila
+    """
+
+    def test_matches_row_by_row(self):
+        command = BenchmarkCommand()
+        df = command.build_sheet(200)
+
+        comparable = lambda records: [
+            (row_number, {
+                key: value for key, value in profile.items() if key not in ('id', 'timestamp')
+            })
+            for row_number, profile in records
+        ]
+        vectorized, errors = bulk_worker_service.parse_dataframe(df)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(comparable(vectorized), comparable(command.parse_row_by_row(df)))
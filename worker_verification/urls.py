@@ -5,12 +5,21 @@ from .views import (
     DocumentViewSet,
     ClientViewSet,
     DashboardStatsView,
+    DashboardSnapshotView,
     DashboardWeeklyTrendsView,
     DashboardMonthlyTrendsView,
     DashboardActivityStatsView,
+    AsyncDashboardStatsView,
+    AsyncDashboardSnapshotView,
+    AsyncDashboardActivityStatsView,
+    AsyncWorkerListView,
+    AsyncClientListView,
 )
 from .views.bulk_worker_views import (
     BulkWorkerUploadView,
+    BulkUploadJobListView,
+    BulkUploadJobDetailView,
+    BulkUploadJobRetryView,
     BulkWorkerTemplateView,
 )
 
@@ -23,14 +32,25 @@ router.register(r'clients', ClientViewSet, basename='client')
 urlpatterns = [
     # Dashboard
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('dashboard/snapshot/', DashboardSnapshotView.as_view(), name='dashboard-snapshot'),
     path('dashboard/weekly-trends/', DashboardWeeklyTrendsView.as_view(), name='dashboard-weekly-trends'),
     path('dashboard/monthly-trends/', DashboardMonthlyTrendsView.as_view(), name='dashboard-monthly-trends'),
     path('dashboard/activity-stats/', DashboardActivityStatsView.as_view(), name='dashboard-activity-stats'),
     
    
     path('workers/bulk-upload/', BulkWorkerUploadView.as_view(), name='bulk-worker-upload'),
+    path('workers/bulk-upload/jobs/', BulkUploadJobListView.as_view(), name='bulk-upload-job-list'),
+    path('workers/bulk-upload/jobs/<int:job_id>/', BulkUploadJobDetailView.as_view(), name='bulk-upload-job-detail'),
+    path('workers/bulk-upload/jobs/<int:job_id>/retry/', BulkUploadJobRetryView.as_view(), name='bulk-upload-job-retry'),
     path('workers/bulk-upload-template/', BulkWorkerTemplateView.as_view(), name='bulk-worker-template'),
     
+    # Versiones asíncronas (servir con un servidor ASGI, p. ej. uvicorn)
+    path('async/dashboard/stats/', AsyncDashboardStatsView.as_view(), name='async-dashboard-stats'),
+    path('async/dashboard/snapshot/', AsyncDashboardSnapshotView.as_view(), name='async-dashboard-snapshot'),
+    path('async/dashboard/activity-stats/', AsyncDashboardActivityStatsView.as_view(), name='async-dashboard-activity-stats'),
+    path('async/workers/', AsyncWorkerListView.as_view(), name='async-worker-list'),
+    path('async/clients/', AsyncClientListView.as_view(), name='async-client-list'),
+    
     # ViewSets routes (va al final)
     path('', include(router.urls)),
 ]
@@ -41,6 +61,7 @@ RUTAS DISPONIBLES:
 WORKERS:
 - GET    /api/workers/                           - Listar trabajadores
 - GET    /api/workers/{id}/                      - Detalle de trabajador
+- GET    /api/workers/{id}/full/                 - Perfil + documentos (URLs firmadas) + documentos requeridos
 - POST   /api/workers/                           - Crear trabajador
 - PUT    /api/workers/{id}/                      - Actualizar trabajador completo
 - PATCH  /api/workers/{id}/                      - Actualizar campos específicos
@@ -48,12 +69,18 @@ WORKERS:
 - GET    /api/workers/statistics/                - Estadísticas de trabajadores
 - PATCH  /api/workers/{id}/availability/         - Actualizar disponibilidad
 - PATCH  /api/workers/{id}/verification_status/  - Actualizar estado de verificación
+- POST   /api/workers/batch-verification-status/ - Actualizar estado de verificación por lote
 - PATCH  /api/workers/{id}/online_status/        - Actualizar estado en línea
 - PATCH  /api/workers/{id}/location/             - Actualizar ubicación
+- POST   /api/workers/batch-locations/           - Recibir ubicaciones por lote (se escriben agrupadas)
 - POST   /api/workers/{id}/add_rating/           - Agregar calificación
+- POST   /api/workers/batch-ratings/             - Agregar calificaciones por lote
 
 BULK UPLOAD (NUEVO):
-- POST   /api/workers/bulk-upload/               - Cargar trabajadores desde Excel
+- POST   /api/workers/bulk-upload/               - Encolar carga de trabajadores desde Excel (202 + ID del trabajo)
+- GET    /api/workers/bulk-upload/jobs/          - Trabajos de carga recientes
+- GET    /api/workers/bulk-upload/jobs/{id}/     - Progreso y reporte final de una carga
+- POST   /api/workers/bulk-upload/jobs/{id}/retry/ - Reintentar una carga fallida (omite filas ya importadas)
 - GET    /api/workers/bulk-upload-template/      - Descargar template de Excel
 
 DOCUMENTS:
@@ -66,9 +93,12 @@ DOCUMENTS:
 - POST   /api/documents/                                    - Crear documento
 - POST   /api/documents/approve/                            - Aprobar documento
 - POST   /api/documents/reject/                             - Rechazar documento
+- POST   /api/documents/batch-review/                       - Aprobar/rechazar varios documentos (escritura atómica)
+- POST   /api/documents/worker/{worker_id}/approve-all/     - Aprobar todo el paquete del trabajador
 - GET    /api/documents/worker/{worker_id}/check-requirements/ - Verificar documentos requeridos
 - DELETE /api/documents/delete/                             - Eliminar documento
 - GET    /api/documents/file-url/                           - Obtener URL de archivo
+- POST   /api/documents/file-urls/                          - Obtener URLs de varios archivos (URLs firmadas en caché)
 
 CLIENTS:
 - GET    /api/clients/        - Listar clientes
@@ -76,10 +106,18 @@ CLIENTS:
 - GET    /api/clients/count/  - Total de clientes
 
 DASHBOARD:
-- GET    /api/dashboard/stats/           - Estadísticas generales
+- GET    /api/dashboard/stats/           - Estadísticas generales (desde contadores)
+- GET    /api/dashboard/snapshot/        - Todas las secciones con una descarga por árbol (incluye tiempos)
 - GET    /api/dashboard/weekly-trends/   - Tendencias semanales
 - GET    /api/dashboard/monthly-trends/  - Tendencias mensuales
-- GET    /api/dashboard/activity-stats/  - Estadísticas de actividad
+- GET    /api/dashboard/activity-stats/  - Estadísticas de actividad (costoso: descarga los árboles completos)
+
+ASYNC (ASGI):
+- GET    /api/async/dashboard/stats/           - Estadísticas generales (desde contadores)
+- GET    /api/async/dashboard/snapshot/        - Snapshot del dashboard (descargas concurrentes)
+- GET    /api/async/dashboard/activity-stats/  - Estadísticas de actividad (costoso)
+- GET    /api/async/workers/                   - Listar trabajadores (mismos filtros)
+- GET    /api/async/clients/                   - Listar clientes
 
 AUTH:
 - POST   /api/auth/token/         - Obtener token JWT
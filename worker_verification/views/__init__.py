@@ -3,23 +3,43 @@ from .document_views import DocumentViewSet
 from .client_views import ClientViewSet
 from .dashboard_views import (
     DashboardStatsView,
+    DashboardSnapshotView,
     DashboardWeeklyTrendsView,
     DashboardMonthlyTrendsView,
     DashboardActivityStatsView,
 )
 from .bulk_worker_views import (
     BulkWorkerUploadView,
+    BulkUploadJobListView,
+    BulkUploadJobDetailView,
+    BulkUploadJobRetryView,
     BulkWorkerTemplateView,
 )
+from .async_views import (
+    AsyncDashboardStatsView,
+    AsyncDashboardSnapshotView,
+    AsyncDashboardActivityStatsView,
+    AsyncWorkerListView,
+    AsyncClientListView,
+)
 
 __all__ = [
     'WorkerViewSet',
     'DocumentViewSet',
     'ClientViewSet',
     'DashboardStatsView',
+    'DashboardSnapshotView',
     'DashboardWeeklyTrendsView',
     'DashboardMonthlyTrendsView',
     'DashboardActivityStatsView',
     'BulkWorkerUploadView',
+    'BulkUploadJobListView',
+    'BulkUploadJobDetailView',
+    'BulkUploadJobRetryView',
     'BulkWorkerTemplateView',
+    'AsyncDashboardStatsView',
+    'AsyncDashboardSnapshotView',
+    'AsyncDashboardActivityStatsView',
+    'AsyncWorkerListView',
+    'AsyncClientListView',
 ]
\ No newline at end of file
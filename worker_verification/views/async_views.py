@@ -0,0 +1,235 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from ..services.worker_service import worker_service
+from ..services.client_service import client_service
+from ..services.dashboard_service import dashboard_service
+from ..services.async_firebase_service import async_firebase_service
+from ..serializers import WorkerSerializer, ClientListSerializer
+from .worker_views import WorkerViewSet
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIView(View):
+    """
+    Vista base asíncrona para servir bajo ASGI
+
+    DRF 3.14 no admite handlers async, así que se usa una vista de Django
+    con la misma autenticación (JWT / sesión) y el mismo formato de
+    respuesta que las vistas síncronas. Solo usuarios autenticados.
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    
+    async def dispatch(self, request, *args, **kwargs):
+        drf_request = Request(
+            request,
+            authenticators=[auth() for auth in self.authentication_classes]
+        )
+        
+        try:
+            # La autenticación consulta la base de datos: fuera del event loop
+            user = await sync_to_async(lambda: drf_request.user)()
+        except exceptions.APIException as e:
+            return JsonResponse({'detail': str(e.detail)}, status=e.status_code)
+        
+        if not (user and user.is_authenticated):
+            return JsonResponse(
+                {'detail': str(exceptions.NotAuthenticated.default_detail)},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        return await super().dispatch(drf_request, *args, **kwargs)
+
+
+class AsyncDashboardStatsView(AsyncAPIView):
+    """
+    Versión asíncrona de DashboardStatsView
+    """
+    
+    async def get(self, request):
+        """
+        GET /api/async/dashboard/stats/
+        Estadísticas desde los contadores, calculadas fuera del event loop
+        """
+        try:
+            stats = await async_firebase_service.run(dashboard_service.get_dashboard_stats)
+            
+            logger.info("Estadísticas del dashboard obtenidas exitosamente")
+            return JsonResponse({
+                'success': True,
+                'data': stats
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo estadísticas del dashboard: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': 'Error al obtener estadísticas del dashboard',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncDashboardSnapshotView(AsyncAPIView):
+    """
+    Versión asíncrona de DashboardSnapshotView
+    """
+    
+    async def get(self, request):
+        """
+        GET /api/async/dashboard/snapshot/
+        """
+        try:
+            snapshot = await dashboard_service.get_dashboard_snapshot_async()
+            
+            logger.info("Snapshot del dashboard obtenido exitosamente")
+            return JsonResponse({
+                'success': True,
+                'data': snapshot
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo snapshot del dashboard: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': 'Error al obtener snapshot del dashboard',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncDashboardActivityStatsView(AsyncAPIView):
+    """
+    Versión asíncrona de DashboardActivityStatsView
+    """
+    
+    async def get(self, request):
+        """
+        GET /api/async/dashboard/activity-stats/
+        Costoso: descarga los árboles completos de trabajadores y documentos
+        """
+        try:
+            stats = await dashboard_service.get_detailed_activity_stats_async()
+            
+            if not stats:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'No se pudieron obtener estadísticas de actividad'
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            
+            logger.info("Estadísticas de actividad obtenidas exitosamente")
+            return JsonResponse({
+                'success': True,
+                'data': stats
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo estadísticas de actividad: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': 'Error al obtener estadísticas de actividad',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncWorkerListView(AsyncAPIView):
+    """
+    Versión asíncrona de GET /api/workers/ (mismos query params)
+    """
+    max_page_size = WorkerViewSet.max_page_size
+    _get_page_size = WorkerViewSet._get_page_size
+    
+    async def get(self, request):
+        """
+        GET /api/async/workers/
+        """
+        try:
+            category = request.query_params.get('category') or None
+            available = WorkerViewSet._parse_bool(request.query_params.get('available'))
+            online = WorkerViewSet._parse_bool(request.query_params.get('online'))
+            verification_status = request.query_params.get('verification_status') or None
+            search = request.query_params.get('search') or None
+            
+            cursor = request.query_params.get('cursor') or None
+            page_size = self._get_page_size(request)
+            
+            has_filters = any(
+                value is not None
+                for value in (category, available, online, verification_status, search)
+            )
+            
+            if has_filters:
+                workers, next_cursor = await async_firebase_service.run(
+                    worker_service.filter_workers,
+                    search=search,
+                    category=category,
+                    available=available,
+                    online=online,
+                    verification_status=verification_status,
+                    cursor=cursor,
+                    page_size=page_size
+                )
+            else:
+                workers, next_cursor = await async_firebase_service.run(
+                    worker_service.get_workers_page,
+                    cursor=cursor,
+                    page_size=page_size
+                )
+            
+            serializer = WorkerSerializer(workers, many=True)
+            
+            return JsonResponse({
+                'success': True,
+                'count': len(workers),
+                'next_cursor': next_cursor,
+                'data': serializer.data
+            }, status=status.HTTP_200_OK)
+            
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        except Exception as e:
+            logger.error(f"Error listing workers: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncClientListView(AsyncAPIView):
+    """
+    Versión asíncrona de GET /api/clients/ (mismos query params)
+    """
+    
+    async def get(self, request):
+        """
+        GET /api/async/clients/
+        """
+        try:
+            search = request.query_params.get('search')
+            
+            if search:
+                clients = await async_firebase_service.run(client_service.search_clients, search)
+            else:
+                clients = await async_firebase_service.run(client_service.get_all_clients)
+            
+            serializer = ClientListSerializer(clients, many=True)
+            
+            return JsonResponse({
+                'success': True,
+                'count': len(clients),
+                'data': serializer.data
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error listing clients: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -3,18 +3,22 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
 from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from ..services.bulk_worker_service import bulk_worker_service
-from ..serializers.bulk_worker_serializers import BulkWorkerResultSerializer
+from ..services.bulk_upload_job_service import bulk_upload_job_service
+from ..models import BulkUploadJob
+from ..serializers.bulk_worker_serializers import BulkWorkerResultSerializer, BulkUploadJobSerializer
 import logging
-import io
 
 logger = logging.getLogger(__name__)
 
 
 class BulkWorkerUploadView(APIView):
     """
-    Vista para carga masiva de trabajadores desde Excel
+    Vista para carga masiva de trabajadores desde Excel o CSV
     
     POST /api/workers/bulk-upload/
     """
@@ -26,11 +30,13 @@ class BulkWorkerUploadView(APIView):
         Carga masiva de trabajadores desde archivo Excel
         
         Form data:
-        - file: Archivo Excel (.xlsx o .xls)
+        - file: Archivo Excel (.xlsx o .xls) o CSV
+        - resume: 'false' para reimportar filas de este archivo ya importadas
+          en cargas anteriores (default true)
         
-        Retorna:
-        - Reporte detallado de éxitos y errores
-        - Lista de credenciales generadas
+        Retorna (202):
+        - ID del trabajo en cola; el progreso y el reporte final se consultan
+          en /api/workers/bulk-upload/jobs/{job_id}/
         """
         try:
             # Validar que se envió un archivo
@@ -43,39 +49,30 @@ class BulkWorkerUploadView(APIView):
             excel_file = request.FILES['file']
             
             # Validar extensión
-            if not excel_file.name.endswith(('.xlsx', '.xls')):
+            if not excel_file.name.lower().endswith(('.xlsx', '.xls', '.csv')):
                 return Response({
                     'success': False,
-                    'error': 'El archivo debe ser un Excel (.xlsx o .xls)'
+                    'error': 'El archivo debe ser un Excel (.xlsx o .xls) o un CSV'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Validar tamaño (máximo 10MB)
-            if excel_file.size > 10 * 1024 * 1024:
+            # Validar tamaño (el archivo se lee por streaming, el límite es configurable)
+            max_size_mb = settings.BULK_UPLOAD.get('MAX_FILE_SIZE_MB', 50)
+            if excel_file.size > max_size_mb * 1024 * 1024:
                 return Response({
                     'success': False,
-                    'error': 'El archivo es demasiado grande (máximo 10MB)'
+                    'error': f'El archivo es demasiado grande (máximo {max_size_mb}MB)'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Procesar archivo
-            logger.info(f"Processing bulk upload: {excel_file.name}")
-            results = bulk_worker_service.process_excel_file(excel_file)
-            
-            # Serializar resultados
-            serializer = BulkWorkerResultSerializer(results)
-            
-            # Determinar código de respuesta
-            if results['failed'] == 0:
-                response_status = status.HTTP_201_CREATED
-            elif results['successful'] == 0:
-                response_status = status.HTTP_400_BAD_REQUEST
-            else:
-                response_status = status.HTTP_207_MULTI_STATUS
+            # Encolar el archivo; la carga se procesa en segundo plano
+            logger.info(f"Queueing bulk upload: {excel_file.name}")
+            resume = str(request.data.get('resume', 'true')).lower() not in ('false', '0', 'no')
+            job = bulk_upload_job_service.enqueue(excel_file, request.user, resume=resume)
             
             return Response({
-                'success': results['successful'] > 0,
-                'message': f"Procesados: {results['total_processed']}, Exitosos: {results['successful']}, Fallidos: {results['failed']}",
-                'data': serializer.data
-            }, status=response_status)
+                'success': True,
+                'message': 'Carga masiva en cola',
+                'data': BulkUploadJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
             
         except ValueError as e:
             logger.error(f"Validation error in bulk upload: {str(e)}")
@@ -93,6 +90,121 @@ class BulkWorkerUploadView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class BulkUploadJobListView(APIView):
+    """
+    Vista para listar los trabajos de carga masiva recientes
+    
+    GET /api/workers/bulk-upload/jobs/
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Lista los trabajos más recientes con su progreso
+        
+        Query params:
+        - limit: Máximo de trabajos (default 20, máximo 100)
+        """
+        try:
+            try:
+                limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+            except ValueError:
+                limit = 20
+            
+            jobs = bulk_upload_job_service.list_jobs(limit)
+            
+            return Response({
+                'success': True,
+                'count': len(jobs),
+                'data': BulkUploadJobSerializer(jobs, many=True).data
+            })
+            
+        except Exception as e:
+            logger.error(f"Error listing bulk upload jobs: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkUploadJobDetailView(APIView):
+    """
+    Vista para consultar el progreso y el resultado de una carga masiva
+    
+    GET /api/workers/bulk-upload/jobs/{job_id}/
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, job_id):
+        """
+        Estado del trabajo; al completarse incluye el reporte de la carga
+        (con las contraseñas generadas solo en la primera consulta de quien
+        lo creó y antes de que venzan)
+        """
+        try:
+            job = bulk_upload_job_service.get_job(job_id)
+            
+            if not job:
+                return Response({
+                    'success': False,
+                    'error': 'Trabajo no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            data = BulkUploadJobSerializer(job).data
+            if job.status == BulkUploadJob.STATUS_COMPLETED:
+                # Las contraseñas generadas solo vienen en la primera consulta del creador
+                result = bulk_upload_job_service.take_result(job.id, request.user)
+                if result:
+                    data['result'] = BulkWorkerResultSerializer(result).data
+            
+            return Response({
+                'success': True,
+                'data': data
+            })
+            
+        except Exception as e:
+            logger.error(f"Error getting bulk upload job {job_id}: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkUploadJobRetryView(APIView):
+    """
+    Vista para reintentar una carga masiva fallida o interrumpida
+    
+    POST /api/workers/bulk-upload/jobs/{job_id}/retry/
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, job_id):
+        """
+        Vuelve a encolar el trabajo; las filas ya importadas se omiten
+        """
+        try:
+            job = bulk_upload_job_service.retry(job_id)
+            
+            return Response({
+                'success': True,
+                'message': 'Carga masiva en cola para reintento',
+                'data': BulkUploadJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+            
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
+        except Exception as e:
+            logger.error(f"Error retrying bulk upload job {job_id}: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class BulkWorkerTemplateView(APIView):
     """
     Vista para descargar template de Excel
@@ -104,33 +216,31 @@ class BulkWorkerTemplateView(APIView):
     def get(self, request):
         """
         Descarga un template de Excel con ejemplos
+        
+        El archivo se genera una vez por proceso; las descargas repetidas
+        con If-None-Match / If-Modified-Since reciben 304 sin cuerpo.
         """
         try:
-            # Generar template
-            df = bulk_worker_service.generate_excel_template()
-            
-            # Crear archivo Excel en memoria
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Trabajadores')
-                
-                # Ajustar ancho de columnas
-                worksheet = writer.sheets['Trabajadores']
-                for idx, col in enumerate(df.columns):
-                    max_length = max(
-                        df[col].astype(str).apply(len).max(),
-                        len(col)
-                    ) + 2
-                    worksheet.column_dimensions[chr(65 + idx)].width = max_length
-            
-            output.seek(0)
+            template = bulk_worker_service.get_excel_template()
+            
+            # 304 si el cliente ya tiene esta versión
+            not_modified = get_conditional_response(
+                request,
+                etag=template['etag'],
+                last_modified=template['last_modified']
+            )
+            if not_modified is not None:
+                return not_modified
             
             # Preparar respuesta
             response = HttpResponse(
-                output.read(),
+                template['content'],
                 content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             )
             response['Content-Disposition'] = 'attachment; filename=template_trabajadores.xlsx'
+            response['ETag'] = template['etag']
+            response['Last-Modified'] = http_date(template['last_modified'])
+            patch_cache_control(response, private=True, no_cache=True)
             
             logger.info("Template downloaded")
             return response
@@ -142,6 +252,3 @@ class BulkWorkerTemplateView(APIView):
                 'error': 'Error generando template',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-import pandas as pd
\ No newline at end of file
@@ -2,9 +2,6 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from ..services.worker_service import worker_service
-from ..services.client_service import client_service
-from ..services.document_service import document_service
 from ..services.dashboard_service import dashboard_service
 import logging
 
@@ -20,67 +17,12 @@ class DashboardStatsView(APIView):
     def get(self, request):
         """
         GET /api/dashboard/stats/
-        Obtiene estadísticas generales del sistema
+        Obtiene estadísticas generales del sistema desde los contadores, sin
+        descargar los árboles completos; la actividad por período está en
+        /api/dashboard/activity-stats/
         """
         try:
-            # Obtener estadísticas de trabajadores
-            worker_stats = worker_service.get_workers_statistics()
-            
-            # Obtener total de clientes
-            total_clients = client_service.count_clients()
-            
-            # Obtener estadísticas de documentos
-            document_stats = document_service.get_documents_statistics()
-            
-            # Obtener estadísticas de actividad detalladas
-            activity_stats = dashboard_service.get_detailed_activity_stats()
-            
-            # Obtener documentos pendientes (para desglose por tipo)
-            pending_docs = document_service.get_pending_documents()
-            
-            # Agrupar documentos pendientes por tipo
-            pending_by_type = {
-                'hojaDeVida': 0,
-                'antecedentesJudiciales': 0,
-                'titulos': 0,
-                'cartasRecomendacion': 0
-            }
-            
-            for doc in pending_docs:
-                category = doc.get('category', '')
-                subcategory = doc.get('subcategory', '')
-                
-                if category == 'hojaDeVida':
-                    pending_by_type['hojaDeVida'] += 1
-                elif category == 'antecedentesJudiciales':
-                    pending_by_type['antecedentesJudiciales'] += 1
-                elif category == 'certificaciones':
-                    if subcategory == 'titulos':
-                        pending_by_type['titulos'] += 1
-                    elif subcategory == 'cartasRecomendacion':
-                        pending_by_type['cartasRecomendacion'] += 1
-            
-            stats = {
-                'workers': {
-                    'total': worker_stats['total'],
-                    'verified': worker_stats['verified'],
-                    'available': worker_stats['available'],
-                    'online': worker_stats['online'],
-                    'byCategory': worker_stats['by_category']
-                },
-                'clients': {
-                    'total': total_clients
-                },
-                'documents': {
-                    'total': document_stats['total'],
-                    'pending': document_stats['pending'],
-                    'approved': document_stats['approved'],
-                    'rejected': document_stats['rejected'],
-                    'processed': document_stats['processed'],
-                    'pendingByType': pending_by_type
-                },
-                'activity': activity_stats  # Nuevas estadísticas de actividad
-            }
+            stats = dashboard_service.get_dashboard_stats()
             
             logger.info("Estadísticas del dashboard obtenidas exitosamente")
             return Response({
@@ -97,6 +39,37 @@ class DashboardStatsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class DashboardSnapshotView(APIView):
+    """
+    Vista para obtener todas las secciones del dashboard con una sola
+    descarga por árbol de Firebase
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        """
+        GET /api/dashboard/snapshot/
+        Obtiene estadísticas de trabajadores, clientes, documentos y actividad
+        junto con los tiempos de descarga y cálculo de cada sección
+        """
+        try:
+            snapshot = dashboard_service.get_dashboard_snapshot()
+            
+            logger.info("Snapshot del dashboard obtenido exitosamente")
+            return Response({
+                'success': True,
+                'data': snapshot
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo snapshot del dashboard: {str(e)}", exc_info=True)
+            return Response({
+                'success': False,
+                'error': 'Error al obtener snapshot del dashboard',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class DashboardWeeklyTrendsView(APIView):
     """
     Vista para obtener tendencias semanales mejoradas
@@ -218,6 +191,8 @@ class DashboardActivityStatsView(APIView):
         """
         GET /api/dashboard/activity-stats/
         Obtiene estadísticas de actividad en diferentes períodos
+        
+        Costoso: descarga los árboles completos de trabajadores y documentos
         """
         try:
             stats = dashboard_service.get_detailed_activity_stats()
@@ -7,6 +7,8 @@ from ..serializers import (
     DocumentSerializer,
     DocumentApprovalSerializer,
     DocumentRejectionSerializer,
+    DocumentBatchReviewSerializer,
+    DocumentFileUrlBatchSerializer,
     DocumentRequirementCheckSerializer,
     DocumentListSerializer,
 )
@@ -322,6 +324,86 @@ class DocumentViewSet(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'], url_path='batch-review')
+    def batch_review(self, request):
+        """
+        POST /api/documents/batch-review/
+        Aprueba y/o rechaza varios documentos con una sola escritura atómica
+        
+        Body:
+        {
+            "reviewerId": "admin123",
+            "documents": [
+                {"workerId": "worker123", "category": "hojaDeVida", "subcategory": null,
+                 "documentId": "doc123", "action": "approve"},
+                {"workerId": "worker456", "category": "certificaciones", "subcategory": "titulos",
+                 "documentId": "doc456", "action": "reject", "reason": "Documento ilegible"}
+            ]
+        }
+        """
+        try:
+            serializer = DocumentBatchReviewSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            summary = document_service.batch_review_documents(
+                serializer.validated_data['documents'],
+                serializer.validated_data['reviewerId']
+            )
+            
+            return Response({
+                'success': True,
+                'message': f"{summary['approved']} documentos aprobados y {summary['rejected']} rechazados",
+                'data': summary
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error in batch review: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=False, methods=['post'], url_path='worker/(?P<worker_id>[^/.]+)/approve-all')
+    def approve_all(self, request, worker_id=None):
+        """
+        POST /api/documents/worker/{worker_id}/approve-all/
+        Aprueba todos los documentos del trabajador que no estén aprobados
+        
+        Body:
+        {
+            "reviewerId": "admin123"
+        }
+        """
+        try:
+            serializer = DocumentApprovalSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            approved = document_service.approve_worker_documents(
+                worker_id,
+                serializer.validated_data['reviewerId']
+            )
+            
+            return Response({
+                'success': True,
+                'message': f"{approved} documentos aprobados",
+                'data': {'approved': approved}
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error approving worker documents: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     @action(detail=False, methods=['get'], url_path='worker/(?P<worker_id>[^/.]+)/check-requirements')
     def check_requirements(self, request, worker_id=None):
         """
@@ -421,6 +503,45 @@ class DocumentViewSet(viewsets.ViewSet):
             
         except Exception as e:
             logger.error(f"Error getting file URL: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=False, methods=['post'], url_path='file-urls')
+    def get_file_urls(self, request):
+        """
+        POST /api/documents/file-urls/
+        Obtiene las URLs temporales de varios archivos a la vez (las URLs
+        vigentes se reutilizan sin volver a firmarlas)
+        
+        Body:
+        {
+            "files": [
+                {"workerId": "worker123", "category": "hojaDeVida", "filename": "cv.pdf"},
+                {"workerId": "worker123", "category": "certificaciones",
+                 "subcategory": "titulos", "filename": "titulo.pdf"}
+            ]
+        }
+        """
+        try:
+            serializer = DocumentFileUrlBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            files = document_service.get_file_urls(serializer.validated_data['files'])
+            
+            return Response({
+                'success': True,
+                'count': len(files),
+                'data': files
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error getting file URLs: {str(e)}")
             return Response({
                 'success': False,
                 'error': str(e)
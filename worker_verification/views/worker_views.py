@@ -2,16 +2,22 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from ..services.worker_service import worker_service
+from ..services.location_buffer_service import location_buffer_service
 from ..serializers import (
     WorkerSerializer,
     WorkerUpdateSerializer,
     WorkerAvailabilitySerializer,
     WorkerOnlineStatusSerializer,
     WorkerVerificationStatusSerializer,
+    WorkerVerificationStatusBatchSerializer,
     WorkerLocationSerializer,
+    WorkerLocationBatchSerializer,
     WorkerRatingSerializer,
+    WorkerRatingBatchSerializer,
     WorkerStatisticsSerializer,
+    DocumentRequirementCheckSerializer,
 )
 import logging
 
@@ -23,45 +29,95 @@ class WorkerViewSet(viewsets.ViewSet):
     ViewSet para operaciones con trabajadores
     """
     permission_classes = [IsAuthenticated]
+    max_page_size = 100
+    
+    def _get_page_size(self, request):
+        """
+        Tamaño de página pedido (?page_size=) acotado a max_page_size
+        """
+        try:
+            page_size = int(request.query_params.get('page_size', api_settings.PAGE_SIZE))
+        except (TypeError, ValueError):
+            page_size = api_settings.PAGE_SIZE
+        return max(1, min(page_size, self.max_page_size))
+    
+    @staticmethod
+    def _parse_bool(value):
+        """
+        'true'/'false' -> bool; cualquier otro valor -> None (sin filtro)
+        """
+        if value is None:
+            return None
+        value = value.strip().lower()
+        if value == 'true':
+            return True
+        if value == 'false':
+            return False
+        return None
     
     def list(self, request):
         """
         GET /api/workers/
-        Lista todos los trabajadores
+        Lista los trabajadores
         
-        Query params:
+        Query params (combinables):
         - category: Filtrar por categoría
         - available: Filtrar por disponibilidad (true/false)
         - online: Filtrar por estado en línea (true/false)
-        - search: Buscar por nombre, apellido o categoría
+        - verification_status: Filtrar por estado de verificación
+        - search: Buscar por nombre, apellido, email o categoría
+        - cursor: next_cursor de la página anterior
+        - page_size: Tamaño de página (por defecto PAGE_SIZE)
         """
         try:
             # Obtener parámetros de filtro
-            category = request.query_params.get('category')
-            available = request.query_params.get('available')
-            online = request.query_params.get('online')
-            search = request.query_params.get('search')
-            
-            # Aplicar filtros
-            if search:
-                workers = worker_service.search_workers(search)
-            elif category:
-                workers = worker_service.get_workers_by_category(category)
-            elif available == 'true':
-                workers = worker_service.get_available_workers()
-            elif online == 'true':
-                workers = worker_service.get_online_workers()
+            category = request.query_params.get('category') or None
+            available = self._parse_bool(request.query_params.get('available'))
+            online = self._parse_bool(request.query_params.get('online'))
+            verification_status = request.query_params.get('verification_status') or None
+            search = request.query_params.get('search') or None
+            
+            cursor = request.query_params.get('cursor') or None
+            page_size = self._get_page_size(request)
+            
+            has_filters = any(
+                value is not None
+                for value in (category, available, online, verification_status, search)
+            )
+            
+            if has_filters:
+                # Filtros combinados: se evalúan sobre el índice en memoria
+                workers, next_cursor = worker_service.filter_workers(
+                    search=search,
+                    category=category,
+                    available=available,
+                    online=online,
+                    verification_status=verification_status,
+                    cursor=cursor,
+                    page_size=page_size
+                )
             else:
-                workers = worker_service.get_all_workers()
+                # Sin filtros: paginación por cursor directamente en Firebase
+                workers, next_cursor = worker_service.get_workers_page(
+                    cursor=cursor,
+                    page_size=page_size
+                )
             
             serializer = WorkerSerializer(workers, many=True)
             
             return Response({
                 'success': True,
                 'count': len(workers),
+                'next_cursor': next_cursor,
                 'data': serializer.data
             }, status=status.HTTP_200_OK)
             
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+            
         except Exception as e:
             logger.error(f"Error listing workers: {str(e)}")
             return Response({
@@ -97,6 +153,42 @@ class WorkerViewSet(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=True, methods=['get'])
+    def full(self, request, pk=None):
+        """
+        GET /api/workers/{id}/full/
+        Perfil, documentos (con URLs firmadas) y estado de documentos
+        requeridos del trabajador en una sola respuesta
+        
+        Query params:
+        - file_urls: 'false' para omitir las URLs firmadas
+        """
+        try:
+            include_file_urls = self._parse_bool(request.query_params.get('file_urls')) is not False
+            full_profile = worker_service.get_worker_full(pk, include_file_urls=include_file_urls)
+            
+            if not full_profile:
+                return Response({
+                    'success': False,
+                    'error': 'Trabajador no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            return Response({
+                'success': True,
+                'data': {
+                    'worker': WorkerSerializer(full_profile['worker']).data,
+                    'documents': full_profile['documents'],
+                    'requirements': DocumentRequirementCheckSerializer(full_profile['requirements']).data
+                }
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error retrieving full worker profile: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     def create(self, request):
         """
         POST /api/workers/
@@ -132,13 +224,6 @@ class WorkerViewSet(viewsets.ViewSet):
         Actualiza un trabajador completamente
         """
         try:
-            # Verificar que existe
-            if not worker_service.worker_exists(pk):
-                return Response({
-                    'success': False,
-                    'error': 'Trabajador no encontrado'
-                }, status=status.HTTP_404_NOT_FOUND)
-            
             serializer = WorkerSerializer(data=request.data)
             
             if not serializer.is_valid():
@@ -147,7 +232,12 @@ class WorkerViewSet(viewsets.ViewSet):
                     'errors': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            worker_service.update_worker(pk, serializer.validated_data)
+            # update_worker verifica la existencia con una lectura shallow
+            if not worker_service.update_worker(pk, serializer.validated_data):
+                return Response({
+                    'success': False,
+                    'error': 'Trabajador no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
             
             return Response({
                 'success': True,
@@ -167,13 +257,6 @@ class WorkerViewSet(viewsets.ViewSet):
         Actualiza campos específicos de un trabajador
         """
         try:
-            # Verificar que existe
-            if not worker_service.worker_exists(pk):
-                return Response({
-                    'success': False,
-                    'error': 'Trabajador no encontrado'
-                }, status=status.HTTP_404_NOT_FOUND)
-            
             serializer = WorkerUpdateSerializer(data=request.data)
             
             if not serializer.is_valid():
@@ -182,7 +265,12 @@ class WorkerViewSet(viewsets.ViewSet):
                     'errors': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            worker_service.update_worker(pk, serializer.validated_data)
+            # update_worker verifica la existencia con una lectura shallow
+            if not worker_service.update_worker(pk, serializer.validated_data):
+                return Response({
+                    'success': False,
+                    'error': 'Trabajador no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
             
             return Response({
                 'success': True,
@@ -202,15 +290,12 @@ class WorkerViewSet(viewsets.ViewSet):
         Elimina un trabajador
         """
         try:
-            # Verificar que existe
-            if not worker_service.worker_exists(pk):
+            if not worker_service.delete_worker(pk):
                 return Response({
                     'success': False,
                     'error': 'Trabajador no encontrado'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            worker_service.delete_worker(pk)
-            
             return Response({
                 'success': True,
                 'message': 'Trabajador eliminado exitosamente'
@@ -299,23 +384,56 @@ class WorkerViewSet(viewsets.ViewSet):
         serializer = WorkerVerificationStatusSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        worker = worker_service.get_worker_by_id(pk)
-        if not worker:
+        # Solo se escriben verificationStatus/* y timestamp; se conserva lo
+        # demás del estado (ej: submittedAt) y del trabajador
+        updated_status = worker_service.update_verification_status(pk, serializer.validated_data)
+        if updated_status is None:
             return Response({"error": "Worker not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    # estado actual
-        current_status = worker.get("verificationStatus", {})
-
-    # Solo actualizar status, conservar lo demás (ej: submittedAt)
-        updated_status = {**current_status, **serializer.validated_data}
-
-        worker["verificationStatus"] = updated_status
-        worker_service.update_worker(pk, worker)
-
         return Response({
-        "message": "Verification status updated successfully",
-        "verificationStatus": updated_status
-    })
+            "message": "Verification status updated successfully",
+            "verificationStatus": updated_status
+        })
+    
+    @action(detail=False, methods=['post'], url_path='batch-verification-status')
+    def batch_verification_status(self, request):
+        """
+        POST /api/workers/batch-verification-status/
+        Actualiza el estado de verificación de varios trabajadores con una
+        sola escritura atómica
+        
+        Body:
+        {
+            "workers": [
+                {"workerId": "worker123", "status": "approved"},
+                {"workerId": "worker456", "status": "rejected"}
+            ]
+        }
+        """
+        try:
+            serializer = WorkerVerificationStatusBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            summary = worker_service.update_verification_status_batch(
+                serializer.validated_data['workers']
+            )
+            
+            return Response({
+                'success': True,
+                'message': f"{len(summary['updated'])} trabajadores actualizados",
+                'data': summary
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error in batch verification status update: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=True, methods=['patch'])
     def location(self, request, pk=None):
@@ -352,6 +470,45 @@ class WorkerViewSet(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'], url_path='batch-locations')
+    def batch_locations(self, request):
+        """
+        POST /api/workers/batch-locations/
+        Recibe la ubicación de varios trabajadores; se conserva la última
+        de cada uno y se escriben juntas al cerrar la ventana del buffer
+        
+        Body:
+        {
+            "locations": [
+                {"workerId": "worker123", "latitude": 5.34851, "longitude": -73.902605,
+                 "timestamp": 1700000000000},
+                {"workerId": "worker456", "latitude": 4.60971, "longitude": -74.08175}
+            ]
+        }
+        """
+        try:
+            serializer = WorkerLocationBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            summary = location_buffer_service.submit(serializer.validated_data['locations'])
+            
+            return Response({
+                'success': True,
+                'message': f"{summary['accepted']} ubicaciones recibidas",
+                'data': summary
+            }, status=status.HTTP_202_ACCEPTED)
+            
+        except Exception as e:
+            logger.error(f"Error receiving locations batch: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     @action(detail=True, methods=['post'])
     def add_rating(self, request, pk=None):
         """
@@ -386,6 +543,44 @@ class WorkerViewSet(viewsets.ViewSet):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'], url_path='batch-ratings')
+    def batch_ratings(self, request):
+        """
+        POST /api/workers/batch-ratings/
+        Agrega varias calificaciones a la vez (p. ej. para reprocesar un
+        historial); cada trabajador se actualiza con una sola transacción
+        
+        Body:
+        {
+            "ratings": [
+                {"workerId": "worker123", "rating": 4.5},
+                {"workerId": "worker456", "rating": 5}
+            ]
+        }
+        """
+        try:
+            serializer = WorkerRatingBatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            summary = worker_service.add_ratings_batch(serializer.validated_data['ratings'])
+            
+            return Response({
+                'success': True,
+                'message': f"{summary['applied']} calificaciones agregadas",
+                'data': summary
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Error adding ratings batch: {str(e)}")
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """